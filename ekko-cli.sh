@@ -58,6 +58,10 @@ EOF
 cat > "${SAFE_DIR}/scripts/validate.sh" << EOF
 #!/bin/bash
 cd \$(dirname \$0)/..
+# Sharded across CPUs, balanced by recorded durations, coverage merged
+if command -v ekko &>/dev/null; then
+    exec ekko test . "\$@"
+fi
 if command -v python3 &>/dev/null; then
     python3 -m pytest tests/ -v
 else
@@ -4,27 +4,83 @@ Project Ekko - FastAPI Backend (Placeholder v1.1)
 Corrected lint issues (S104, F821).
 """
 
+import asyncio
+import contextlib
 import logging
+import os
 import sys  # Added missing import for sys.exit
+from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel
+
+from ekko.api.stream import (
+    HubLogHandler,
+    bridge_events,
+    hub,
+    pump_client,
+    sample_host_metrics,
+)
+from ekko.core.licensing import LicenseError, LicenseVerifier, verifier_from_file
+from ekko.core.logging_setup import configure_logging
+from ekko.orchestration.batch import (
+    DEFAULT_MAX_WORKERS,
+    discover_projects,
+    validate_projects,
+)
+from ekko.orchestration.events import bus
 
 logger = logging.getLogger(__name__)
 app = FastAPI(title="Project Ekko API", version="0.1.0")
 
+_background_tasks: list[asyncio.Task] = []
+_hub_log_handler = HubLogHandler(hub)
+
+
+class _Verifier:
+    """Holds the process-wide license verifier once it has been built."""
+
+    instance: LicenseVerifier | None = None
+
+
+_license_verifier = _Verifier()
+
+
+class LicenseCheck(BaseModel):
+    license: str
+
+
+class BatchValidate(BaseModel):
+    base_dir: str
+    pattern: str = "*"
+    workers: int = DEFAULT_MAX_WORKERS
+
 
 @app.on_event("startup")
 async def startup_event():
     """Runs when the API server starts."""
+    # Log I/O happens on a writer thread so it never shows up in loop latency
+    configure_logging(os.environ.get("EKKO_LOG_LEVEL", "INFO"))
     logger.info("Ekko API starting up...")
-    # Add any async setup needed here (e.g., DB connection pool)
+    loop = asyncio.get_running_loop()
+    hub.bind_loop(loop)
+    bus.bind_loop(loop)
+    logging.getLogger("ekko").addHandler(_hub_log_handler)
+    _background_tasks.append(asyncio.create_task(sample_host_metrics(hub)))
+    _background_tasks.append(asyncio.create_task(bridge_events(bus, hub)))
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Runs when the API server shuts down."""
     logger.info("Ekko API shutting down...")
-    # Add cleanup here
+    logging.getLogger("ekko").removeHandler(_hub_log_handler)
+    for task in _background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    _background_tasks.clear()
+    bus.close()
 
 
 @app.get("/")
@@ -42,6 +98,93 @@ async def health_check():
     return {"status": "ok"}
 
 
+def _get_license_verifier() -> LicenseVerifier:
+    """Built once from EKKO_LICENSE_PUBKEY; its cache lives for the process."""
+    if _license_verifier.instance is None:
+        from ekko.config import get_ekko_settings
+
+        settings = get_ekko_settings()
+        key_path = settings.license_public_key if settings is not None else None
+        if key_path is None:
+            raise HTTPException(
+                status_code=503, detail="License verification not configured"
+            )
+        try:
+            _license_verifier.instance = verifier_from_file(key_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot load license public key {key_path}: {e}")
+            raise HTTPException(
+                status_code=503, detail="License key unavailable"
+            ) from e
+    return _license_verifier.instance
+
+
+@app.post("/license/verify")
+def verify_license(check: LicenseCheck):
+    """Checks a license token; repeat checks of a valid token hit the verifier cache."""
+    verifier = _get_license_verifier()
+    try:
+        lic = verifier.verify(check.license)
+    except LicenseError as e:
+        return {"valid": False, "reason": str(e)}
+    return {
+        "valid": True,
+        "license_id": lic.license_id,
+        "licensee": lic.licensee,
+        "features": list(lic.features),
+        "expires_at": lic.expires_at,
+    }
+
+
+@app.post("/batch/validate")
+async def batch_validate(req: BatchValidate):
+    """
+    Validates every project under `base_dir` on a worker thread. Job progress
+    is published on the event bus and streams to `/ws/events` clients.
+    """
+    try:
+        projects = discover_projects(Path(req.base_dir), req.pattern)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    reports = await asyncio.to_thread(
+        validate_projects, projects, max(req.workers, 1), events=bus
+    )
+    return {
+        "ok": all(r.ok for r in reports),
+        "projects": [
+            {
+                "project": str(r.project),
+                "ok": r.ok,
+                "scanned": r.scanned,
+                "findings": len(r.findings),
+                "errors": r.errors,
+            }
+            for r in reports
+        ],
+    }
+
+
+async def _until_disconnect(websocket: WebSocket) -> None:
+    """Reads and ignores client messages; returns once the client has gone."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@app.websocket("/ws/events")
+async def events_stream(websocket: WebSocket):
+    """Pushes a snapshot followed by coalesced job/log/deploy/metrics deltas."""
+    await websocket.accept()
+    client = hub.register()
+    try:
+        await pump_client(
+            hub, client, websocket.send_json, lambda: _until_disconnect(websocket)
+        )
+    except WebSocketDisconnect:
+        logger.debug("Event stream client went away.")
+    finally:
+        hub.unregister(client)
+
+
 if __name__ == "__main__":
     try:
         import uvicorn
@@ -49,7 +192,7 @@ if __name__ == "__main__":
         logger.info("Running Uvicorn server for development...")
         uvicorn.run(
             "main:app",  # Use string format for reload to work
-            host="0.0.0.0",  # nosec B104 - Allow binding to all interfaces for dev/Docker
+            host="0.0.0.0",  # noqa: S104 # nosec B104 - Allow binding to all interfaces for dev/Docker
             port=8888,
             log_level="info",
             reload=True,  # Enable auto-reload for development
@@ -67,7 +210,7 @@ if __name__ == "__main__":
     except OSError as e:
         logger.critical(f"OS error occurred: {e}")
         # Handle specific OS-related exceptions
-    except Exception as e:
+    except Exception as e:  # noqa: BLE001 - last-resort report before exiting
         logger.critical(f"Failed to start Uvicorn: {e}", exc_info=True)
         # Catch-all for unexpected exceptions
         sys.exit(f"API Startup Error: {e}")
@@ -0,0 +1,289 @@
+"""
+Project Ekko - API Event Stream
+Coalescing fan-out of job, log, deploy and host-metric deltas to websocket clients.
+
+Producers call `StreamHub.publish()` (keyed state, latest value wins) or
+`StreamHub.publish_log()` (append-only, bounded). Each connected client owns a
+`ClientStream` that merges pending updates until its sender task is ready, so
+a slow client receives fewer, larger frames instead of an ever-growing backlog.
+Keys whose state is "finished" are kept only for the most recent
+`max_finished` of them, so a long-lived server's state stays bounded.
+
+Orchestration code publishes on the `EventBus` instead; `bridge_events()`
+forwards its job, deploy and log topics into the hub.
+"""
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from ekko.orchestration.events import Event, EventBus, Policy, Topic
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = ("jobs", "deploy", "metrics")
+DEFAULT_FLUSH_INTERVAL_SEC = 0.25
+DEFAULT_MAX_PENDING_LOGS = 500
+DEFAULT_MAX_FINISHED = 200
+BRIDGED_CHANNELS = {Topic.JOB: "jobs", Topic.DEPLOY: "deploy"}
+
+
+class ClientStream:
+    """Per-client pending state. Only touched from the event loop thread."""
+
+    def __init__(self, max_pending_logs: int = DEFAULT_MAX_PENDING_LOGS):
+        self.pending: dict[tuple[str, str], dict[str, Any] | None] = {}
+        self.logs: deque[dict[str, Any]] = deque(maxlen=max_pending_logs)
+        self.dropped_logs = 0
+        self.seq = 0
+        self.ready = asyncio.Event()
+
+    def add_update(self, channel: str, key: str, data: dict[str, Any] | None) -> None:
+        self.pending[(channel, key)] = data  # Coalesce: newer value replaces older
+        self.ready.set()
+
+    def add_log(self, record: dict[str, Any]) -> None:
+        if len(self.logs) == self.logs.maxlen:
+            self.dropped_logs += 1
+        self.logs.append(record)
+        self.ready.set()
+
+    def take_frame(self) -> dict[str, Any]:
+        self.seq += 1
+        frame = {
+            "type": "delta",
+            "seq": self.seq,
+            "updates": [
+                {"channel": c, "key": k, "data": d}
+                for (c, k), d in self.pending.items()
+            ],
+            "logs": list(self.logs),
+            "dropped_logs": self.dropped_logs,
+        }
+        self.pending.clear()
+        self.logs.clear()
+        self.dropped_logs = 0
+        self.ready.clear()
+        return frame
+
+
+class StreamHub:
+    """Holds the latest keyed state and distributes deltas to connected clients."""
+
+    def __init__(
+        self,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SEC,
+        max_pending_logs: int = DEFAULT_MAX_PENDING_LOGS,
+        max_finished: int = DEFAULT_MAX_FINISHED,
+    ):
+        self.host = socket.gethostname()
+        self.flush_interval = flush_interval
+        self._max_pending_logs = max_pending_logs
+        self._max_finished = max_finished
+        self._state: dict[tuple[str, str], dict[str, Any]] = {}
+        self._finished: dict[tuple[str, str], None] = {}  # Oldest first
+        self._clients: set[ClientStream] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Records the serving loop so publishers on other threads can hand off."""
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _dispatch(self, fn, *args) -> None:
+        if self._loop is None:
+            return
+        if threading.get_ident() == self._loop_thread:
+            fn(*args)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(fn, *args)
+
+    def publish(self, channel: str, key: str, data: dict[str, Any] | None) -> None:
+        """Sets the latest value for (channel, key); `None` removes the key."""
+        self._dispatch(self._apply_update, channel, key, data)
+
+    def publish_log(self, record: dict[str, Any]) -> None:
+        """Appends a log record to every client's bounded log buffer."""
+        if self._clients:
+            self._dispatch(self._apply_log, record)
+
+    def _apply_update(
+        self, channel: str, key: str, data: dict[str, Any] | None
+    ) -> None:
+        ck = (channel, key)
+        self._finished.pop(ck, None)
+        if data is None:
+            self._state.pop(ck, None)
+        else:
+            self._state[ck] = data
+            if data.get("state") == "finished":
+                self._finished[ck] = None
+        for client in self._clients:
+            client.add_update(channel, key, data)
+        while len(self._finished) > self._max_finished:
+            old = next(iter(self._finished))
+            self._apply_update(*old, None)  # Evicted for clients' mirrors too
+
+    def _apply_log(self, record: dict[str, Any]) -> None:
+        for client in self._clients:
+            client.add_log(record)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "type": "snapshot",
+            "host": self.host,
+            "updates": [
+                {"channel": c, "key": k, "data": d} for (c, k), d in self._state.items()
+            ],
+        }
+
+    def register(self) -> ClientStream:
+        client = ClientStream(self._max_pending_logs)
+        self._clients.add(client)
+        logger.info(f"Stream client connected ({len(self._clients)} total).")
+        return client
+
+    def unregister(self, client: ClientStream) -> None:
+        self._clients.discard(client)
+        logger.info(f"Stream client disconnected ({len(self._clients)} total).")
+
+
+class HubLogHandler(logging.Handler):
+    """Forwards log records to a `StreamHub` as compact dicts."""
+
+    def __init__(self, hub: StreamHub, level: int = logging.INFO):
+        super().__init__(level)
+        self._hub = hub
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._hub.publish_log(
+                {
+                    "ts": record.created,
+                    "level": record.levelname,
+                    "logger": record.name,
+                    "message": record.getMessage(),
+                }
+            )
+        except Exception:  # noqa: BLE001 - logging must never raise into the caller
+            self.handleError(record)
+
+
+async def sample_host_metrics(
+    hub: StreamHub, interval: float = 2.0, disk_path: str = "/"
+) -> None:
+    """Publishes host metrics while at least one client is connected."""
+    import psutil
+
+    prev_net: tuple[float, int, int] | None = None
+    psutil.cpu_percent(interval=None)  # Prime the CPU counter
+    while True:
+        await asyncio.sleep(interval)
+        if not hub.client_count:
+            prev_net = None
+            continue
+        try:
+            mem = psutil.virtual_memory()
+            disk = await asyncio.to_thread(psutil.disk_usage, disk_path)
+            net = psutil.net_io_counters(pernic=False)
+            now = time.monotonic()
+            sent_kbps = recv_kbps = 0.0
+            if prev_net is not None and now - prev_net[0] > 0.1:
+                elapsed = now - prev_net[0]
+                sent_kbps = (net.bytes_sent - prev_net[1]) / elapsed / 1024
+                recv_kbps = (net.bytes_recv - prev_net[2]) / elapsed / 1024
+            prev_net = (now, net.bytes_sent, net.bytes_recv)
+            hub.publish(
+                "metrics",
+                "host",
+                {
+                    "cpu_percent": psutil.cpu_percent(interval=None),
+                    "mem_total_gb": mem.total / (1024**3),
+                    "mem_available_gb": mem.available / (1024**3),
+                    "mem_percent": mem.percent,
+                    "disk_path": disk_path,
+                    "disk_total_gb": disk.total / (1024**3),
+                    "disk_used_gb": disk.used / (1024**3),
+                    "disk_percent": disk.percent,
+                    "sent_kbps": sent_kbps,
+                    "recv_kbps": recv_kbps,
+                },
+            )
+        except psutil.Error as e:
+            logger.warning(f"Host metrics sample failed: {e}")
+
+
+def _event_key(event: Event) -> str:
+    payload = event.payload if isinstance(event.payload, dict) else {}
+    return str(
+        payload.get("job") or payload.get("project") or event.source or event.kind
+    )
+
+
+async def bridge_events(bus: EventBus, hub: StreamHub) -> None:
+    """
+    Forwards bus events to the hub until cancelled: job and deploy events
+    become keyed state (latest event per job wins), log events become log
+    records. The subscription drops its oldest events rather than ever
+    slowing orchestration down.
+    """
+    sub = bus.subscribe(
+        (*BRIDGED_CHANNELS, Topic.LOG), policy=Policy.DROP_OLDEST, name="stream-hub"
+    )
+    try:
+        async for event in sub:
+            payload = (
+                event.payload
+                if isinstance(event.payload, dict)
+                else {"value": event.payload}
+            )
+            if event.topic is Topic.LOG:
+                hub.publish_log({"ts": event.ts, "source": event.source, **payload})
+            else:
+                hub.publish(
+                    BRIDGED_CHANNELS[event.topic],
+                    _event_key(event),
+                    {**payload, "state": event.kind, "ts": event.ts},
+                )
+    finally:
+        sub.close()
+
+
+async def pump_client(hub: StreamHub, client: ClientStream, send, receive=None) -> None:
+    """
+    Sends coalesced frames to one client until `send` raises or, when given,
+    `receive` returns or raises.
+
+    `send` is an awaitable taking a JSON-serialisable dict. While it is blocked
+    on a slow socket, new updates keep merging into the client's pending state.
+    `receive` should read (and may discard) incoming messages and return once
+    the peer has gone, so a disconnect is noticed even while no frames are due.
+    """
+    reader = asyncio.create_task(receive()) if receive is not None else None
+    if reader is not None:
+        reader.add_done_callback(lambda _: client.ready.set())  # Wake the sender
+    try:
+        await send(hub.snapshot())
+        while reader is None or not reader.done():
+            await client.ready.wait()
+            await asyncio.sleep(hub.flush_interval)  # Coalescing window
+            if reader is not None and reader.done():
+                break
+            await send(client.take_frame())
+        if reader is not None:
+            reader.result()  # Re-raise a receive failure
+    finally:
+        if reader is not None:
+            reader.cancel()
+
+
+hub = StreamHub()
@@ -5,13 +5,17 @@ Corrected syntax, imports, and basic linting issues. Functionality TBD.
 """
 
 import logging
+import os
+from pathlib import Path
 from typing import Annotated
 
 import typer
 
-# Basic logger setup (configure properly in main entry point or config loader)
+from ekko.core.logging_setup import configure_logging
+from ekko.core.timing import enable_timings, print_summary, span, start_profiler
+
+# Logging is configured once in main_callback via ekko.core.logging_setup
 logger = logging.getLogger(__name__)
-# Avoid basicConfig here; let the main application configure logging.
 
 # Create the Typer application instance
 app = typer.Typer(
@@ -20,19 +24,61 @@ app = typer.Typer(
     rich_markup_mode="markdown",
     add_completion=False,  # Keep completion off for simplicity initially
 )
+license_app = typer.Typer(help="Issue and verify Ekko license tokens.")
+app.add_typer(license_app, name="license")
 
 
 @app.callback()
 def main_callback(
+    ctx: typer.Context,
     verbose: Annotated[
         bool, typer.Option("--verbose", "-v", help="Enable verbose output.")
     ] = False,
+    profile: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile",
+            help="Profile the command and write the result to this file.",
+            dir_okay=False,
+        ),
+    ] = None,
+    profiler: Annotated[
+        str,
+        typer.Option(
+            help="'cprofile' (deterministic, pstats file) or 'sample' "
+            "(stack sampling, collapsed stacks for flame graphs)."
+        ),
+    ] = "cprofile",
+    timings: Annotated[
+        bool,
+        typer.Option("--timings", help="Print a table of stage timings on exit."),
+    ] = False,
 ):
     """
-    Ekko CLI Root Callback. Placeholder for global options like verbosity.
+    Ekko CLI Root Callback. Handles global options (verbosity, profiling).
     """
+    configure_logging(
+        "DEBUG" if verbose else os.environ.get("EKKO_LOG_LEVEL", "WARNING")
+    )
     if verbose:
-        logger.info("Verbose mode requested (logging level set elsewhere).")
+        logger.info("Verbose mode enabled.")
+    if profile is None and not timings:
+        return
+    enable_timings()
+    finish_profile = None
+    if profile is not None:
+        try:
+            finish_profile = start_profiler(profile, profiler)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--profiler") from e
+
+    def _on_close() -> None:
+        if finish_profile is not None:
+            finish_profile()
+            print(f"Profile written to {profile}")
+        print_summary()
+
+    ctx.call_on_close(_on_close)
 
 
 @app.command()
@@ -54,6 +100,80 @@ def init(
     # TODO: Implement scaffolding logic using core modules
 
 
+def _select_projects(all_projects: bool, projects: str | None) -> list[Path] | None:
+    """Projects under `project_base_dir` for --all/--projects, or None for single-project mode."""
+    if not all_projects and projects is None:
+        return None
+    from ekko.config import get_ekko_settings
+    from ekko.orchestration.batch import discover_projects
+
+    settings = get_ekko_settings()
+    if settings is None:
+        print("ERROR: Ekko settings failed to load; see the log for details.")
+        raise typer.Exit(code=2)
+    base_dir = settings.project_base_dir
+    try:
+        found = discover_projects(base_dir, projects or "*")
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        raise typer.Exit(code=2) from e
+    if not found:
+        print(f"No projects matching '{projects or '*'}' under {base_dir}.")
+        raise typer.Exit(code=2)
+    print(f"Selected {len(found)} project(s) under {base_dir}.")
+    return found
+
+
+def _admission(workers: int, project_dirs: list[Path]):
+    """
+    Host-aware pool sizing; `workers` caps the pool (0 = one per CPU).
+
+    Disk headroom is measured on the filesystem holding the projects.
+    """
+    from ekko.orchestration.admission import AdmissionController
+
+    return AdmissionController(
+        max_workers=workers or None,
+        initial_workers=workers or None,
+        disk_path=os.path.commonpath(project_dirs) if project_dirs else ".",
+    )
+
+
+def _batch_validate(project_dirs: list[Path], workers: int) -> list:
+    """Validates many projects on one shared pool and prints the aggregate."""
+    from ekko.orchestration.batch import validate_projects
+
+    def on_done(report) -> None:
+        status = "OK  " if report.ok else "FAIL"
+        print(
+            f"{status} {report.project.name}: {report.scanned} file(s), "
+            f"{len(report.findings)} finding(s), {len(report.errors)} error(s), "
+            f"{len(report.skipped)} skipped "
+            f"[{report.elapsed:.2f}s]"
+        )
+
+    admission = _admission(workers, project_dirs)
+    reports = validate_projects(
+        project_dirs, on_project_done=on_done, admission=admission
+    )
+    for r in reports:
+        for f in r.findings:
+            print(f"{f.path}:{f.line}: banned pattern '{f.pattern}': {f.text}")
+        for err in r.errors:
+            print(f"{r.project}: ERROR {err}")
+        for path in r.skipped:
+            print(f"{path}: skipped (larger than the scan limit)")
+    failed = [r for r in reports if not r.ok]
+    print(
+        f"Validated {len(reports)} project(s), "
+        f"{sum(r.scanned for r in reports)} file(s): "
+        f"{sum(len(r.findings) for r in reports)} finding(s), "
+        f"{len(failed)} project(s) failed "
+        f"(final pool {admission.limit()}, {admission.deferred} deferral(s))."
+    )
+    return reports
+
+
 @app.command()
 def validate(
     file: Annotated[
@@ -65,14 +185,83 @@ def validate(
     profile: Annotated[
         str, typer.Option(help="Validation profile (e.g., 'quick', 'full', 'security')")
     ] = "full",
+    all_projects: Annotated[
+        bool, typer.Option("--all", help="Validate every project under the base dir.")
+    ] = False,
+    projects: Annotated[
+        str | None,
+        typer.Option(help="Validate projects under the base dir matching this glob."),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Max shared pool size in batch mode (0 = one per CPU); "
+            "shrinks under host load.",
+        ),
+    ] = 0,
 ):
     """
-    Runs validation checks on a file or the entire project. [Placeholder]
+    Runs validation checks on a file, the current project, or (with --all /
+    --projects) many projects under `project_base_dir`.
+
+    Currently checks for the banned patterns listed in
+    `.ekko/core_team/stark.yaml`; other profile checks are TBD.
     """
+    from ekko.validation.scanner import (
+        PatternScanner,
+        load_banned_patterns,
+        scan_project,
+    )
+
+    project_dirs = _select_projects(all_projects, projects)
+    if project_dirs is not None:
+        if file:
+            print("ERROR: a file argument cannot be combined with --all/--projects.")
+            raise typer.Exit(code=2)
+        logger.info(
+            f"Command: validate, Projects: {len(project_dirs)}, Profile: {profile}"
+        )
+        reports = _batch_validate(project_dirs, workers)
+        if not all(r.ok for r in reports):
+            raise typer.Exit(code=1)
+        return
+
     target = file if file else "project"
-    print(f"Validating '{target}' using profile '{profile}'... [Placeholder]")
+    print(f"Validating '{target}' using profile '{profile}'...")
     logger.info(f"Command: validate, Target: {target}, Profile: {profile}")
-    # TODO: Implement validation engine calls
+    root = Path.cwd()
+    skipped: list[Path] = []
+    if file:
+        scanner = PatternScanner(load_banned_patterns(root))
+        with span("check"):
+            findings = scanner.scan_file(Path(file), skipped)
+        scanned = 1 - len(skipped)
+    else:
+        scanned, findings = scan_project(root, skipped=skipped)
+    for f in findings:
+        print(f"{f.path}:{f.line}: banned pattern '{f.pattern}': {f.text}")
+    for path in skipped:
+        print(f"{path}: skipped (larger than the scan limit)")
+    print(
+        f"Scanned {scanned} file(s): {len(findings)} finding(s), {len(skipped)} skipped."
+    )
+    if findings:
+        raise typer.Exit(code=1)
+
+
+def _deploy_project(project: Path, env: str) -> None:
+    """
+    Per-project deploy step for batch deploys. [Placeholder]
+
+    There is no Ansible/Terraform integration yet: this only logs, so a batch
+    deploy exercises validation gating and scheduling but changes nothing.
+    """
+    logger.info(
+        f"Deploy step for {project} to {env} is a placeholder; nothing deployed"
+    )
+    # TODO: Ansible/Terraform integration
 
 
 @app.command()
@@ -84,15 +273,524 @@ def deploy(
         bool,
         typer.Option("--skip-validation", help="Skip validation checks before deploy."),
     ] = False,
+    all_projects: Annotated[
+        bool, typer.Option("--all", help="Deploy every project under the base dir.")
+    ] = False,
+    projects: Annotated[
+        str | None,
+        typer.Option(help="Deploy projects under the base dir matching this glob."),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Max shared pool size in batch mode (0 = one per CPU); "
+            "shrinks under host load.",
+        ),
+    ] = 0,
 ):
     """
     Deploys the validated project to the target environment. [Placeholder]
+
+    With --all / --projects, every selected project is validated on one shared
+    pool first (unless skipped) and only the projects that pass are deployed.
     """
+    project_dirs = _select_projects(all_projects, projects)
+    if project_dirs is not None:
+        from ekko.orchestration.batch import deploy_projects
+
+        logger.info(f"Command: deploy, Env: {env}, Projects: {len(project_dirs)}")
+        blocked: list[Path] = []
+        if not skip_validation:
+            reports = _batch_validate(project_dirs, workers)
+            blocked = [r.project for r in reports if not r.ok]
+            project_dirs = [r.project for r in reports if r.ok]
+        print(f"Deploying {len(project_dirs)} project(s) to '{env}'... [Placeholder]")
+        jobs = deploy_projects(
+            project_dirs,
+            env,
+            _deploy_project,
+            admission=_admission(workers, project_dirs),
+        )
+        failed = [j for j in jobs if not j.ok]
+        for j in failed:
+            print(f"FAIL {Path(j.name).name}: {'; '.join(j.errors)}")
+        print(
+            f"Ran the placeholder deploy step for {len(jobs) - len(failed)} project(s) "
+            f"(nothing was deployed), {len(failed)} failed, "
+            f"{len(blocked)} blocked by validation."
+        )
+        if failed or blocked:
+            raise typer.Exit(code=1)
+        return
+
     print(f"Deploying to '{env}' (Skip Validation: {skip_validation})... [Placeholder]")
     logger.info(f"Command: deploy, Env: {env}, Skip Validation: {skip_validation}")
     # TODO: Implement validation (unless skipped) and Ansible/Terraform integration
 
 
+@app.command()
+def docs(
+    path: Annotated[
+        Path, typer.Argument(help="Project root to document.", file_okay=False)
+    ] = Path(),
+    output: Annotated[
+        Path, typer.Option(help="Output directory, relative to the project root.")
+    ] = Path("docs/api"),
+    workers: Annotated[
+        int, typer.Option("--workers", "-w", help="Parallel generator calls.")
+    ] = 8,
+    force: Annotated[
+        bool, typer.Option("--force", help="Regenerate every module.")
+    ] = False,
+    dry_run: Annotated[
+        bool, typer.Option("--dry-run", help="Only show what would be regenerated.")
+    ] = False,
+):
+    """
+    Generates per-module docs with Scribe, only for modules whose source or
+    public API changed (plus the modules that import them).
+    """
+    from ekko.config import get_ekko_settings
+    from ekko.core import scribe
+
+    logger.info(f"Command: docs, Path: {path}, Workers: {workers}, Force: {force}")
+    if dry_run:
+        plan = scribe.plan(path, force=force)
+        print(
+            f"{len(plan.modules)} module(s): {len(plan.changed)} changed, "
+            f"{len(plan.dependents)} dependent, {len(plan.removed)} removed."
+        )
+        for name in sorted(plan.to_generate):
+            reason = "changed" if name in plan.changed else "dependency API changed"
+            print(f"  {name} ({reason})")
+        return
+
+    settings = get_ekko_settings()
+    if settings is None:
+        print("ERROR: Ekko settings failed to load; see the log for details.")
+        raise typer.Exit(code=1)
+    try:
+        generator = scribe.select_generator(settings.scribe_agent_path)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        raise typer.Exit(code=1) from e
+    result = scribe.run(
+        path, generator, output_dir=output, workers=workers, force=force
+    )
+    for name, err in sorted(result.failed.items()):
+        print(f"FAILED {name}: {err}")
+    print(
+        f"Generated {len(result.generated)}, unchanged {len(result.unchanged_output)}, "
+        f"removed {len(result.removed)}, failed {len(result.failed)} "
+        f"-> {path / output}"
+    )
+    if result.failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def index(
+    path: Annotated[
+        Path, typer.Argument(help="Project root to index.", file_okay=False)
+    ] = Path(),
+    query: Annotated[
+        str | None,
+        typer.Option(
+            "--query", "-q", help="Print the context retrieved for this text."
+        ),
+    ] = None,
+    budget: Annotated[
+        int, typer.Option(help="Token budget for --query results.")
+    ] = 2000,
+    rebuild: Annotated[
+        bool, typer.Option("--rebuild", help="Drop and rebuild the index.")
+    ] = False,
+    no_update: Annotated[
+        bool,
+        typer.Option("--no-update", help="Query without refreshing the index first."),
+    ] = False,
+):
+    """
+    Updates the project's symbol index (`.ekko/index.db`) and optionally queries it.
+    """
+    import time
+
+    from ekko.core.symbol_index import SymbolIndex
+
+    logger.info(f"Command: index, Path: {path}, Rebuild: {rebuild}")
+    with SymbolIndex(path) as idx:
+        if not no_update:
+            stats = idx.rebuild() if rebuild else idx.update()
+            print(
+                f"Indexed {stats.scanned} file(s): {stats.updated} updated, "
+                f"{stats.unchanged} unchanged, {stats.removed} removed -> {idx.db_path}"
+            )
+        if query:
+            start = time.perf_counter()
+            with span("index query"):
+                chunks = idx.query(query, token_budget=budget)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for c in chunks:
+                label = f" ({c.symbol})" if c.symbol else ""
+                print(
+                    f"--- {c.path}:{c.start_line}-{c.end_line}{label} [{c.tokens} tok]"
+                )
+                print(c.text)
+            print(
+                f"{len(chunks)} chunk(s), {sum(c.tokens for c in chunks)}/{budget} tokens "
+                f"in {elapsed_ms:.1f} ms"
+            )
+
+
+@app.command()
+def test(
+    path: Annotated[
+        Path, typer.Argument(help="Project root containing the tests.", file_okay=False)
+    ] = Path(),
+    shards: Annotated[
+        int,
+        typer.Option(
+            "--shards", "-n", help="Parallel pytest processes (0 = one per CPU)."
+        ),
+    ] = 0,
+    test_dir: Annotated[
+        str, typer.Option(help="Test directory under the root.")
+    ] = "tests",
+    cov: Annotated[
+        bool,
+        typer.Option("--cov/--no-cov", help="Collect and merge coverage per shard."),
+    ] = True,
+    cov_source: Annotated[
+        str | None,
+        typer.Option(help="Coverage source (default: src/ if present, else .)."),
+    ] = None,
+    fail_under: Annotated[
+        float | None,
+        typer.Option(
+            help="Coverage floor in percent (default: test_coverage in stark.yaml)."
+        ),
+    ] = None,
+    pytest_args: Annotated[
+        str | None, typer.Option(help="Extra pytest arguments, e.g. '-x -k smoke'.")
+    ] = None,
+):
+    """
+    Runs a project's tests sharded across processes, balanced by recorded
+    durations, with last run's failures first and coverage merged.
+    """
+    import shlex
+
+    from ekko.validation.test_runner import run_tests
+
+    logger.info(f"Command: test, Path: {path}, Shards: {shards}, Coverage: {cov}")
+    run = run_tests(
+        path,
+        shards=shards or None,
+        test_dir=test_dir,
+        pytest_args=shlex.split(pytest_args) if pytest_args else None,
+        coverage=cov,
+        cov_source=cov_source,
+        fail_under=fail_under,
+    )
+    if not run.shards:
+        print(f"No test files found under {path / test_dir}.")
+        raise typer.Exit(code=5)
+    for r in run.shards:
+        status = "ok  " if r.returncode in (0, 5) else "FAIL"
+        print(
+            f"{status} shard {r.shard.index}: {len(r.shard.files)} file(s), {r.tests} test(s), "
+            f"{r.failures} failed, {r.errors} error(s) in {r.elapsed:.1f}s "
+            f"(expected {r.shard.expected_seconds:.1f}s)"
+        )
+        if status == "FAIL" and r.log_path is not None:
+            tail = r.log_path.read_text(
+                encoding="utf-8", errors="replace"
+            ).splitlines()[-30:]
+            print("\n".join(f"    {line}" for line in tail))
+    summary = (
+        f"{run.tests} test(s), {run.failures} failed/errored in {run.elapsed:.1f}s"
+    )
+    if run.coverage_percent is not None:
+        floor = (
+            f" (floor {run.coverage_floor:.0f}%)"
+            if run.coverage_floor is not None
+            else ""
+        )
+        summary += f"; coverage {run.coverage_percent:.1f}%{floor}"
+    print(summary)
+    if run.coverage_error:
+        print(f"ERROR: {run.coverage_error}")
+    if not run.ok:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def bench(
+    url: Annotated[
+        str, typer.Option(help="Base URL of a running Ekko API.")
+    ] = "http://127.0.0.1:8888",
+    endpoint: Annotated[
+        list[str] | None,
+        typer.Option("--endpoint", "-e", help="Endpoint path; repeat to round-robin."),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-c", help="Concurrent asyncio clients.")
+    ] = 16,
+    duration: Annotated[
+        float, typer.Option("--duration", "-d", help="Measured duration (seconds).")
+    ] = 10.0,
+    requests: Annotated[
+        int,
+        typer.Option("--requests", "-n", help="Stop after N requests (0 = no cap)."),
+    ] = 0,
+    mode: Annotated[
+        str,
+        typer.Option(help="'closed' (back-to-back) or 'open' (fixed arrival rate)."),
+    ] = "closed",
+    rate: Annotated[
+        float, typer.Option(help="Open-loop arrival rate (requests/second).")
+    ] = 0.0,
+    warmup: Annotated[float, typer.Option(help="Unrecorded warmup (seconds).")] = 1.0,
+    in_process: Annotated[
+        bool,
+        typer.Option(
+            "--in-process", help="Drive ekko.api.main:app via ASGI, no server."
+        ),
+    ] = False,
+    chaos: Annotated[
+        str | None,
+        typer.Option(
+            help="Route traffic through the chaos injector proxy with these args, "
+            "e.g. '--latency-dist normal --latency-ms 50 --reset-rate 0.01'. "
+            "http:// targets only."
+        ),
+    ] = None,
+    json_out: Annotated[
+        str | None,
+        typer.Option("--json", help="Write the summary as JSON to this path."),
+    ] = None,
+):
+    """
+    Load-tests Ekko API endpoints and reports throughput and latency percentiles.
+    """
+    import asyncio
+    import contextlib
+    import json
+
+    from ekko.core.bench import BenchConfig, chaos_proxy, run_bench
+
+    cfg = BenchConfig(
+        base_url=url,
+        endpoints=endpoint or ["/health"],
+        concurrency=concurrency,
+        duration_sec=duration,
+        max_requests=requests,
+        mode=mode,
+        rate=rate,
+        warmup_sec=warmup,
+    )
+    logger.info(f"Command: bench, Config: {cfg}")
+    transport = None
+    if in_process:
+        import httpx
+
+        from ekko.api.main import app as api_app
+
+        if chaos:
+            print("ERROR: --chaos needs a real server; drop --in-process.")
+            raise typer.Exit(code=2)
+        transport = httpx.ASGITransport(app=api_app)
+        cfg.base_url = "http://ekko.local"
+
+    try:
+        with (
+            chaos_proxy(url, chaos) if chaos else contextlib.nullcontext(url) as target
+        ):
+            cfg.base_url = target if not in_process else cfg.base_url
+            print(
+                f"Benchmarking {cfg.base_url} {cfg.endpoints} ({cfg.mode}-loop, "
+                f"{cfg.concurrency} clients, {cfg.duration_sec}s)..."
+            )
+            with span("bench run"):
+                result = asyncio.run(run_bench(cfg, transport=transport))
+    except (ValueError, OSError, RuntimeError) as e:
+        print(f"ERROR: {e}")
+        raise typer.Exit(code=1) from e
+
+    summary = result.summary()
+    lat = summary["latency_ms"]
+    print(f"Requests:   {summary['requests']} ({summary['ok']} ok)")
+    print(f"Throughput: {summary['throughput_rps']:.1f} req/s")
+    print(
+        "Latency ms: "
+        + "  ".join(f"{k}={lat[k]:.3f}" for k in ("p50", "p95", "p99", "p999", "max"))
+    )
+    if summary["errors"]:
+        print(
+            "Errors:     " + ", ".join(f"{k}={v}" for k, v in summary["errors"].items())
+        )
+    if json_out:
+        Path(json_out).write_text(json.dumps(summary, indent=2))
+        print(f"Summary written to {json_out}")
+
+
+@license_app.command("keygen")
+def license_keygen(
+    out_dir: Annotated[
+        Path,
+        typer.Option(
+            "--out", help="Directory for license_private.pem / license_public.pem."
+        ),
+    ] = Path(),
+):
+    """
+    Generates an Ed25519 signing key pair for licenses.
+    """
+    from ekko.core.licensing import generate_keypair
+
+    private_pem, public_pem = generate_keypair()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    private_path = out_dir / "license_private.pem"
+    if private_path.exists():
+        print(f"ERROR: {private_path} already exists; refusing to overwrite.")
+        raise typer.Exit(code=1)
+    private_path.touch(mode=0o600)
+    private_path.write_bytes(private_pem)
+    (out_dir / "license_public.pem").write_bytes(public_pem)
+    print(f"Wrote {private_path} and {out_dir / 'license_public.pem'}")
+    print("Point EKKO_LICENSE_PUBKEY at the public key for API verification.")
+
+
+@license_app.command("issue")
+def license_issue(
+    key: Annotated[
+        Path,
+        typer.Option(help="Ed25519 private key (PEM).", exists=True, dir_okay=False),
+    ],
+    input_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--input",
+            help='JSON lines: {"licensee": ..., "features": [...], "days": 365}.',
+            exists=True,
+            dir_okay=False,
+        ),
+    ] = None,
+    licensee: Annotated[
+        str | None, typer.Option(help="Issue a single license to this licensee.")
+    ] = None,
+    feature: Annotated[
+        list[str] | None,
+        typer.Option("--feature", "-f", help="Feature flag (repeatable)."),
+    ] = None,
+    days: Annotated[int, typer.Option(help="Validity in days (0 = perpetual).")] = 365,
+    output: Annotated[
+        Path | None,
+        typer.Option("--out", help="Write JSON lines here instead of stdout."),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option("--workers", "-w", help="Signing processes (0 = one per CPU)."),
+    ] = 0,
+):
+    """
+    Issues licenses, signing large batches on a process pool.
+    """
+    import json
+    import sys
+    import time
+
+    from ekko.core.licensing import LicenseRequest, issue_batch
+
+    requests: list[LicenseRequest] = []
+    if input_file is not None:
+        with input_file.open(encoding="utf-8") as f:
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    requests.append(
+                        LicenseRequest(
+                            licensee=row["licensee"],
+                            features=tuple(row.get("features") or ()),
+                            days=row.get("days", days) or None,
+                        )
+                    )
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"ERROR: {input_file}:{n}: {e}")
+                    raise typer.Exit(code=2) from e
+    if licensee:
+        requests.append(LicenseRequest(licensee, tuple(feature or ()), days or None))
+    if not requests:
+        print("ERROR: nothing to issue; pass --input or --licensee.")
+        raise typer.Exit(code=2)
+
+    logger.info(f"Command: license issue, Count: {len(requests)}, Workers: {workers}")
+    start = time.perf_counter()
+    with span("license issue"):
+        issued = issue_batch(key.read_bytes(), requests, workers=workers or None)
+    elapsed = time.perf_counter() - start
+    out = output.open("w", encoding="utf-8") if output else sys.stdout
+    try:
+        for lic, token in issued:
+            out.write(
+                json.dumps(
+                    {
+                        "license_id": lic.license_id,
+                        "licensee": lic.licensee,
+                        "expires_at": lic.expires_at,
+                        "token": token,
+                    }
+                )
+                + "\n"
+            )
+    finally:
+        if output:
+            out.close()
+    print(f"Issued {len(issued)} license(s) in {elapsed:.2f}s", file=sys.stderr)
+
+
+@license_app.command("verify")
+def license_verify(
+    token: Annotated[str, typer.Argument(help="License token to check.")],
+    pubkey: Annotated[
+        Path | None,
+        typer.Option(help="Ed25519 public key (PEM); defaults to EKKO_LICENSE_PUBKEY."),
+    ] = None,
+):
+    """
+    Verifies a license token's signature, product and expiry.
+    """
+    from datetime import UTC, datetime
+
+    from ekko.config import get_ekko_settings
+    from ekko.core.licensing import LicenseError, verifier_from_file
+
+    key_path = pubkey
+    if key_path is None and (settings := get_ekko_settings()) is not None:
+        key_path = settings.license_public_key
+    if key_path is None:
+        print("ERROR: no public key; pass --pubkey or set EKKO_LICENSE_PUBKEY.")
+        raise typer.Exit(code=2)
+    try:
+        lic = verifier_from_file(key_path).verify(token)
+    except (OSError, LicenseError) as e:
+        print(f"INVALID: {e}")
+        raise typer.Exit(code=1) from e
+    expiry = (
+        "never"
+        if lic.expires_at is None
+        else datetime.fromtimestamp(lic.expires_at, UTC).strftime("%Y-%m-%d %H:%M UTC")
+    )
+    print(
+        f"VALID: {lic.licensee} ({lic.license_id}), "
+        f"features={list(lic.features)}, expires {expiry}"
+    )
+
+
 if __name__ == "__main__":
     logger.info("Running Ekko CLI module directly for testing.")
     app()
@@ -0,0 +1,341 @@
+"""
+Project Ekko - HTTP Load Generator
+Drives Ekko API endpoints with concurrent asyncio httpx clients and records
+latencies in a compact log-linear (HDR-style) histogram.
+
+Closed-loop mode keeps `concurrency` requests in flight back to back.
+Open-loop mode issues requests on a fixed schedule of `rate` per second and
+measures latency from each request's *intended* start time, so queueing in a
+slow server is not hidden (no coordinated omission).
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INJECTOR_PATH = Path("tests") / "chaos" / "injector.py"
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of integer microsecond values.
+
+    Values below 2**bits are exact; above that each power-of-two range is
+    split into 2**(bits-1) buckets, bounding relative error to 2**-(bits-1)
+    (about 1.6% with the default 7 bits). One hour fits in ~2k counters.
+    """
+
+    def __init__(self, bits: int = 7, max_value_us: int = 3_600_000_000):
+        self._bits = bits
+        self._sub = 1 << bits
+        self._half = 1 << (bits - 1)
+        self._max_value = max_value_us
+        self._counts = array("Q", [0]) * (self._index(max_value_us) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def _index(self, v: int) -> int:
+        if v < self._sub:
+            return v
+        shift = v.bit_length() - self._bits
+        return self._sub + (shift - 1) * self._half + (v >> shift) - self._half
+
+    def _value_at(self, idx: int) -> int:
+        """Midpoint of the bucket at `idx`."""
+        if idx < self._sub:
+            return idx
+        shift = (idx - self._sub) // self._half + 1
+        mantissa = (idx - self._sub) % self._half + self._half
+        return (mantissa << shift) + (1 << (shift - 1))
+
+    def record(self, value_us: float) -> None:
+        v = min(max(int(value_us), 0), self._max_value)
+        self._counts[self._index(v)] += 1
+        if self.count == 0 or v < self.min_us:
+            self.min_us = v
+        self.max_us = max(self.max_us, v)
+        self.count += 1
+        self.total_us += v
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other._bits != self._bits or len(other._counts) != len(self._counts):
+            raise ValueError("Cannot merge histograms with different layouts.")
+        for i, c in enumerate(other._counts):
+            if c:
+                self._counts[i] += c
+        if other.count:
+            self.min_us = (
+                other.min_us if not self.count else min(self.min_us, other.min_us)
+            )
+            self.max_us = max(self.max_us, other.max_us)
+        self.count += other.count
+        self.total_us += other.total_us
+
+    def percentile(self, q: float) -> int:
+        """Value at percentile `q` (0-100), clamped to the observed min/max."""
+        if not self.count:
+            return 0
+        target = max(1, int(q / 100.0 * self.count + 0.5))
+        seen = 0
+        for i, c in enumerate(self._counts):
+            seen += c
+            if seen >= target:
+                return min(max(self._value_at(i), self.min_us), self.max_us)
+        return self.max_us
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_us / self.count if self.count else 0.0
+
+
+@dataclass
+class BenchResult:
+    """Aggregated outcome of one benchmark run."""
+
+    mode: str
+    duration_sec: float
+    histogram: LatencyHistogram
+    ok: int = 0
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        return self.ok + sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration_sec if self.duration_sec > 0 else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        h = self.histogram
+        return {
+            "mode": self.mode,
+            "duration_sec": round(self.duration_sec, 3),
+            "requests": self.requests,
+            "ok": self.ok,
+            "errors": dict(self.errors),
+            "throughput_rps": round(self.throughput, 2),
+            "latency_ms": {
+                "min": h.min_us / 1000,
+                "mean": round(h.mean_us / 1000, 3),
+                "p50": h.percentile(50) / 1000,
+                "p95": h.percentile(95) / 1000,
+                "p99": h.percentile(99) / 1000,
+                "p999": h.percentile(99.9) / 1000,
+                "max": h.max_us / 1000,
+            },
+        }
+
+
+@dataclass
+class BenchConfig:
+    """Parameters for `run_bench`."""
+
+    base_url: str = "http://127.0.0.1:8888"
+    endpoints: list[str] = field(default_factory=lambda: ["/health"])
+    method: str = "GET"
+    concurrency: int = 16
+    duration_sec: float = 10.0
+    max_requests: int = 0  # 0 = bounded by duration only
+    mode: str = "closed"  # "closed" or "open"
+    rate: float = 0.0  # Open-loop requests per second
+    warmup_sec: float = 1.0
+    timeout_sec: float = 10.0
+
+
+class _Recorder:
+    def __init__(self, result: BenchResult):
+        self.result = result
+        self.recording = False
+
+    async def issue(
+        self, client: httpx.AsyncClient, cfg: BenchConfig, path: str, start: float
+    ) -> None:
+        try:
+            resp = await client.request(cfg.method, path)
+            outcome = None if resp.status_code < 400 else f"HTTP {resp.status_code}"
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        if not self.recording:
+            return
+        self.result.histogram.record((time.perf_counter() - start) * 1_000_000)
+        if outcome is None:
+            self.result.ok += 1
+        else:
+            self.result.errors[outcome] += 1
+
+
+async def _closed_loop(
+    clients, cfg: BenchConfig, rec: _Recorder, deadline: float
+) -> None:
+    issued = 0
+
+    async def worker(n: int) -> None:
+        nonlocal issued
+        client = clients[n % len(clients)]
+        i = n
+        while time.perf_counter() < deadline:
+            if cfg.max_requests and rec.recording and issued >= cfg.max_requests:
+                return
+            if rec.recording:
+                issued += 1
+            path = cfg.endpoints[i % len(cfg.endpoints)]
+            i += 1
+            await rec.issue(client, cfg, path, time.perf_counter())
+
+    await asyncio.gather(*(worker(n) for n in range(cfg.concurrency)))
+
+
+async def _open_loop(
+    clients, cfg: BenchConfig, rec: _Recorder, deadline: float
+) -> None:
+    if cfg.rate <= 0:
+        raise ValueError("Open-loop mode requires a positive --rate.")
+    interval = 1.0 / cfg.rate
+    in_flight: set[asyncio.Task] = set()
+    next_at = time.perf_counter()
+    i = 0
+    while next_at < deadline:
+        if cfg.max_requests and rec.recording and i >= cfg.max_requests:
+            break
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        path = cfg.endpoints[i % len(cfg.endpoints)]
+        # Latency is measured from the scheduled time, not the actual send time
+        task = asyncio.create_task(
+            rec.issue(clients[i % len(clients)], cfg, path, next_at)
+        )
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        i += 1
+        next_at += interval
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+async def run_bench(
+    cfg: BenchConfig, transport: httpx.AsyncBaseTransport | None = None
+) -> BenchResult:
+    """Runs one benchmark. Pass an `httpx.ASGITransport` to drive an app in process."""
+    if cfg.mode not in ("closed", "open"):
+        raise ValueError(f"Unknown bench mode: {cfg.mode}")
+    limits = httpx.Limits(
+        max_connections=cfg.concurrency, max_keepalive_connections=cfg.concurrency
+    )
+    n_clients = max(1, cfg.concurrency)
+    clients = [
+        httpx.AsyncClient(
+            base_url=cfg.base_url,
+            transport=transport,
+            limits=limits,
+            timeout=cfg.timeout_sec,
+        )
+        for _ in range(n_clients)
+    ]
+    result = BenchResult(mode=cfg.mode, duration_sec=0.0, histogram=LatencyHistogram())
+    rec = _Recorder(result)
+    run = _closed_loop if cfg.mode == "closed" else _open_loop
+    try:
+        if cfg.warmup_sec > 0:
+            logger.info(f"Warming up for {cfg.warmup_sec}s...")
+            await run(clients, cfg, rec, time.perf_counter() + cfg.warmup_sec)
+        rec.recording = True
+        started = time.perf_counter()
+        await run(clients, cfg, rec, started + cfg.duration_sec)
+        result.duration_sec = time.perf_counter() - started
+    finally:
+        await asyncio.gather(*(c.aclose() for c in clients))
+    return result
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+@contextlib.contextmanager
+def chaos_proxy(base_url: str, chaos_args: str, injector: Path | None = None):
+    """
+    Starts the chaos injector in proxy mode in front of `base_url` and yields
+    the URL to benchmark instead. Requires a source checkout (tests/chaos).
+
+    The injector is a plain TCP proxy and the benchmark talks plain HTTP to
+    it, so only `http://` targets are supported.
+    """
+    injector = injector or Path(
+        os.environ.get("EKKO_CHAOS_INJECTOR", DEFAULT_INJECTOR_PATH)
+    )
+    if not injector.is_file():
+        raise FileNotFoundError(f"Chaos injector not found at {injector}")
+    parts = urlsplit(base_url)
+    if parts.scheme != "http":
+        raise ValueError(
+            f"Chaos proxy only supports http:// targets, got '{base_url}' "
+            "(TLS would terminate at the wrong host)."
+        )
+    target_port = parts.port or 80
+    listen_port = _free_port()
+    cmd = [
+        sys.executable,
+        str(injector),
+        "--mode",
+        "proxy",
+        "--target",
+        f"{parts.hostname}:{target_port}",
+        "--listen",
+        f"127.0.0.1:{listen_port}",
+        "--duration",
+        "0",
+        *shlex.split(chaos_args),
+    ]
+    logger.info(f"Starting chaos proxy: {' '.join(cmd)}")
+    # The proxy logs every upstream failure; a pipe nobody drains would fill up
+    # during a long run and block it, so its log goes to a temp file instead.
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=log)  # noqa: S603
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            if proc.poll() is not None:
+                log.seek(0)
+                err = log.read()[-4000:].decode(errors="replace")
+                raise RuntimeError(f"Chaos proxy exited early: {err.strip()}")
+            with (
+                contextlib.suppress(OSError),
+                socket.create_connection(("127.0.0.1", listen_port), timeout=0.2),
+            ):
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError("Chaos proxy did not start listening in time.")
+            time.sleep(0.05)
+        yield urlunsplit(("http", f"127.0.0.1:{listen_port}", parts.path, "", ""))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        log.close()
@@ -0,0 +1,282 @@
+"""
+Project Ekko - License Issuing & Verification
+Ed25519-signed license tokens with bulk issuing on a process pool and a
+cached verifier for hot request paths.
+
+A token is `base64url(payload JSON) "." base64url(signature)`. The payload is
+canonical JSON (sorted keys, no whitespace) so the same license always
+serializes to the same bytes.
+
+Bulk issuing loads the private key once per worker process (pool
+initializer) and signs payloads in chunks to amortize IPC. Verification keeps
+a bounded LRU of tokens that already passed signature checks, keyed by the
+token's SHA-256 fingerprint. Cached entries are still checked against their
+expiry on every hit.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+
+logger = logging.getLogger(__name__)
+
+PRODUCT = "ekko"
+DEFAULT_CACHE_SIZE = 65_536
+SIGN_CHUNK_SIZE = 512
+IN_PROCESS_THRESHOLD = 2_048  # Smaller batches are not worth a pool start-up
+
+
+class LicenseError(ValueError):
+    """A license token is malformed, forged, expired or for another product."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class License:
+    """Decoded license payload."""
+
+    license_id: str
+    licensee: str
+    product: str = PRODUCT
+    features: tuple[str, ...] = ()
+    issued_at: int = 0
+    expires_at: int | None = None
+
+    def expired(self, now: float | None = None) -> bool:
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+    def to_payload(self) -> bytes:
+        data = asdict(self)
+        data["features"] = list(self.features)
+        return json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> "License":
+        try:
+            data = json.loads(payload)
+            data["features"] = tuple(data.get("features") or ())
+            return cls(**data)
+        except (ValueError, TypeError) as e:
+            raise LicenseError(f"Malformed license payload: {e}") from e
+
+
+@dataclass(frozen=True)
+class LicenseRequest:
+    """Input to bulk issuing; `days=None` means a perpetual license."""
+
+    licensee: str
+    features: tuple[str, ...] = ()
+    days: int | None = 365
+
+    def build(self, now: int) -> License:
+        return License(
+            license_id=str(uuid.uuid4()),
+            licensee=self.licensee,
+            features=tuple(self.features),
+            issued_at=now,
+            expires_at=now + self.days * 86_400 if self.days is not None else None,
+        )
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def generate_keypair() -> tuple[bytes, bytes]:
+    """New Ed25519 key pair as (private PKCS8 PEM, public SubjectPublicKeyInfo PEM)."""
+    key = Ed25519PrivateKey.generate()
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem, public_pem
+
+
+def load_private_key(pem: bytes, password: bytes | None = None) -> Ed25519PrivateKey:
+    key = serialization.load_pem_private_key(pem, password=password)
+    if not isinstance(key, Ed25519PrivateKey):
+        raise LicenseError("License signing key must be Ed25519")
+    return key
+
+
+def load_public_key(pem: bytes) -> Ed25519PublicKey:
+    key = serialization.load_pem_public_key(pem)
+    if not isinstance(key, Ed25519PublicKey):
+        raise LicenseError("License verification key must be Ed25519")
+    return key
+
+
+def sign_license(key: Ed25519PrivateKey, lic: License) -> str:
+    payload = lic.to_payload()
+    return f"{_b64encode(payload)}.{_b64encode(key.sign(payload))}"
+
+
+def fingerprint(token: str) -> str:
+    """SHA-256 of the token; stable identifier for caching and revocation lists."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _sign_payloads(key: Ed25519PrivateKey, payloads: list[bytes]) -> list[str]:
+    return [f"{_b64encode(p)}.{_b64encode(key.sign(p))}" for p in payloads]
+
+
+class _WorkerState:
+    """Per-process state of a bulk-issuing pool worker; never set in the parent."""
+
+    key: Ed25519PrivateKey | None = None
+
+
+_worker = _WorkerState()
+
+
+def _init_worker(private_pem: bytes, password: bytes | None) -> None:
+    _worker.key = load_private_key(private_pem, password)
+
+
+def _sign_chunk(payloads: list[bytes]) -> list[str]:
+    assert _worker.key is not None, "worker not initialized"
+    return _sign_payloads(_worker.key, payloads)
+
+
+def _chunked(items: list[bytes], size: int) -> Iterator[list[bytes]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def issue_batch(
+    private_pem: bytes,
+    requests: Iterable[LicenseRequest],
+    workers: int | None = None,
+    password: bytes | None = None,
+    chunk_size: int = SIGN_CHUNK_SIZE,
+) -> list[tuple[License, str]]:
+    """
+    Issues one license per request, in input order.
+
+    Batches of IN_PROCESS_THRESHOLD or fewer licenses are signed inline.
+    Larger ones use a process pool whose workers each load the key once.
+    """
+    now = int(time.time())
+    licenses = [r.build(now) for r in requests]
+    payloads = [lic.to_payload() for lic in licenses]
+    if len(payloads) <= IN_PROCESS_THRESHOLD or workers == 1:
+        # Local only: the parent must not keep the private key in module state
+        tokens = _sign_payloads(load_private_key(private_pem, password), payloads)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(private_pem, password),
+        ) as pool:
+            chunks = pool.map(_sign_chunk, _chunked(payloads, chunk_size))
+            tokens = [t for chunk in chunks for t in chunk]
+    logger.info(f"Issued {len(tokens)} license(s)")
+    return list(zip(licenses, tokens, strict=True))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class LicenseVerifier:
+    """
+    Verifies license tokens, caching successful checks in a bounded LRU.
+
+    Only tokens that passed signature verification are cached, so forged
+    tokens never enter the cache or evict good entries.
+    """
+
+    public_key: Ed25519PublicKey
+    cache_size: int = DEFAULT_CACHE_SIZE
+    clock: Callable[[], float] = time.time
+    stats: CacheStats = field(default_factory=CacheStats)
+    _cache: OrderedDict[str, License] = field(default_factory=OrderedDict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def from_pem(cls, pem: bytes, **kwargs) -> "LicenseVerifier":
+        return cls(load_public_key(pem), **kwargs)
+
+    def verify(self, token: str) -> License:
+        """Returns the license, or raises LicenseError."""
+        token = token.strip()
+        key = fingerprint(token)
+        now = self.clock()
+        with self._lock:
+            lic = self._cache.get(key)
+            if lic is not None:
+                if lic.expired(now):
+                    del self._cache[key]
+                    raise LicenseError(f"License {lic.license_id} expired")
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return lic
+            self.stats.misses += 1
+
+        lic = self._verify_uncached(token)
+        if lic.expired(now):
+            raise LicenseError(f"License {lic.license_id} expired")
+        with self._lock:
+            self._cache[key] = lic
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.stats.evictions += 1
+        return lic
+
+    def _verify_uncached(self, token: str) -> License:
+        try:
+            payload_b64, sig_b64 = token.split(".")
+            payload, signature = _b64decode(payload_b64), _b64decode(sig_b64)
+        except ValueError as e:
+            raise LicenseError("Malformed license token") from e
+        try:
+            self.public_key.verify(signature, payload)
+        except InvalidSignature as e:
+            raise LicenseError("Invalid license signature") from e
+        lic = License.from_payload(payload)
+        if lic.product != PRODUCT:
+            raise LicenseError(f"License is for product '{lic.product}'")
+        return lic
+
+    def invalidate(self, token: str | None = None) -> None:
+        """Drops one token (e.g. on revocation) or the whole cache."""
+        with self._lock:
+            if token is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(fingerprint(token), None)
+
+
+def verifier_from_file(path: Path, **kwargs) -> LicenseVerifier:
+    return LicenseVerifier.from_pem(Path(path).expanduser().read_bytes(), **kwargs)
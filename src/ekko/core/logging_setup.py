@@ -0,0 +1,358 @@
+"""
+Project Ekko - Central Logging Setup
+Non-blocking structured logging: structlog and stdlib records are queued to a
+background writer thread that renders JSON, batches writes and rotates files.
+
+Call `configure_logging()` once from an entry point (CLI callback, TUI, API
+startup) instead of `logging.basicConfig`. Producers only pay for a level
+check and a queue put; JSON encoding and file I/O happen off the caller's
+thread (and off the asyncio event loop). When the queue backs up, DEBUG
+events are sampled down rather than blocking or growing memory.
+"""
+
+import atexit
+import copy
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections.abc import MutableMapping
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, BinaryIO, TextIO
+
+import structlog
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_FLUSH_INTERVAL_SEC = 0.2
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+SAMPLING_HIGH_WATERMARK = 0.5  # Queue fill ratio above which DEBUG is sampled
+DEBUG_SAMPLE_EVERY = 20  # Under load, keep 1 in N DEBUG events
+
+_STOP = object()
+
+
+class LogWriter(threading.Thread):
+    """Background thread draining the log queue into a file or stream."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        stream: TextIO | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SEC,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+    ):
+        super().__init__(name="ekko-log-writer", daemon=True)
+        self.queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._path = path
+        self._stream = stream
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._file: BinaryIO | None = None
+        self._size = 0  # Bytes in the current file, for rotation
+
+    def submit(self, item: Any) -> None:
+        """Enqueues an event dict or LogRecord; never blocks the caller."""
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def load(self) -> float:
+        """Fraction of the queue currently in use."""
+        return self.queue.qsize() / self.queue.maxsize
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flushes everything queued so far and stops the thread."""
+        if not self.is_alive():
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self.join(timeout)
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            assert self._path is not None
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self._path.open("ab")
+            self._size = self._file.tell()
+        return self._file
+
+    def _rollover(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        assert self._path is not None
+        for i in range(self._backup_count - 1, 0, -1):
+            src = self._path.with_name(f"{self._path.name}.{i}")
+            if src.exists():
+                src.replace(self._path.with_name(f"{self._path.name}.{i + 1}"))
+        if self._backup_count > 0:
+            self._path.replace(self._path.with_name(f"{self._path.name}.1"))
+        else:
+            self._path.unlink(missing_ok=True)
+        self._size = 0
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                first = self.queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                    continue
+                try:
+                    lines.append(_render(item))
+                except Exception as e:  # noqa: BLE001 - one bad event must not kill the writer
+                    lines.append(json.dumps({"event": f"log render failed: {e}"}))
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                lines.append(
+                    json.dumps(
+                        {"level": "warning", "event": f"{dropped} log events dropped"}
+                    )
+                )
+            if lines:
+                self._write("\n".join(lines) + "\n")
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, data: str) -> None:
+        try:
+            if self._path is None:
+                stream = self._stream or sys.stderr
+                stream.write(data)
+                stream.flush()
+                return
+            encoded = data.encode("utf-8")
+            f = self._open()
+            f.write(encoded)
+            f.flush()
+            self._size += len(encoded)
+            if self._max_bytes and self._size >= self._max_bytes:
+                self._rollover()
+        except OSError as e:
+            print(f"ekko logging: write failed: {e}", file=sys.stderr)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, UTC).isoformat(timespec="milliseconds")
+
+
+def _render(item: Any) -> str:
+    """Renders a queued item to one JSON line (runs on the writer thread)."""
+    if isinstance(item, logging.LogRecord):
+        event = {
+            "timestamp": _iso(item.created),
+            "level": item.levelname.lower(),
+            "logger": item.name,
+            "event": item.getMessage(),
+        }
+        if item.exc_text:
+            event["exception"] = item.exc_text
+        return json.dumps(event, default=str)
+    ts = item.pop("ts", None)
+    if ts is not None:
+        item["timestamp"] = _iso(ts)
+    return json.dumps(item, default=str)
+
+
+class _DebugSampler:
+    """Keeps 1 in N DEBUG events while the writer queue is above the watermark."""
+
+    def __init__(self, writer: LogWriter, every: int = DEBUG_SAMPLE_EVERY):
+        self._writer = writer
+        self._every = every
+        # next() on itertools.count is a single C call, so concurrent loggers
+        # never lose or repeat a tick (a plain `+= 1` can)
+        self._ticks = itertools.count(1)
+
+    def keep(self) -> bool:
+        if self._writer.load() < SAMPLING_HIGH_WATERMARK:
+            return True
+        return next(self._ticks) % self._every == 0
+
+    def __call__(
+        self, _logger: Any, method_name: str, event_dict: MutableMapping[str, Any]
+    ) -> MutableMapping[str, Any]:
+        """structlog processor."""
+        if method_name == "debug" and not self.keep():
+            raise structlog.DropEvent
+        return event_dict
+
+
+class _QueueHandler(logging.Handler):
+    """Stdlib handler that hands records to the writer thread."""
+
+    def __init__(self, writer: LogWriter, sampler: _DebugSampler):
+        super().__init__()
+        self._writer = writer
+        self._sampler = sampler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno <= logging.DEBUG and not self._sampler.keep():
+            return
+        try:
+            # Freeze the message now; args and tracebacks may not outlive the
+            # caller. Work on a copy (as stdlib QueueHandler.prepare does) so
+            # handlers running after this one still see the original record.
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            self._writer.submit(record)
+        except Exception:  # noqa: BLE001 - logging.Handler convention
+            self.handleError(record)
+
+
+class _QueueLogger:
+    """structlog logger whose methods enqueue the final event dict."""
+
+    def __init__(self, name: str | None = None):
+        self.name = name
+
+    def msg(self, **event_dict: Any) -> None:
+        # Resolved per call so cached loggers follow a reconfigured writer
+        writer = _pipeline.writer
+        if writer is not None:
+            if self.name is not None:
+                event_dict.setdefault("logger", self.name)
+            writer.submit(event_dict)
+
+    debug = info = warning = warn = error = critical = exception = fatal = log = msg
+
+
+def _add_ts(
+    _logger: Any, method_name: str, event_dict: MutableMapping[str, Any]
+) -> MutableMapping[str, Any]:
+    event_dict["ts"] = time.time()  # Formatted to ISO on the writer thread
+    event_dict["level"] = method_name
+    return event_dict
+
+
+class _Pipeline:
+    """The process-wide active writer, swapped by configure/shutdown."""
+
+    writer: LogWriter | None = None
+
+
+_pipeline = _Pipeline()
+
+
+def configure_logging(
+    level: str | int | None = None,
+    log_file: Path | str | None = None,
+    **writer_options: Any,
+) -> LogWriter:
+    """
+    Installs the queue-based pipeline for structlog and the stdlib root logger.
+
+    `level` defaults to $EKKO_LOG_LEVEL (or INFO). Without `log_file`, JSON
+    lines go to stderr. Safe to call again; the previous writer is flushed.
+    """
+    if level is None:
+        level = os.environ.get("EKKO_LOG_LEVEL", "INFO")
+    level_no = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+    if not isinstance(level_no, int):
+        level_no = logging.INFO
+
+    shutdown_logging()
+    writer = LogWriter(Path(log_file) if log_file else None, **writer_options)
+    writer.start()
+    sampler = _DebugSampler(writer)
+
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        if isinstance(h, _QueueHandler):
+            root.removeHandler(h)
+    root.addHandler(_QueueHandler(writer, sampler))
+    root.setLevel(level_no)
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            sampler,
+            _add_ts,
+            structlog.processors.format_exc_info,
+        ],
+        # Bound methods below `level` become no-op constants, so a disabled
+        # level check costs one attribute lookup after the first call.
+        wrapper_class=structlog.make_filtering_bound_logger(level_no),
+        logger_factory=lambda name=None, *_args: _QueueLogger(name),
+        cache_logger_on_first_use=True,
+    )
+    _pipeline.writer = writer
+    return writer
+
+
+def shutdown_logging() -> None:
+    """Flushes and stops the active writer, if any."""
+    writer, _pipeline.writer = _pipeline.writer, None
+    if writer is not None:
+        writer.stop()
+        _configure_fallback()
+
+
+def get_logger(name: str | None = None, **initial_values: Any) -> Any:
+    """
+    Returns a structlog logger bound to `name` (shown as the `logger` field).
+
+    The logger is a lazy proxy, so module-level loggers created at import time
+    pick up whatever `configure_logging()` installs later.
+    """
+    if name is None:
+        return structlog.get_logger(**initial_values)
+    return structlog.get_logger(name, **initial_values)
+
+
+def _configure_fallback() -> None:
+    """Routes structlog through stdlib logging until `configure_logging()` runs."""
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.processors.format_exc_info,
+            structlog.processors.KeyValueRenderer(
+                key_order=["event"], drop_missing=True
+            ),
+        ],
+        wrapper_class=structlog.stdlib.BoundLogger,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=False,
+    )
+
+
+if not structlog.is_configured():
+    # Library use (and tests) without an entry point: honour stdlib levels and
+    # handlers instead of structlog's default of printing everything to stdout
+    _configure_fallback()
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,403 @@
+"""
+Project Ekko - Scribe Documentation Pipeline
+Incremental, parallel per-module documentation generation.
+
+The pipeline builds the project's module import graph and regenerates docs
+only for modules whose source changed, plus the transitive dependents of
+modules whose *public API signature* changed. Generation fans out over a
+thread pool (generators are typically LLM or subprocess calls). A manifest
+under `.ekko/` stores per-module stat info, hashes and output hashes, so an
+unchanged project is re-planned from `stat` calls alone.
+"""
+
+import ast
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+
+from ekko.core.timing import span
+from ekko.validation.scanner import walk_project
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = Path(".ekko") / "scribe_manifest.json"
+DEFAULT_OUTPUT_DIR = Path("docs") / "api"
+MANIFEST_VERSION = 1
+MANIFEST_SAVE_INTERVAL_SEC = 1.0
+
+
+@dataclass
+class ModuleInfo:
+    """Static facts about one module, cached in the manifest between runs."""
+
+    name: str
+    path: str
+    mtime_ns: int
+    size: int
+    source_hash: str
+    api_hash: str
+    api: list[str]
+    imports: list[str]
+    docstring: str = ""
+    output_hash: str = ""
+
+
+@dataclass
+class ScribePlan:
+    """What a run will regenerate and why."""
+
+    modules: dict[str, ModuleInfo]
+    changed: set[str] = field(default_factory=set)
+    api_changed: set[str] = field(default_factory=set)
+    dependents: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    previous: dict[str, ModuleInfo] = field(default_factory=dict, repr=False)
+
+    @property
+    def to_generate(self) -> set[str]:
+        return self.changed | self.dependents
+
+
+@dataclass
+class ScribeResult:
+    generated: list[str]
+    unchanged_output: list[str]
+    failed: dict[str, str]
+    removed: list[str]
+
+
+Generator = Callable[[ModuleInfo, dict[str, ModuleInfo]], str]
+
+
+def _source_root(root: Path) -> Path:
+    return root / "src" if (root / "src").is_dir() else root
+
+
+def _module_name(src_root: Path, path: Path) -> str:
+    rel = path.relative_to(src_root).with_suffix("")
+    parts = list(rel.parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts) or src_root.name
+
+
+def _signature(node: ast.FunctionDef | ast.AsyncFunctionDef, prefix: str = "") -> str:
+    kind = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{kind} {prefix}{node.name}({ast.unparse(node.args)}){returns}"
+
+
+def extract_public_api(tree: ast.Module) -> list[str]:
+    """Public signatures (honouring `__all__`) of top-level functions, classes and constants."""
+    exported: set[str] | None = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets
+        ):
+            try:
+                exported = set(ast.literal_eval(node.value))
+            except ValueError:
+                exported = None
+
+    def public(name: str) -> bool:
+        return name in exported if exported is not None else not name.startswith("_")
+
+    api: list[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef) and public(
+            node.name
+        ):
+            api.append(_signature(node))
+        elif isinstance(node, ast.ClassDef) and public(node.name):
+            bases = ", ".join(ast.unparse(b) for b in node.bases)
+            api.append(f"class {node.name}({bases})")
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef | ast.AsyncFunctionDef) and (
+                    not item.name.startswith("_") or item.name == "__init__"
+                ):
+                    api.append("    " + _signature(item, f"{node.name}."))
+        elif isinstance(node, ast.AnnAssign | ast.Assign):
+            targets: list[ast.expr] = (
+                [node.target] if isinstance(node, ast.AnnAssign) else node.targets
+            )
+            for t in targets:
+                if isinstance(t, ast.Name) and t.id.isupper() and public(t.id):
+                    api.append(f"{t.id} = ...")
+    return api
+
+
+def _imports(tree: ast.Module, module: str, is_package: bool) -> list[str]:
+    package = module if is_package else module.rpartition(".")[0]
+    found: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(a.name for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                anchor = package.split(".") if package else []
+                anchor = (
+                    anchor[: len(anchor) - (node.level - 1)]
+                    if node.level > 1
+                    else anchor
+                )
+                base = ".".join([*anchor, base] if base else anchor)
+            found.add(base)
+            # `from pkg import mod` may name a submodule
+            found.update(f"{base}.{a.name}" for a in node.names if a.name != "*")
+    return sorted(found)
+
+
+def analyze_module(src_root: Path, path: Path, st: os.stat_result) -> ModuleInfo:
+    data = path.read_bytes()
+    name = _module_name(src_root, path)
+    tree = ast.parse(data, filename=str(path))
+    api = extract_public_api(tree)
+    return ModuleInfo(
+        name=name,
+        path=str(path),
+        mtime_ns=st.st_mtime_ns,
+        size=st.st_size,
+        source_hash=hashlib.sha256(data).hexdigest(),
+        api_hash=hashlib.sha256("\n".join(api).encode()).hexdigest(),
+        api=api,
+        imports=_imports(tree, name, path.name == "__init__.py"),
+        docstring=ast.get_docstring(tree) or "",
+    )
+
+
+def load_manifest(root: Path) -> dict[str, ModuleInfo]:
+    try:
+        data = json.loads((root / MANIFEST_PATH).read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return {name: ModuleInfo(**info) for name, info in data.get("modules", {}).items()}
+
+
+def save_manifest(root: Path, modules: dict[str, ModuleInfo]) -> None:
+    path = root / MANIFEST_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "modules": {n: asdict(m) for n, m in modules.items()},
+            }
+        )
+    )
+    tmp.replace(path)
+
+
+def reverse_dependencies(modules: dict[str, ModuleInfo]) -> dict[str, set[str]]:
+    """Maps each module to the project modules that import it."""
+    rdeps: dict[str, set[str]] = {name: set() for name in modules}
+    for name, info in modules.items():
+        for imp in info.imports:
+            if imp in modules and imp != name:
+                rdeps[imp].add(name)
+    return rdeps
+
+
+def plan(root: Path, force: bool = False) -> ScribePlan:
+    """Diffs the project against the manifest without regenerating anything."""
+    root = Path(root)
+    src_root = _source_root(root)
+    previous = load_manifest(root)
+    current: dict[str, ModuleInfo] = {}
+    result = ScribePlan(modules=current, previous=previous)
+    with span("scribe scan"):
+        for path in walk_project(
+            src_root, suffixes=frozenset({".py"}), project_root=root
+        ):
+            try:
+                st = path.stat()
+                name = _module_name(src_root, path)
+                old = previous.get(name)
+                if (
+                    old is not None
+                    and old.path == str(path)
+                    and old.mtime_ns == st.st_mtime_ns
+                    and old.size == st.st_size
+                ):
+                    current[name] = old  # Unchanged on disk: skip read and parse
+                    continue
+                info = analyze_module(src_root, path, st)
+            except (OSError, SyntaxError, ValueError) as e:
+                logger.warning(f"Scribe skipping {path}: {e}")
+                continue
+            if old is not None:
+                info.output_hash = old.output_hash
+            current[name] = info
+            if force or old is None or old.source_hash != info.source_hash:
+                result.changed.add(name)
+            if old is None or old.api_hash != info.api_hash:
+                result.api_changed.add(name)
+    if force:
+        result.changed.update(current)
+    result.removed = set(previous) - set(current)
+    # API changes (including removals) ripple to every transitive importer
+    rdeps = reverse_dependencies({**previous, **current})
+    frontier = list(result.api_changed | result.removed)
+    seen: set[str] = set(frontier)
+    while frontier:
+        for dep in rdeps.get(frontier.pop(), ()):
+            if dep not in seen:
+                seen.add(dep)
+                frontier.append(dep)
+    result.dependents = (seen & set(current)) - result.changed
+    for name, info in current.items():
+        if not info.output_hash:
+            result.changed.add(name)  # Never generated (or last attempt failed)
+    return result
+
+
+def builtin_generator(module: ModuleInfo, deps: dict[str, ModuleInfo]) -> str:
+    """Offline generator: renders the docstring, public API and dependencies."""
+    lines = [f"# `{module.name}`", ""]
+    if module.docstring:
+        lines += [module.docstring, ""]
+    if module.api:
+        lines += ["## Public API", "", "```python", *module.api, "```", ""]
+    if deps:
+        lines += ["## Depends on", ""]
+        lines += [f"- [`{d}`]({d}.md)" for d in sorted(deps)]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def scribe_agent_generator(agent: Path, timeout_sec: float = 600.0) -> Generator:
+    """
+    Wraps an external Scribe agent: it receives the module context as JSON on
+    stdin and must print Markdown on stdout.
+    """
+
+    def generate(module: ModuleInfo, deps: dict[str, ModuleInfo]) -> str:
+        payload = {
+            "module": asdict(module),
+            "dependencies": {
+                n: {"api": d.api, "docstring": d.docstring} for n, d in deps.items()
+            },
+        }
+        cmd = [str(agent), "--module", module.name]
+        with span("provider call"):
+            proc = subprocess.run(
+                cmd,  # noqa: S603 - agent path comes from trusted settings
+                input=json.dumps(payload),
+                capture_output=True,
+                text=True,
+                timeout=timeout_sec,
+                check=False,
+            )
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"agent exited {proc.returncode}: {proc.stderr.strip()[:500]}"
+            )
+        return proc.stdout
+
+    return generate
+
+
+def select_generator(agent_path: Path | None) -> Generator:
+    """The configured Scribe agent (`EKKO_SCRIBE_PATH`), else the offline renderer."""
+    if agent_path is None:
+        return builtin_generator
+    if not os.access(agent_path, os.X_OK):
+        raise FileNotFoundError(f"Scribe agent is not executable: {agent_path}")
+    return scribe_agent_generator(agent_path)
+
+
+def _pending_entry(p: ScribePlan, name: str) -> ModuleInfo:
+    """
+    Manifest entry for a module whose docs were not (re)written this run.
+
+    The previous entry keeps its old source and API hashes, so source edits
+    and API ripples are still detected; the cleared output hash makes the
+    next plan schedule the module even when its own source is unchanged.
+    """
+    return replace(p.previous.get(name, p.modules[name]), output_hash="")
+
+
+def run(
+    root: Path,
+    generator: Generator = builtin_generator,
+    output_dir: Path | None = None,
+    workers: int = 8,
+    force: bool = False,
+    only: Iterable[str] | None = None,
+) -> ScribeResult:
+    """
+    Plans, generates changed modules in parallel and updates the manifest.
+
+    With `only`, other modules that need docs stay pending in the manifest.
+    The manifest is rewritten as modules complete (at most once per
+    MANIFEST_SAVE_INTERVAL_SEC, and at the end), so an interrupted run keeps
+    its progress.
+    """
+    root = Path(root)
+    out_dir = root / (output_dir or DEFAULT_OUTPUT_DIR)
+    p = plan(root, force=force)
+    targets = sorted(p.to_generate if only is None else set(only) & set(p.modules))
+    logger.info(
+        f"Scribe: {len(p.modules)} modules, {len(p.changed)} changed, "
+        f"{len(p.dependents)} dependents, {len(p.removed)} removed"
+    )
+    result = ScribeResult(
+        generated=[], unchanged_output=[], failed={}, removed=sorted(p.removed)
+    )
+    for name in p.removed:
+        (out_dir / f"{name}.md").unlink(missing_ok=True)
+    if targets:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = dict(p.modules)
+    for name in p.to_generate | set(targets):
+        manifest[name] = _pending_entry(p, name)
+
+    def _generate(name: str) -> tuple[str, str]:
+        info = p.modules[name]
+        deps = {d: p.modules[d] for d in info.imports if d in p.modules and d != name}
+        return name, generator(info, deps)
+
+    last_save = time.monotonic()
+    with (
+        span("scribe generate"),
+        ThreadPoolExecutor(max_workers=max(1, workers)) as pool,
+    ):
+        # Each task runs in a copy of this context so its spans nest here
+        futures = {
+            pool.submit(contextvars.copy_context().run, _generate, name): name
+            for name in targets
+        }
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                _, text = fut.result()
+            except Exception as e:  # noqa: BLE001 - generators are pluggable; record and go on
+                logger.error(f"Scribe failed for {name}: {e}")
+                result.failed[name] = str(e)
+                continue
+            digest = hashlib.sha256(text.encode()).hexdigest()
+            out_file = out_dir / f"{name}.md"
+            if digest == p.modules[name].output_hash and out_file.exists():
+                result.unchanged_output.append(name)
+            else:
+                out_file.write_text(text, encoding="utf-8")
+                p.modules[name].output_hash = digest
+                result.generated.append(name)
+            manifest[name] = p.modules[name]
+            if time.monotonic() - last_save >= MANIFEST_SAVE_INTERVAL_SEC:
+                save_manifest(root, manifest)
+                last_save = time.monotonic()
+    save_manifest(root, manifest)
+    return result
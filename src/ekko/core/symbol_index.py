@@ -0,0 +1,479 @@
+"""
+Project Ekko - Symbol Index
+Per-project SQLite index (`.ekko/index.db`) of symbols, definitions,
+references and a BM25 full-text index over code chunks, used to assemble
+prompt context without rescanning the repository.
+
+Updates are incremental: files are re-read only when their size or mtime
+changed, and re-indexed only when their content hash changed. Queries are a
+single FTS5 `MATCH` plus an exact symbol lookup, then a greedy fill of the
+token budget with deduplicated chunks.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from ekko.core.timing import span
+from ekko.validation.scanner import walk_project
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = Path(".ekko") / "index.db"
+SCHEMA_VERSION = 1
+DEFAULT_INDEX_SUFFIXES = frozenset(
+    {".py", ".md", ".rst", ".txt", ".sh", ".yaml", ".yml", ".toml", ".cfg", ".ini"}
+)
+MAX_INDEX_BYTES = 1024 * 1024
+TEXT_CHUNK_LINES = 40
+MAX_CHUNK_LINES = 120  # Longer definitions are split into line windows
+CHARS_PER_TOKEN = 4  # Rough estimate; good enough for budgeting
+MAX_QUERY_TERMS = 32
+
+_SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE symbols (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE INDEX symbols_name ON symbols(name);
+CREATE INDEX symbols_file ON symbols(file_id);
+CREATE TABLE refs (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX refs_name ON refs(name);
+CREATE INDEX refs_file ON refs(file_id);
+CREATE TABLE chunks (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    symbol TEXT NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    tokens INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX chunks_file ON chunks(file_id);
+CREATE VIRTUAL TABLE chunks_fts USING fts5(symbol, words, text);
+"""
+
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+@dataclass(frozen=True)
+class Symbol:
+    path: str
+    name: str
+    qualname: str
+    kind: str
+    line: int
+    end_line: int
+    signature: str
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A retrievable piece of a file (a definition or a window of lines)."""
+
+    path: str
+    symbol: str
+    start_line: int
+    end_line: int
+    text: str
+    tokens: int
+    score: float = 0.0
+
+
+@dataclass
+class IndexStats:
+    scanned: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def split_identifier(name: str) -> list[str]:
+    """`load_HTTPConfig` -> ['load', 'http', 'config']."""
+    return [p.lower() for part in name.split("_") for p in _CAMEL.findall(part)]
+
+
+def _words(text: str) -> str:
+    """Identifier sub-words, so 'settings' matches `get_ekko_settings` and `EkkoSettings`."""
+    seen: dict[str, None] = {}
+    for ident in _IDENT.findall(text):
+        for w in split_identifier(ident):
+            seen.setdefault(w, None)
+    return " ".join(seen)
+
+
+def _line_windows(start: int, end: int, symbol: str) -> Iterator[tuple[str, int, int]]:
+    """Splits the line range [start, end] into windows of at most MAX_CHUNK_LINES."""
+    for s in range(start, end + 1, MAX_CHUNK_LINES):
+        yield symbol, s, min(s + MAX_CHUNK_LINES - 1, end)
+
+
+def _signature(node: ast.AST) -> str:
+    if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+        returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+        return f"def {node.name}({ast.unparse(node.args)}){returns}"
+    if isinstance(node, ast.ClassDef):
+        return f"class {node.name}({', '.join(ast.unparse(b) for b in node.bases)})"
+    return ""
+
+
+_SymbolRow = tuple[str, str, str, int, int, str]
+_ChunkRange = tuple[str, int, int]
+
+
+def parse_python(
+    source: str,
+) -> tuple[list[_SymbolRow], list[tuple[str, int]], list[_ChunkRange]]:
+    """
+    Returns (symbols, refs, chunk ranges) for a Python module.
+
+    Symbols are (name, qualname, kind, line, end_line, signature). Chunks are
+    one per top-level definition; classes become a header chunk plus one
+    chunk per method, so no two chunks overlap.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    symbols: list[_SymbolRow] = []
+    chunks: list[_ChunkRange] = []
+
+    def first_line(node: ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef) -> int:
+        return min([node.lineno, *(d.lineno for d in node.decorator_list)])
+
+    def visit(body: list[ast.stmt], prefix: str) -> None:
+        for node in body:
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef):
+                qual = f"{prefix}{node.name}"
+                kind = (
+                    "class"
+                    if isinstance(node, ast.ClassDef)
+                    else ("method" if prefix else "function")
+                )
+                end = node.end_lineno or node.lineno
+                start = first_line(node)
+                symbols.append(
+                    (node.name, qual, kind, node.lineno, end, _signature(node))
+                )
+                if isinstance(node, ast.ClassDef):
+                    methods = [
+                        first_line(n)
+                        for n in node.body
+                        if isinstance(n, ast.FunctionDef | ast.AsyncFunctionDef)
+                    ]
+                    header_end = min(methods) - 1 if methods else end
+                    chunks.extend(_line_windows(start, header_end, qual))
+                    visit(node.body, f"{qual}.")
+                else:
+                    chunks.extend(_line_windows(start, end, qual))
+            elif not prefix:
+                targets = (
+                    node.targets
+                    if isinstance(node, ast.Assign)
+                    else [node.target]
+                    if isinstance(node, ast.AnnAssign)
+                    else []
+                )
+                for t in targets:
+                    if isinstance(t, ast.Name):
+                        end = node.end_lineno or node.lineno
+                        symbols.append((t.id, t.id, "variable", node.lineno, end, ""))
+
+    visit(tree.body, "")
+    # Module-level code between definitions (docstring, imports, constants)
+    covered = {ln for _, s, e in chunks for ln in range(s, e + 1)}
+    run_start = None
+    for ln in range(1, len(lines) + 2):
+        free = ln <= len(lines) and ln not in covered
+        if free and run_start is None:
+            run_start = ln
+        elif not free and run_start is not None:
+            filled = [i for i in range(run_start, ln) if lines[i - 1].strip()]
+            if filled:
+                chunks.extend(_line_windows(filled[0], filled[-1], "<module>"))
+            run_start = None
+
+    refs: set[tuple[str, int]] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            refs.add((node.id, node.lineno))
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load):
+            refs.add((node.attr, node.lineno))
+    return symbols, sorted(refs), chunks
+
+
+def _text_chunks(lines: list[str]) -> list[_ChunkRange]:
+    chunks = []
+    for s in range(1, len(lines) + 1, TEXT_CHUNK_LINES):
+        e = min(s + TEXT_CHUNK_LINES - 1, len(lines))
+        if any(ln.strip() for ln in lines[s - 1 : e]):
+            chunks.append(("", s, e))
+    return chunks
+
+
+class SymbolIndex:
+    """
+    Incrementally maintained SQLite index for one project.
+
+    One instance owns one connection; use one per thread.
+    """
+
+    def __init__(self, root: Path | str, db_path: Path | None = None):
+        self.root = Path(root).resolve()
+        self.db_path = db_path or self.root / INDEX_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._conn:
+            for (name,) in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' "
+                "AND name NOT LIKE 'chunks_fts_%'"
+            ).fetchall():
+                self._conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def rebuild(self) -> IndexStats:
+        self._create_schema()
+        return self.update()
+
+    def update(self, suffixes: frozenset[str] = DEFAULT_INDEX_SUFFIXES) -> IndexStats:
+        """Brings the index in line with the working tree."""
+        stats = IndexStats()
+        known = {
+            path: (fid, mtime, size, digest)
+            for fid, path, mtime, size, digest in self._conn.execute(
+                "SELECT id, path, mtime_ns, size, hash FROM files"
+            )
+        }
+        seen: set[str] = set()
+        with span("index update"), self._conn:
+            for path in walk_project(self.root, suffixes=suffixes):
+                rel = path.relative_to(self.root).as_posix()
+                if rel.startswith(".ekko/"):
+                    continue
+                seen.add(rel)
+                stats.scanned += 1
+                try:
+                    st = path.stat()
+                    old = known.get(rel)
+                    if old and old[1] == st.st_mtime_ns and old[2] == st.st_size:
+                        stats.unchanged += 1
+                        continue
+                    if st.st_size > MAX_INDEX_BYTES:
+                        if old:  # Grew past the limit: drop its stale chunks
+                            self._delete_file(old[0])
+                            stats.removed += 1
+                        continue
+                    data = path.read_bytes()
+                except OSError as e:
+                    logger.warning(f"Index skipping {path}: {e}")
+                    continue
+                digest = hashlib.sha256(data).hexdigest()
+                if old and old[3] == digest:  # Touched but identical
+                    self._conn.execute(
+                        "UPDATE files SET mtime_ns=?, size=? WHERE id=?",
+                        (st.st_mtime_ns, st.st_size, old[0]),
+                    )
+                    stats.unchanged += 1
+                    continue
+                if old:
+                    self._delete_file(old[0])
+                self._index_file(
+                    rel, path.suffix, data, st.st_mtime_ns, st.st_size, digest
+                )
+                stats.updated += 1
+            for rel in set(known) - seen:
+                self._delete_file(known[rel][0])
+                stats.removed += 1
+        logger.info(
+            f"Index {self.root}: {stats.updated} updated, {stats.unchanged} unchanged, "
+            f"{stats.removed} removed"
+        )
+        return stats
+
+    def _delete_file(self, file_id: int) -> None:
+        self._conn.execute(
+            "DELETE FROM chunks_fts WHERE rowid IN (SELECT id FROM chunks WHERE file_id=?)",
+            (file_id,),
+        )
+        self._conn.execute("DELETE FROM files WHERE id=?", (file_id,))
+
+    def _index_file(
+        self, rel: str, suffix: str, data: bytes, mtime_ns: int, size: int, digest: str
+    ) -> None:
+        text = data.decode("utf-8", errors="replace")
+        lines = text.splitlines()
+        symbols: list[_SymbolRow] = []
+        refs: list[tuple[str, int]] = []
+        chunk_ranges: list[_ChunkRange]
+        if suffix == ".py":
+            try:
+                symbols, refs, chunk_ranges = parse_python(text)
+            except (SyntaxError, ValueError) as e:
+                logger.debug(f"Index: {rel} is not parseable ({e}); indexing as text")
+                chunk_ranges = _text_chunks(lines)
+        else:
+            chunk_ranges = _text_chunks(lines)
+
+        cur = self._conn.execute(
+            "INSERT INTO files(path, mtime_ns, size, hash) VALUES (?, ?, ?, ?)",
+            (rel, mtime_ns, size, digest),
+        )
+        file_id = cur.lastrowid
+        self._conn.executemany(
+            "INSERT INTO symbols(file_id, name, qualname, kind, line, end_line, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(file_id, *s) for s in symbols],
+        )
+        self._conn.executemany(
+            "INSERT INTO refs(file_id, name, line) VALUES (?, ?, ?)",
+            [(file_id, name, line) for name, line in refs],
+        )
+        for symbol, start, end in sorted(chunk_ranges, key=lambda c: c[1]):
+            body = "\n".join(lines[start - 1 : end])
+            cur = self._conn.execute(
+                "INSERT INTO chunks(file_id, symbol, start_line, end_line, tokens, text) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (file_id, symbol, start, end, estimate_tokens(body), body),
+            )
+            self._conn.execute(
+                "INSERT INTO chunks_fts(rowid, symbol, words, text) VALUES (?, ?, ?, ?)",
+                (
+                    cur.lastrowid,
+                    f"{rel} {symbol}",
+                    _words(f"{rel} {symbol} {body}"),
+                    body,
+                ),
+            )
+
+    def definitions(self, name: str) -> list[Symbol]:
+        """Symbols named `name` (or with that qualified name)."""
+        rows = self._conn.execute(
+            "SELECT f.path, s.name, s.qualname, s.kind, s.line, s.end_line, s.signature "
+            "FROM symbols s JOIN files f ON f.id = s.file_id WHERE s.name = ? OR s.qualname = ? "
+            "ORDER BY f.path, s.line",
+            (name, name),
+        )
+        return [Symbol(*r) for r in rows]
+
+    def references(self, name: str) -> list[tuple[str, int]]:
+        """(path, line) of every load of `name` as a variable or attribute."""
+        return self._conn.execute(
+            "SELECT f.path, r.line FROM refs r JOIN files f ON f.id = r.file_id "
+            "WHERE r.name = ? ORDER BY f.path, r.line",
+            (name,),
+        ).fetchall()
+
+    def query(
+        self, text: str, token_budget: int = 2000, limit: int = 100
+    ) -> list[Chunk]:
+        """
+        Best chunks for `text` that fit in `token_budget`.
+
+        Chunks defining a symbol named in the query come first, then BM25
+        matches (symbol/path hits weighted above body hits). Identical chunk
+        bodies and chunks overlapping an already selected range are skipped.
+        """
+        idents = list(dict.fromkeys(_IDENT.findall(text)))[:MAX_QUERY_TERMS]
+        terms = list(dict.fromkeys(w for i in idents for w in split_identifier(i)))
+        if not terms:
+            return []
+        candidates: list[Chunk] = []
+        if idents:
+            candidates.extend(
+                Chunk(path, symbol, start, end, body, tokens, score=-1e9)
+                for path, symbol, start, end, body, tokens in self._conn.execute(
+                    "SELECT f.path, c.symbol, c.start_line, c.end_line, c.text, c.tokens "
+                    "FROM symbols s JOIN files f ON f.id = s.file_id "
+                    "JOIN chunks c ON c.file_id = s.file_id AND c.start_line <= s.line "
+                    "AND c.end_line >= s.line "
+                    "WHERE s.name IN (SELECT value FROM json_each(?)) AND s.kind != 'variable'",
+                    (json.dumps(idents),),
+                )
+            )
+        match = " OR ".join(f'"{t}"' for t in terms)
+        candidates.extend(
+            Chunk(*row)
+            for row in self._conn.execute(
+                "SELECT f.path, c.symbol, c.start_line, c.end_line, c.text, c.tokens, "
+                "bm25(chunks_fts, 10.0, 2.0, 1.0) AS score "
+                "FROM chunks_fts JOIN chunks c ON c.id = chunks_fts.rowid "
+                "JOIN files f ON f.id = c.file_id "
+                "WHERE chunks_fts MATCH ? ORDER BY score LIMIT ?",
+                (match, limit),
+            )
+        )
+        return select_chunks(candidates, token_budget)
+
+    def context(self, text: str, token_budget: int = 2000) -> str:
+        """`query()` rendered as a prompt-ready Markdown block."""
+        return "\n\n".join(
+            f"### {c.path}:{c.start_line}-{c.end_line}"
+            + (f" ({c.symbol})" if c.symbol else "")
+            + f"\n```\n{c.text}\n```"
+            for c in self.query(text, token_budget)
+        )
+
+
+def select_chunks(candidates: Iterable[Chunk], token_budget: int) -> list[Chunk]:
+    """Greedy, order-preserving fill of `token_budget` without duplicates or overlaps."""
+    selected: list[Chunk] = []
+    bodies: set[str] = set()
+    ranges: dict[str, list[tuple[int, int]]] = {}
+    used = 0
+    for c in candidates:
+        if used + c.tokens > token_budget:
+            continue
+        body = c.text.strip()
+        if body in bodies:
+            continue
+        spans = ranges.setdefault(c.path, [])
+        if any(s <= c.end_line and c.start_line <= e for s, e in spans):
+            continue
+        bodies.add(body)
+        spans.append((c.start_line, c.end_line))
+        selected.append(c)
+        used += c.tokens
+    return selected
@@ -0,0 +1,207 @@
+"""
+Project Ekko - Stage Timing & Profiling Hooks
+Lightweight nested spans for recording where time goes inside a command,
+plus the profilers behind the CLI's global `--profile` option.
+
+Spans are off by default; a disabled `span()` returns a shared no-op context
+manager, so instrumented code pays one attribute lookup and one call.
+"""
+
+import contextlib
+import contextvars
+import cProfile
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from functools import wraps
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NULL_SPAN = contextlib.nullcontext()
+_lock = threading.Lock()
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "ekko_span", default=None
+)
+
+
+class Span:
+    """One timed stage; children are stages started while it was open."""
+
+    __slots__ = ("name", "start_ns", "duration_ns", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start_ns = time.perf_counter_ns()
+        self.duration_ns = 0
+        self.children: list[Span] = []
+
+
+class _State:
+    enabled = False
+
+
+_state = _State()
+_roots: list[Span] = []
+
+
+def enable_timings(enabled: bool = True) -> None:
+    """Turns span recording on or off and clears recorded spans."""
+    _state.enabled = enabled
+    with _lock:
+        _roots.clear()
+
+
+def timings_enabled() -> bool:
+    return _state.enabled
+
+
+@contextlib.contextmanager
+def _record(name: str) -> Iterator[Span]:
+    parent = _current.get()
+    node = Span(name)
+    with _lock:
+        (parent.children if parent is not None else _roots).append(node)
+    token = _current.set(node)
+    try:
+        yield node
+    finally:
+        node.duration_ns = time.perf_counter_ns() - node.start_ns
+        _current.reset(token)
+
+
+def span(name: str):
+    """Context manager timing a stage, e.g. `with span("settings load"): ...`."""
+    if not _state.enabled:
+        return _NULL_SPAN
+    return _record(name)
+
+
+def timed(name: str | None = None) -> Callable[[F], F]:
+    """Decorator form of `span()`; defaults to the function's qualified name."""
+
+    def decorator(fn: F) -> F:
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return fn(*args, **kwargs)
+            with _record(label):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def summarize() -> list[tuple[str, int, float, float, float]]:
+    """Aggregates spans by path: (path, calls, total_ms, mean_ms, max_ms)."""
+    totals: dict[str, list[float]] = {}
+
+    def walk(nodes: list[Span], prefix: str) -> None:
+        for n in nodes:
+            path = f"{prefix} > {n.name}" if prefix else n.name
+            totals.setdefault(path, []).append(n.duration_ns / 1e6)
+            walk(n.children, path)
+
+    with _lock:
+        walk(_roots, "")
+    return [
+        (path, len(v), sum(v), sum(v) / len(v), max(v)) for path, v in totals.items()
+    ]
+
+
+def print_summary(file=None) -> None:
+    """Prints the span summary as a table (stderr by default)."""
+    rows = summarize()
+    if not rows:
+        return
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Ekko stage timings", title_justify="left")
+    table.add_column("Stage")
+    for col in ("Calls", "Total ms", "Mean ms", "Max ms"):
+        table.add_column(col, justify="right")
+    for path, calls, total, mean, peak in rows:
+        depth = path.count(" > ")
+        label = ("  " * depth) + path.rsplit(" > ", 1)[-1]
+        table.add_row(label, str(calls), f"{total:.2f}", f"{mean:.2f}", f"{peak:.2f}")
+    Console(file=file or sys.stderr).print(table)
+
+
+class SamplingProfiler:
+    """
+    Samples the target thread's stack every `interval` seconds and writes
+    collapsed stacks (`a;b;c count`), the input format of flamegraph.pl,
+    speedscope and inferno.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int | None = None):
+        self._interval = interval
+        self._thread_id = thread_id or threading.get_ident()
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="ekko-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def dump(self, path: Path) -> None:
+        path.write_text("".join(f"{s} {n}\n" for s, n in self._stacks.most_common()))
+
+
+def start_profiler(output: Path, mode: str = "cprofile") -> Callable[[], None]:
+    """
+    Starts a profiler and returns a function that stops it and writes `output`.
+
+    `cprofile` writes a pstats file (snakeviz, `python -m pstats`, gprof2dot);
+    `sample` writes collapsed stacks for flame graphs.
+    """
+    if mode == "cprofile":
+        prof = cProfile.Profile()
+        prof.enable()
+
+        def finish() -> None:
+            prof.disable()
+            prof.dump_stats(output)
+            logger.info(f"Profile (pstats) written to {output}")
+
+    elif mode == "sample":
+        sampler = SamplingProfiler()
+        sampler.start()
+
+        def finish() -> None:
+            sampler.stop()
+            sampler.dump(output)
+            logger.info(f"Profile (collapsed stacks) written to {output}")
+
+    else:
+        raise ValueError(f"Unknown profiler mode: {mode}")
+    return finish
@@ -11,18 +11,20 @@ import subprocess
 import sys
 from pathlib import Path  # Added missing import
 
-# Basic logging setup (Consider moving to a central config loader later)
-logging.basicConfig(level=os.environ.get("EKKO_LOG_LEVEL", "INFO").upper())
+from ekko.core.logging_setup import configure_logging
+
+# Configured in main(), not on import
 logger = logging.getLogger("ekko.main")
 
 
-def run_cli_via_entrypoint():
+def run_cli_via_entrypoint() -> int:
     """Attempts to run the CLI using the installed 'ekko' command."""
     logger.info("Attempting to run CLI via 'ekko' entry point...")
     try:
         # Ensure arguments are sanitized or trusted
         trusted_args = [arg for arg in sys.argv[1:] if not arg.startswith("-")]
-        result = subprocess.run(["ekko"] + trusted_args, check=False, text=True)
+        cmd = ["ekko", *trusted_args]
+        result = subprocess.run(cmd, check=False, text=True)  # noqa: S603 - no shell
         return result.returncode
     except FileNotFoundError:
         logger.error(
@@ -36,7 +38,7 @@ def run_cli_via_entrypoint():
         return 1
 
 
-def run_tui_directly():
+def run_tui_directly() -> int:
     """Runs the TUI script directly using the current Python interpreter."""
     logger.info("Attempting to run TUI directly...")
     tui_script = Path(__file__).parent / "tui" / "main.py"
@@ -46,8 +48,8 @@ def run_tui_directly():
         return 1
     try:
         # Ensure arguments are sanitized or trusted
-        trusted_args = [str(tui_script)]
-        result = subprocess.run([sys.executable] + trusted_args, check=False, text=True)
+        cmd = [sys.executable, str(tui_script)]
+        result = subprocess.run(cmd, check=False, text=True)  # noqa: S603 - no shell
         return result.returncode
     except Exception as e:
         logger.error(f"Error running TUI directly: {e}", exc_info=True)
@@ -55,13 +57,14 @@ def run_tui_directly():
         return 1
 
 
-if __name__ == "__main__":
+def main() -> int:
+    """Configures logging and dispatches to the CLI or the TUI."""
+    configure_logging(os.environ.get("EKKO_LOG_LEVEL", "INFO"))
     run_mode = (
         "cli" if len(sys.argv) > 1 else os.environ.get("EKKO_RUN_MODE", "tui").lower()
     )
     logger.info(f"Ekko main entry point executed. Detected Mode: {run_mode}")
 
-    exit_code = 1  # Default error code
     if run_mode == "cli":
         exit_code = run_cli_via_entrypoint()
     elif run_mode == "tui":
@@ -72,5 +75,8 @@ if __name__ == "__main__":
             file=sys.stderr,
         )
         exit_code = 2
+    return exit_code
 
-    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    sys.exit(main())
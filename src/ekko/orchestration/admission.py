@@ -0,0 +1,263 @@
+"""
+Project Ekko - Resource-Aware Admission Control
+Sizes worker pools from live host metrics and admits or defers tasks based on
+memory and disk headroom.
+
+Two mechanisms, both driven by the same psutil sample:
+
+* `limit()` is the target concurrency. It steps up when CPU is below
+  `cpu_low` and memory is comfortable, and halves when CPU is above
+  `cpu_high`, the load average per CPU is above `load_high`, memory is
+  short or the host is swapping. Between the
+  thresholds it holds, and changes are rate-limited by a cooldown, so the
+  pool does not flap around a single threshold.
+* `try_acquire(kind)` reserves a task's estimated memory and disk footprint
+  and refuses when that would eat into the configured reserves. Reservations
+  are released when the task ends. The estimates double-count once a task's
+  real usage shows up in the sample, which errs on the side of not swapping.
+  Disk is only checked for kinds that write (`disk_mb > 0`), and with
+  nothing running one task is always admitted, so a host that is short on
+  headroom slows a run to one task at a time instead of stalling it.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+DEFAULT_SAMPLE_INTERVAL_SEC = 1.0
+DEFAULT_COOLDOWN_SEC = 5.0
+DEFAULT_CPU_HIGH = 85.0
+DEFAULT_CPU_LOW = 60.0
+DEFAULT_LOAD_HIGH = 1.5  # 1-minute load average per CPU
+DEFAULT_MEM_RESERVE_MB = 1024
+DEFAULT_DISK_RESERVE_MB = 2048
+SWAP_RATE_MB_PER_SEC = 8.0  # Swap-in/out traffic above this counts as swapping
+
+
+@dataclass(frozen=True)
+class TaskProfile:
+    """Estimated footprint of one task of a given kind."""
+
+    mem_mb: int
+    disk_mb: int = 0
+
+
+DEFAULT_PROFILES: dict[str, TaskProfile] = {
+    "validation": TaskProfile(mem_mb=128),
+    "scaffold": TaskProfile(mem_mb=256, disk_mb=200),
+    "deploy": TaskProfile(mem_mb=512, disk_mb=500),
+}
+
+
+@dataclass(frozen=True)
+class HostSample:
+    """One reading of the host's load and headroom."""
+
+    timestamp: float
+    cpu_percent: float
+    load_per_cpu: float
+    mem_available_mb: float
+    swap_mb_per_sec: float
+    disk_free_mb: float
+
+
+def sample_host(
+    disk_path: Path | str = ".", swap_state: dict | None = None
+) -> HostSample:
+    """
+    Reads CPU, load average, available memory, swap traffic and free disk.
+
+    Swap traffic is a rate, so it needs the previous reading: pass the same
+    `swap_state` dict on every call.
+    """
+    now = time.monotonic()
+    cpu = psutil.cpu_percent(interval=None)
+    try:
+        load_per_cpu = os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        load_per_cpu = cpu / 100
+    mem = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    swap_rate = 0.0
+    if swap_state is not None:
+        moved = (swap.sin + swap.sout) / MB
+        if "t" in swap_state and now > swap_state["t"]:
+            swap_rate = max(0.0, moved - swap_state["moved"]) / (now - swap_state["t"])
+        swap_state.update(t=now, moved=moved)
+    return HostSample(
+        timestamp=now,
+        cpu_percent=cpu,
+        load_per_cpu=load_per_cpu,
+        mem_available_mb=mem.available / MB,
+        swap_mb_per_sec=swap_rate,
+        disk_free_mb=shutil.disk_usage(disk_path).free / MB,
+    )
+
+
+class AdmissionController:
+    """Thread-safe pool sizing and per-task admission for one Ekko run."""
+
+    def __init__(
+        self,
+        min_workers: int = 1,
+        max_workers: int | None = None,
+        initial_workers: int | None = None,
+        cpu_high: float = DEFAULT_CPU_HIGH,
+        cpu_low: float = DEFAULT_CPU_LOW,
+        load_high: float = DEFAULT_LOAD_HIGH,
+        mem_reserve_mb: int = DEFAULT_MEM_RESERVE_MB,
+        disk_reserve_mb: int = DEFAULT_DISK_RESERVE_MB,
+        disk_path: Path | str = ".",
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL_SEC,
+        cooldown_sec: float = DEFAULT_COOLDOWN_SEC,
+        profiles: dict[str, TaskProfile] | None = None,
+        sampler: Callable[[], HostSample] | None = None,
+    ):
+        if cpu_low >= cpu_high:
+            raise ValueError("cpu_low must be below cpu_high")
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers or os.cpu_count() or 1)
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.load_high = load_high
+        self.mem_reserve_mb = mem_reserve_mb
+        self.disk_reserve_mb = disk_reserve_mb
+        self.sample_interval = sample_interval
+        self.cooldown_sec = cooldown_sec
+        self.profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+        self._swap_state: dict = {}
+        self._sampler = sampler or (lambda: sample_host(disk_path, self._swap_state))
+        self._lock = threading.Lock()
+        self._target = min(
+            self.max_workers,
+            max(self.min_workers, initial_workers or self.max_workers // 2),
+        )
+        self._last_change = 0.0
+        self._sample: HostSample | None = None
+        self._reserved_mem_mb = 0
+        self._reserved_disk_mb = 0
+        self.running = 0
+        self.deferred = 0
+        self.forced = 0  # Admitted below the reserves because nothing was running
+        psutil.cpu_percent(interval=None)  # Prime the CPU counter
+
+    def sample(self) -> HostSample:
+        """The latest host sample, refreshed at most every `sample_interval`."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._sample is None
+                or now - self._sample.timestamp >= self.sample_interval
+            ):
+                try:
+                    self._sample = self._sampler()
+                except (psutil.Error, OSError) as e:
+                    logger.warning(f"Host sampling failed, keeping last sample: {e}")
+                    if self._sample is None:
+                        raise
+                self._adjust(self._sample)
+            return self._sample
+
+    def _pressure(self, s: HostSample) -> str | None:
+        if s.mem_available_mb < self.mem_reserve_mb:
+            return (
+                f"memory {s.mem_available_mb:.0f}MB < reserve {self.mem_reserve_mb}MB"
+            )
+        if s.swap_mb_per_sec > SWAP_RATE_MB_PER_SEC:
+            return f"swapping {s.swap_mb_per_sec:.1f}MB/s"
+        if s.cpu_percent > self.cpu_high:
+            return f"CPU {s.cpu_percent:.0f}% > {self.cpu_high:.0f}%"
+        if s.load_per_cpu > self.load_high:
+            return f"load {s.load_per_cpu:.2f}/CPU > {self.load_high:.2f}"
+        return None
+
+    def _adjust(self, s: HostSample) -> None:
+        """Hysteresis: shrink fast above the high band, grow slowly below the low band."""
+        if s.timestamp - self._last_change < self.cooldown_sec:
+            return
+        old = self._target
+        reason = self._pressure(s)
+        if reason is not None:
+            self._target = max(self.min_workers, self._target // 2)
+        elif (
+            s.cpu_percent < self.cpu_low
+            and s.load_per_cpu < self.load_high
+            and s.mem_available_mb > 2 * self.mem_reserve_mb
+            and self.running >= self._target  # Only grow a pool that is actually busy
+        ):
+            self._target = min(self.max_workers, self._target + 1)
+            reason = f"CPU {s.cpu_percent:.0f}% < {self.cpu_low:.0f}%"
+        if self._target != old:
+            self._last_change = s.timestamp
+            logger.info(f"Admission: workers {old} -> {self._target} ({reason})")
+
+    def limit(self) -> int:
+        """Current target number of concurrent tasks."""
+        self.sample()
+        return self._target
+
+    def try_acquire(self, kind: str) -> bool:
+        """
+        Reserves a concurrency slot and headroom for one `kind` task.
+
+        False means defer it: the pool is at its target size, or the task's
+        estimated footprint would cut into the memory or (for kinds that
+        write) disk reserve while other tasks are still running. With none
+        running the task is admitted anyway; waiting could never free more.
+        """
+        profile = self.profiles.get(kind, TaskProfile(mem_mb=0))
+        s = self.sample()
+        with self._lock:
+            if self.running >= self._target:
+                return False
+            mem_left = s.mem_available_mb - self._reserved_mem_mb - profile.mem_mb
+            disk_left = s.disk_free_mb - self._reserved_disk_mb - profile.disk_mb
+            short = mem_left < self.mem_reserve_mb or (
+                profile.disk_mb > 0 and disk_left < self.disk_reserve_mb
+            )
+            if short and self.running > 0:
+                self.deferred += 1
+                logger.debug(
+                    f"Admission: deferring {kind} (mem left {mem_left:.0f}MB, "
+                    f"disk left {disk_left:.0f}MB)"
+                )
+                return False
+            if short:
+                self.forced += 1
+                log = logger.warning if self.forced == 1 else logger.debug
+                log(
+                    f"Admission: admitting {kind} below reserves so the run can progress "
+                    f"(mem left {mem_left:.0f}MB, disk left {disk_left:.0f}MB)"
+                )
+            self._reserved_mem_mb += profile.mem_mb
+            self._reserved_disk_mb += profile.disk_mb
+            self.running += 1
+            return True
+
+    def release(self, kind: str) -> None:
+        profile = self.profiles.get(kind, TaskProfile(mem_mb=0))
+        with self._lock:
+            self._reserved_mem_mb = max(0, self._reserved_mem_mb - profile.mem_mb)
+            self._reserved_disk_mb = max(0, self._reserved_disk_mb - profile.disk_mb)
+            self.running = max(0, self.running - 1)
+
+    @contextmanager
+    def slot(self, kind: str, poll_sec: float = 0.5) -> Iterator[None]:
+        """Blocks until a `kind` task is admitted, then holds its reservation."""
+        while not self.try_acquire(kind):
+            time.sleep(poll_sec)
+        try:
+            yield
+        finally:
+            self.release(kind)
@@ -0,0 +1,363 @@
+"""
+Project Ekko - Multi-Project Batch Orchestration
+Discovers projects under `project_base_dir` and runs their work on one shared
+worker pool with round-robin fair sharing.
+
+Each project contributes a lazy stream of small tasks (e.g. "scan these 64
+files"). Whenever a worker frees up, the next task is taken from the next
+project in rotation, so a project with 100k files gets the same share of the
+pool as one with ten, and small projects finish early instead of queueing
+behind large ones.
+"""
+
+import contextvars
+import fnmatch
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ekko.core.logging_setup import get_logger
+from ekko.core.timing import span
+from ekko.orchestration.admission import AdmissionController
+from ekko.orchestration.events import EventBus, Topic
+from ekko.validation.scanner import (
+    DEFAULT_SCAN_SUFFIXES,
+    QUALITY_PROFILE,
+    Finding,
+    PatternScanner,
+    load_banned_patterns,
+    walk_project,
+)
+
+logger = logging.getLogger(__name__)
+log = get_logger(__name__)  # Structured per-job records
+
+DEFAULT_MAX_WORKERS = 8
+SCAN_BATCH_FILES = 64
+DEFER_POLL_SEC = 0.5
+DEFER_WARN_SEC = 30.0
+
+Task = Callable[[], Any]
+
+
+def discover_projects(base_dir: Path, pattern: str = "*") -> list[Path]:
+    """
+    Project directories directly under `base_dir` whose name matches `pattern`.
+
+    Hidden directories are skipped. A pattern containing `/` is matched
+    against the path relative to `base_dir` (e.g. `team-a/*`).
+    """
+    base_dir = Path(base_dir).expanduser()
+    if not base_dir.is_dir():
+        raise FileNotFoundError(f"Project base directory not found: {base_dir}")
+    if "/" in pattern:
+        candidates = base_dir.glob(pattern)
+    else:
+        candidates = (p for p in base_dir.iterdir() if fnmatch.fnmatch(p.name, pattern))
+    return sorted(
+        p
+        for p in candidates
+        if p.is_dir()
+        and not any(part.startswith(".") for part in p.relative_to(base_dir).parts)
+    )
+
+
+@dataclass
+class Job:
+    """One project's share of a batch: a lazy stream of independent tasks."""
+
+    name: str
+    tasks: Iterable[Task]
+    results: list[Any] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    started: float = 0.0
+    elapsed: float = 0.0
+    _iter: Iterator[Task] | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _pending: int = field(default=0, repr=False)
+    _exhausted: bool = field(default=False, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+_EXHAUSTED = object()  # Step result: the job had no tasks left
+
+
+def _run_next_task(job: Job) -> Any:
+    """
+    Pool step: takes the job's next task and runs it, both on the worker.
+
+    Task streams are lazy (a directory walk, say), so pulling from them on
+    the coordinator would serialize generation across every project. The
+    job's lock keeps its iterator single-consumer; a failed generator ends
+    the job and its error is recorded like a task failure.
+    """
+    with job._lock:
+        tasks = job._iter
+        if job._exhausted or tasks is None:
+            return _EXHAUSTED
+        try:
+            task = next(tasks)
+        except StopIteration:
+            job._exhausted = True
+            return _EXHAUSTED
+        except BaseException:
+            job._exhausted = True
+            raise
+    return task()
+
+
+class FairScheduler:
+    """
+    Runs many jobs' tasks on one thread pool, handing each free worker to the
+    next job in round-robin order.
+
+    Workers pull each job's next task themselves, so lazy task generation
+    runs in parallel across jobs instead of on the dispatching thread.
+
+    `max_workers` may be a callable; it is re-read before every dispatch so
+    pool size can follow external limits while a batch runs. With an
+    `admission` controller, every dispatch must also be admitted as a `kind`
+    task; deferred dispatches wait for a running task to finish or for host
+    headroom to come back. With an `events` bus, job start and finish are
+    published on `Topic.JOB` (deploy jobs also on `Topic.DEPLOY`) without
+    waiting on subscribers.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | Callable[[], int] = DEFAULT_MAX_WORKERS,
+        on_job_done: Callable[[Job], None] | None = None,
+        admission: AdmissionController | None = None,
+        kind: str = "validation",
+        events: EventBus | None = None,
+    ):
+        self._pool_size: int | None
+        if admission is not None:
+            self._limit: Callable[[], int] = admission.limit
+            self._pool_size = admission.max_workers
+        elif callable(max_workers):
+            self._limit = max_workers
+            self._pool_size = None
+        else:
+            self._limit = lambda: max_workers
+            self._pool_size = max_workers
+        self._on_job_done = on_job_done
+        self._admission = admission
+        self._kind = kind
+        self._events = events
+
+    def _publish(self, event: str, data: dict[str, Any]) -> None:
+        if self._events is not None:
+            payload = {**data, "kind": self._kind}
+            self._events.publish_threadsafe(Topic.JOB, event, payload, source="batch")
+            if self._kind == "deploy":
+                self._events.publish_threadsafe(
+                    Topic.DEPLOY, event, payload, source="batch"
+                )
+
+    def _start(self, job: Job) -> None:
+        job._iter = iter(job.tasks)
+        job.started = time.perf_counter()
+        self._publish("started", {"job": job.name})
+
+    def _finish(self, job: Job) -> None:
+        job.elapsed = time.perf_counter() - job.started
+        log.debug(
+            "batch job done",
+            job=job.name,
+            kind=self._kind,
+            elapsed=round(job.elapsed, 3),
+            errors=len(job.errors),
+        )
+        self._publish(
+            "finished", {"job": job.name, "ok": job.ok, "elapsed": job.elapsed}
+        )
+        if self._on_job_done is not None:
+            self._on_job_done(job)
+
+    def _dispatch(
+        self,
+        pool: ThreadPoolExecutor,
+        ring: deque[Job],
+        inflight: dict[Future, Job],
+        cap: int,
+    ) -> bool:
+        """Fills free workers from the ring; returns True if admission deferred a dispatch."""
+        while ring and len(inflight) < min(max(self._limit(), 1), cap):
+            job = ring.popleft()
+            if job._exhausted:
+                continue  # Its remaining steps are reaped; the last one finishes it
+            if self._admission is not None and not self._admission.try_acquire(
+                self._kind
+            ):
+                ring.appendleft(job)
+                return True
+            if job._iter is None:
+                self._start(job)
+            # Pool threads don't inherit context; carry it so spans nest
+            ctx = contextvars.copy_context()
+            inflight[pool.submit(ctx.run, _run_next_task, job)] = job
+            job._pending += 1
+            ring.append(job)
+        return False
+
+    def _reap(self, done: Iterable[Future], inflight: dict[Future, Job]) -> None:
+        for fut in done:
+            job = inflight.pop(fut)
+            job._pending -= 1
+            if self._admission is not None:
+                self._admission.release(self._kind)
+            try:
+                result = fut.result()
+            except Exception as e:  # noqa: BLE001 - task failures are recorded on their job
+                job.errors.append(f"{type(e).__name__}: {e}")
+            else:
+                if result is not _EXHAUSTED:
+                    job.results.append(result)
+            if job._exhausted and job._pending == 0:
+                self._finish(job)
+
+    def run(self, jobs: list[Job], pool_size: int | None = None) -> list[Job]:
+        """Runs every job to completion; task exceptions are recorded on the job."""
+        ring: deque[Job] = deque(jobs)
+        inflight: dict[Future, Job] = {}
+        pool_size = pool_size or self._pool_size or max(self._limit(), 1)
+        deferred_since: float | None = None
+        with ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="ekko-batch"
+        ) as pool:
+            while ring or inflight:
+                deferred = self._dispatch(pool, ring, inflight, pool_size)
+                if deferred:
+                    now = time.monotonic()
+                    deferred_since = deferred_since or now
+                    if now - deferred_since >= DEFER_WARN_SEC:
+                        logger.warning(
+                            f"Batch: {self._kind} tasks deferred for {now - deferred_since:.0f}s "
+                            f"waiting for host headroom ({len(inflight)} running)"
+                        )
+                        deferred_since = now
+                else:
+                    deferred_since = None
+                if not inflight:
+                    if deferred:
+                        time.sleep(DEFER_POLL_SEC)
+                    continue
+                done, _ = wait(
+                    inflight,
+                    timeout=DEFER_POLL_SEC if deferred else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                self._reap(done, inflight)
+        return jobs
+
+
+@dataclass
+class ValidationReport:
+    """Aggregated validation outcome for one project."""
+
+    project: Path
+    scanned: int
+    findings: list[Finding]
+    errors: list[str]
+    elapsed: float
+    skipped: list[Path] = field(default_factory=list)  # Too large to scan
+
+    @property
+    def ok(self) -> bool:
+        return not self.findings and not self.errors
+
+
+def _chunks(items: Iterable[Path], size: int) -> Iterator[list[Path]]:
+    batch: list[Path] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validation_tasks(
+    project: Path, batch_files: int = SCAN_BATCH_FILES
+) -> Iterator[Task]:
+    """Lazily walks `project` and yields one scan task per batch of files."""
+    scanner = PatternScanner(load_banned_patterns(project))
+    profile_path = project / QUALITY_PROFILE
+    files = (
+        f
+        for f in walk_project(project, suffixes=DEFAULT_SCAN_SUFFIXES)
+        if f != profile_path
+    )
+    for batch in _chunks(files, batch_files):
+
+        def scan(batch: list[Path] = batch) -> tuple[int, list[Finding], list[Path]]:
+            findings: list[Finding] = []
+            skipped: list[Path] = []
+            for f in batch:
+                findings.extend(scanner.scan_file(f, skipped))
+            return len(batch) - len(skipped), findings, skipped
+
+        yield scan
+
+
+def validate_projects(
+    projects: list[Path],
+    max_workers: int | Callable[[], int] = DEFAULT_MAX_WORKERS,
+    on_project_done: Callable[[ValidationReport], None] | None = None,
+    admission: AdmissionController | None = None,
+    events: EventBus | None = None,
+) -> list[ValidationReport]:
+    """Validates all projects together on one fair-shared pool."""
+
+    def to_report(job: Job) -> ValidationReport:
+        return ValidationReport(
+            project=Path(job.name),
+            scanned=sum(n for n, _, _ in job.results),
+            findings=[f for _, fs, _ in job.results for f in fs],
+            errors=job.errors,
+            elapsed=job.elapsed,
+            skipped=[p for _, _, ps in job.results for p in ps],
+        )
+
+    jobs = [Job(str(p), validation_tasks(p)) for p in projects]
+    callback = (
+        (lambda job: on_project_done(to_report(job))) if on_project_done else None
+    )
+    with span("batch validate"):
+        FairScheduler(
+            max_workers, on_job_done=callback, admission=admission, events=events
+        ).run(jobs)
+    return [to_report(j) for j in jobs]
+
+
+def deploy_projects(
+    projects: list[Path],
+    env: str,
+    deploy: Callable[[Path, str], Any],
+    max_workers: int | Callable[[], int] = DEFAULT_MAX_WORKERS,
+    admission: AdmissionController | None = None,
+    events: EventBus | None = None,
+) -> list[Job]:
+    """Runs `deploy(project, env)` for every project on one fair-shared pool."""
+
+    def step(project: Path) -> Any:
+        with span("deploy step"):
+            return deploy(project, env)
+
+    jobs = [Job(str(p), [functools.partial(step, p)]) for p in projects]
+    with span("batch deploy"):
+        return FairScheduler(
+            max_workers, admission=admission, kind="deploy", events=events
+        ).run(jobs)
@@ -0,0 +1,392 @@
+"""
+Project Ekko - Orchestration Event Bus
+In-process asyncio pub/sub for progress events between validation, deploy,
+providers, the TUI and the API.
+
+Every subscriber owns a bounded queue with its own overflow policy:
+
+* `DROP_OLDEST` (default) keeps the newest events; right for UIs and log panes.
+* `DROP_NEW` keeps the backlog and discards new arrivals.
+* `BLOCK` makes `await publish()` wait for space (optionally up to a
+  timeout); for consumers that must see everything, e.g. an audit writer.
+
+Delivery offers each event to every drop-policy subscriber before waiting on
+any full BLOCK subscriber, so a slow drop-policy subscriber never slows a
+publisher and a slow BLOCK subscriber never delays the others.
+
+Worker threads publish through one bounded ingress queue per bus, drained in
+order by a single task on the bus's loop: events from threads keep their
+publish order, and a flood from threads is capped at `ingress_size` pending
+events (further ones are dropped and counted, or wait with `wait=True`).
+
+Events are `__slots__` records shared by reference across all subscribers;
+payloads are never copied, so treat them as immutable once published.
+"""
+
+import asyncio
+import concurrent.futures
+import enum
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 1_000
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_INGRESS_SIZE = 10_000
+
+
+class Topic(enum.StrEnum):
+    """Event topics; subscribers pick a set of these (or all)."""
+
+    JOB = "job"
+    VALIDATION = "validation"
+    SCAFFOLD = "scaffold"
+    DEPLOY = "deploy"
+    PROVIDER = "provider"
+    LOG = "log"
+    METRICS = "metrics"
+
+
+class Policy(enum.Enum):
+    """What a subscriber's full queue does with the next event."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEW = "drop_new"
+    BLOCK = "block"
+
+
+class SubscriptionClosedError(Exception):
+    """Raised by `Subscription.get()` once the subscription is closed and drained."""
+
+    pass
+
+
+class Event:
+    """One published event. Shared, not copied, between subscribers."""
+
+    __slots__ = ("topic", "kind", "payload", "source", "seq", "ts")
+
+    def __init__(self, topic: Topic, kind: str, payload: Any, source: str, seq: int):
+        self.topic = topic
+        self.kind = kind
+        self.payload = payload
+        self.source = source
+        self.seq = seq
+        self.ts = time.time()
+
+    def __repr__(self) -> str:
+        return f"Event({self.topic}/{self.kind} #{self.seq} from {self.source or '?'})"
+
+
+# A thread-published event and, for `wait=True`, the future set once delivered
+_IngressItem = tuple[Event, concurrent.futures.Future[None] | None]
+
+
+class Subscription:
+    """A subscriber's bounded queue. Only touched from the bus's event loop."""
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        topics: frozenset[Topic] | None,
+        maxsize: int,
+        policy: Policy,
+        name: str,
+        block_timeout: float | None,
+    ):
+        if maxsize < 1:
+            raise ValueError("Subscription maxsize must be at least 1")
+        self.topics = topics
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.closed = False
+        self._bus = bus
+        self._items: deque[Event] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def offer(self, event: Event) -> bool:
+        """Enqueues without waiting. False only for a full BLOCK subscriber."""
+        if self.closed:
+            return True
+        items = self._items
+        if len(items) < self.maxsize:
+            items.append(event)
+        elif self.policy is Policy.DROP_OLDEST:
+            items.popleft()
+            items.append(event)
+            self.dropped += 1
+        elif self.policy is Policy.DROP_NEW:
+            self.dropped += 1
+        else:
+            self._not_full.clear()
+            return False
+        self._not_empty.set()
+        return True
+
+    async def put(self, event: Event) -> None:
+        """Waits for space (BLOCK policy); drops the event after `block_timeout`."""
+        while not self.offer(event):
+            try:
+                await asyncio.wait_for(self._not_full.wait(), self.block_timeout)
+            except TimeoutError:
+                self.dropped += 1
+                logger.warning(
+                    f"Event subscriber '{self.name}' blocked too long; dropped {event!r}"
+                )
+                return
+
+    def _taken(self) -> None:
+        if not self._items:
+            self._not_empty.clear()
+        self._not_full.set()
+
+    def get_nowait(self) -> Event | None:
+        if not self._items:
+            return None
+        event = self._items.popleft()
+        self._taken()
+        return event
+
+    async def get(self) -> Event:
+        """Next event; raises SubscriptionClosedError when closed and drained."""
+        while not self._items:
+            if self.closed:
+                raise SubscriptionClosedError(self.name)
+            await self._not_empty.wait()
+        event = self._items.popleft()
+        self._taken()
+        return event
+
+    async def get_batch(
+        self, max_items: int = DEFAULT_BATCH_SIZE, timeout: float | None = None
+    ) -> list[Event]:
+        """
+        Waits for at least one event (up to `timeout`), then returns everything
+        queued, up to `max_items`, without further waiting. Returns [] on
+        timeout or once closed and drained.
+        """
+        if not self._items and not self.closed:
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout)
+            except TimeoutError:
+                return []
+        items = self._items
+        batch = [items.popleft() for _ in range(min(max_items, len(items)))]
+        if batch:
+            self._taken()
+        return batch
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        try:
+            return await self.get()
+        except SubscriptionClosedError:
+            raise StopAsyncIteration from None
+
+    def close(self) -> None:
+        """Unsubscribes; queued events can still be drained."""
+        if self.closed:
+            return
+        self.closed = True
+        self._bus._remove(self)
+        self._not_empty.set()
+        self._not_full.set()
+
+
+class EventBus:
+    """Routes events to subscribers by topic; publish from the loop or any thread."""
+
+    def __init__(self, ingress_size: int = DEFAULT_INGRESS_SIZE) -> None:
+        self._subs: list[Subscription] = []
+        self._routes: dict[Topic, tuple[Subscription, ...]] = {t: () for t in Topic}
+        self._seq = itertools.count(1)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._ingress: queue.Queue[_IngressItem] = queue.Queue(ingress_size)
+        self._ingress_ready: asyncio.Event | None = None
+        self._wakeup_pending = False
+        self._pump_task: asyncio.Task | None = None
+        self.ingress_dropped = 0
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Records the owning loop so publishers on other threads can hand off,
+        and starts the task draining their events. Call from that loop.
+        """
+        if self._pump_task is not None and not self._pump_task.done():
+            self._pump_task.cancel()
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._ingress_ready = ready = asyncio.Event()
+        self._wakeup_pending = False
+        self._pump_task = loop.create_task(self._pump(ready), name="ekko-event-bus")
+
+    def close(self) -> None:
+        """Stops the ingress task; pending thread-published events are discarded."""
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            self._pump_task = None
+        self._loop = None
+        self._loop_thread = None
+        while True:
+            try:
+                _, done = self._ingress.get_nowait()
+            except queue.Empty:
+                break
+            if done is not None:
+                done.set_result(None)  # Release threads waiting with `wait=True`
+
+    def _rebuild_routes(self) -> None:
+        # Copy-on-write: publish iterates a tuple and never needs a lock
+        self._routes = {
+            t: tuple(s for s in self._subs if s.topics is None or t in s.topics)
+            for t in Topic
+        }
+
+    def subscribe(
+        self,
+        topics: Iterable[Topic] | None = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        policy: Policy = Policy.DROP_OLDEST,
+        name: str = "",
+        block_timeout: float | None = None,
+    ) -> Subscription:
+        """New subscription to `topics` (all topics when None)."""
+        if self._loop is None:
+            self.bind_loop(asyncio.get_running_loop())
+        sub = Subscription(
+            self,
+            frozenset(topics) if topics is not None else None,
+            maxsize,
+            policy,
+            name or f"sub-{len(self._subs) + 1}",
+            block_timeout,
+        )
+        self._subs.append(sub)
+        self._rebuild_routes()
+        return sub
+
+    def _remove(self, sub: Subscription) -> None:
+        if sub in self._subs:
+            self._subs.remove(sub)
+            self._rebuild_routes()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subs)
+
+    def _make(self, topic: Topic, kind: str, payload: Any, source: str) -> Event:
+        return Event(topic, kind, payload, source, next(self._seq))
+
+    async def _deliver(self, event: Event) -> None:
+        # Every subscriber with room (and every drop-policy one) gets the event
+        # first; only then wait, on all full BLOCK subscribers at once
+        blocked = [sub for sub in self._routes[event.topic] if not sub.offer(event)]
+        if len(blocked) == 1:
+            await blocked[0].put(event)
+        elif blocked:
+            await asyncio.gather(*(sub.put(event) for sub in blocked))
+
+    async def publish(
+        self, topic: Topic, kind: str, payload: Any = None, source: str = ""
+    ) -> Event:
+        """Delivers to every subscriber; waits only on full BLOCK subscribers."""
+        event = self._make(topic, kind, payload, source)
+        await self._deliver(event)
+        return event
+
+    def publish_nowait(
+        self, topic: Topic, kind: str, payload: Any = None, source: str = ""
+    ) -> Event:
+        """
+        Non-waiting publish from the loop thread (sync callbacks). A full
+        BLOCK subscriber cannot be waited on here, so the event is dropped for
+        it and counted.
+        """
+        event = self._make(topic, kind, payload, source)
+        self._deliver_nowait(event)
+        return event
+
+    def _deliver_nowait(self, event: Event) -> None:
+        for sub in self._routes[event.topic]:
+            if not sub.offer(event):
+                sub.dropped += 1
+
+    def publish_threadsafe(
+        self,
+        topic: Topic,
+        kind: str,
+        payload: Any = None,
+        source: str = "",
+        wait: bool = False,
+    ) -> None:
+        """
+        Publishes from a worker thread through the bus's ingress queue.
+
+        Without `wait` this never blocks: when the ingress queue is full the
+        event is dropped and counted in `ingress_dropped`. With `wait=True`
+        the calling thread waits for ingress space and then until BLOCK
+        subscribers have accepted the event.
+        """
+        loop, ready = self._loop, self._ingress_ready
+        if loop is None or ready is None or loop.is_closed():
+            return
+        if threading.get_ident() == self._loop_thread:
+            self.publish_nowait(topic, kind, payload, source)
+            return
+        done: concurrent.futures.Future[None] | None = None
+        if wait:
+            done = concurrent.futures.Future()
+        try:
+            # Numbered by the pump, so `seq` follows delivery order across threads
+            event = Event(topic, kind, payload, source, 0)
+            self._ingress.put((event, done), block=wait)
+        except queue.Full:
+            self.ingress_dropped += 1
+            return
+        if not self._wakeup_pending:
+            # A redundant wakeup is harmless; the pump clears the flag before draining
+            self._wakeup_pending = True
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:  # Loop closed underneath us
+                return
+        if done is not None:
+            done.result()
+
+    async def _pump(self, ready: asyncio.Event) -> None:
+        """Drains thread-published events in order; the only consumer of the ingress."""
+        ingress = self._ingress
+        while True:
+            await ready.wait()
+            ready.clear()
+            self._wakeup_pending = False
+            while True:
+                try:
+                    event, done = ingress.get_nowait()
+                except queue.Empty:
+                    break
+                event.seq = next(self._seq)
+                await self._deliver(event)
+                if done is not None:
+                    done.set_result(None)
+
+
+bus = EventBus()
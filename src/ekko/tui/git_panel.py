@@ -0,0 +1,373 @@
+"""
+Ekko TUI - Git Panel
+Asynchronous, cached view of a Git repository backed by GitPython.
+
+All repository queries run in worker threads so a slow `git status` on a large
+monorepo never blocks rendering. Results are cached until `.git/index`, `HEAD`
+or the ref `HEAD` points to change on disk; the commit log is paged lazily
+from a single revision walk that is kept open between pages.
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from rich.markup import escape
+from textual.widgets import Static
+
+try:
+    import git
+except ImportError:  # GitPython is a core dependency, but keep the TUI usable
+    git = None  # type: ignore[assignment]
+
+# What a repository query may raise (missing repo, git failures, bad refs)
+_GIT_ERRORS: tuple[type[Exception], ...] = (OSError, ValueError, RuntimeError) + (
+    (git.GitError,) if git is not None else ()
+)
+logger = logging.getLogger("TUI.git")
+
+T = TypeVar("T")
+
+DEFAULT_LOG_PAGE_SIZE = 25
+WATCH_INTERVAL_SEC = 1.0
+
+
+@dataclass(frozen=True)
+class CommitEntry:
+    """A single commit row in the lazily paged log."""
+
+    hexsha: str
+    author: str
+    authored_date: int
+    summary: str
+
+
+@dataclass(frozen=True)
+class DiffStats:
+    """Aggregate diff statistics for the working tree and the index."""
+
+    unstaged: str
+    staged: str
+
+
+class GitRepoCache:
+    """
+    Thread-safe, signature-invalidated cache of Git repository queries.
+
+    Every public query is blocking and meant to be called from a worker thread.
+    Cached values are keyed on a cheap on-disk signature (mtimes of the index,
+    HEAD, the current ref and packed-refs), so repeated renders cost a few
+    `stat` calls instead of spawning `git`.
+
+    GitPython's persistent `cat-file` object database is not thread-safe, so
+    everything that reads objects (branches, the log walk) holds `_repo_lock`.
+    `status` and `diff_stats` spawn their own `git` processes and run freely.
+    """
+
+    def __init__(self, path: Path | str = ".", untracked: bool = True):
+        if git is None:
+            raise RuntimeError("GitPython is not installed.")
+        self._repo = git.Repo(path, search_parent_directories=True)
+        self._git_dir = Path(self._repo.git_dir)
+        self._untracked = untracked
+        self._lock = threading.Lock()
+        self._repo_lock = threading.Lock()
+        self._cache: dict[Any, Any] = {}
+        self._signature = self._compute_signature()
+        self._log_signature: tuple[int, ...] | None = None
+        self._log_iter: Iterator[Any] | None = None
+        self._log_entries: list[CommitEntry] = []
+        self._log_done = False
+
+    @property
+    def working_dir(self) -> str:
+        return str(self._repo.working_tree_dir or self._git_dir)
+
+    def _compute_signature(self) -> tuple[int, ...]:
+        watched = [
+            self._git_dir / "index",
+            self._git_dir / "HEAD",
+            self._git_dir / "packed-refs",
+        ]
+        try:
+            head = (self._git_dir / "HEAD").read_text().strip()
+            if head.startswith("ref: "):
+                watched.append(self._git_dir / head[5:])
+        except OSError:
+            pass
+        sig: list[int] = []
+        for p in watched:
+            try:
+                st = p.stat()
+                sig.extend((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.extend((0, 0))
+        return tuple(sig)
+
+    def check_invalidate(self) -> bool:
+        """Drops cached results if the repository changed. Returns True if it did."""
+        sig = self._compute_signature()
+        with self._lock:
+            if sig == self._signature:
+                return False
+            self._signature = sig
+            self._cache.clear()
+        logger.debug("Git cache invalidated (index/HEAD changed).")
+        return True
+
+    def _cached(self, key: Any, fn: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._cache:
+                hit: T = self._cache[key]
+                return hit
+            sig = self._signature
+        value = fn()
+        with self._lock:
+            # Only store if nothing invalidated the cache while we were computing
+            if sig == self._signature:
+                self._cache[key] = value
+        return value
+
+    def status(self) -> list[str]:
+        """Porcelain status lines, including the `## branch` header."""
+
+        def _query() -> list[str]:
+            out: str = self._repo.git.status(
+                "--porcelain=v1",
+                "--branch",
+                f"--untracked-files={'normal' if self._untracked else 'no'}",
+            )
+            return out.splitlines()
+
+        return self._cached("status", _query)
+
+    def branches(self) -> tuple[str, list[str]]:
+        """Returns (active branch or detached sha, local branch names)."""
+
+        def _query() -> tuple[str, list[str]]:
+            with self._repo_lock:
+                try:
+                    active = self._repo.active_branch.name
+                except TypeError:
+                    active = f"(detached {self._repo.head.commit.hexsha[:8]})"
+                return active, sorted(h.name for h in self._repo.heads)
+
+        return self._cached("branches", _query)
+
+    def diff_stats(self) -> DiffStats:
+        """`git diff --shortstat` for unstaged and staged changes."""
+
+        def _query() -> DiffStats:
+            unstaged = self._repo.git.diff("--shortstat").strip()
+            staged = self._repo.git.diff("--shortstat", "--cached").strip()
+            return DiffStats(unstaged=unstaged, staged=staged)
+
+        return self._cached("diff_stats", _query)
+
+    def log_page(
+        self, page: int, page_size: int = DEFAULT_LOG_PAGE_SIZE
+    ) -> list[CommitEntry]:
+        """
+        One page of `git log` for HEAD.
+
+        Pages come from one revision walk that resumes where the previous page
+        stopped, so page N does not re-walk the N-1 pages before it. The walk
+        restarts when the repository signature changes.
+        """
+        start, end = page * page_size, (page + 1) * page_size
+        with self._repo_lock:
+            with self._lock:
+                sig = self._signature
+            if sig != self._log_signature:
+                self._log_signature = sig
+                self._log_iter = None
+                self._log_entries = []
+                self._log_done = False
+            if self._log_iter is None and not self._log_done:
+                if not self._repo.head.is_valid():
+                    self._log_done = True
+                else:
+                    self._log_iter = self._repo.iter_commits("HEAD")
+            while len(self._log_entries) < end and self._log_iter is not None:
+                c = next(self._log_iter, None)
+                if c is None:
+                    self._log_iter = None
+                    self._log_done = True
+                    break
+                self._log_entries.append(
+                    CommitEntry(
+                        hexsha=c.hexsha,
+                        author=c.author.name or "",
+                        authored_date=c.authored_date,
+                        summary=str(c.summary),
+                    )
+                )
+            return self._log_entries[start:end]
+
+
+class GitPanel(Static):
+    """TUI view rendering a `GitRepoCache` without ever blocking the event loop."""
+
+    def __init__(
+        self,
+        repo_path: Path | str = ".",
+        page_size: int = DEFAULT_LOG_PAGE_SIZE,
+        watch_interval: float = WATCH_INTERVAL_SEC,
+        **kwargs,
+    ):
+        super().__init__("[bold yellow]Git Panel[/]", **kwargs)
+        self._repo_path = repo_path
+        self._page_size = page_size
+        self._watch_interval = watch_interval
+        self._cache: GitRepoCache | None = None
+        self._error: str | None = None
+        self._generation = 0
+        self._pages_loaded = 0
+        self._log_exhausted = False
+        self._log_loading: object | None = None  # Token of the running log load
+        self._branch: tuple[str, list[str]] | None = None
+        self._status: list[str] | None = None
+        self._diff: DiffStats | None = None
+        self._commits: list[CommitEntry] = []
+
+    def on_mount(self) -> None:
+        self.run_worker(self._open_repo(), group="git", exclusive=True)
+
+    async def _open_repo(self) -> None:
+        try:
+            self._cache = await asyncio.to_thread(GitRepoCache, self._repo_path)
+            logger.info(f"Git panel attached to {self._cache.working_dir}")
+        except _GIT_ERRORS as e:
+            self._error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Git panel unavailable: {self._error}")
+            self._render_panel()
+            return
+        self.set_interval(self._watch_interval, self._poll_changes)
+        self.reload()
+
+    async def _poll_changes(self) -> None:
+        if self._cache is None:
+            return
+        if await asyncio.to_thread(self._cache.check_invalidate) and self.display:
+            self.reload()
+
+    def reload(self) -> None:
+        """Re-queries everything (cheap when cached); each query runs concurrently."""
+        if self._cache is None:
+            return
+        self._generation += 1
+        gen = self._generation
+        pages = max(self._pages_loaded, 1)
+        self._pages_loaded = 0
+        self._log_exhausted = False
+        self.run_worker(self._load("branch", self._cache.branches, gen), group="git")
+        self.run_worker(self._load("status", self._cache.status, gen), group="git")
+        self.run_worker(self._load("diff", self._cache.diff_stats, gen), group="git")
+        # Exclusive: a reload cancels a log load still running for an older one
+        self.run_worker(
+            self._load_log_pages(pages, gen), group="git-log", exclusive=True
+        )
+
+    def load_more_log(self) -> None:
+        """Fetches the next page of the commit log."""
+        if self._cache is None or self._log_exhausted or self._log_loading is not None:
+            return
+        self.run_worker(
+            self._load_log_pages(1, self._generation), group="git-log", exclusive=True
+        )
+
+    async def _load(self, attr: str, query: Callable[[], Any], gen: int) -> None:
+        try:
+            result = await asyncio.to_thread(query)
+        except _GIT_ERRORS as e:
+            logger.error(f"Git {attr} query failed: {e}")
+            self._error = f"{attr}: {e}"
+            self._render_panel()
+            return
+        if gen != self._generation:
+            return  # Superseded by a newer reload
+        setattr(self, f"_{attr}", result)
+        self._render_panel()
+
+    async def _load_log_pages(self, count: int, gen: int) -> None:
+        if self._cache is None:
+            return
+        start = self._pages_loaded
+        commits: list[CommitEntry] = []
+        exhausted = False
+        token = self._log_loading = object()
+        try:
+            for page in range(start, start + count):
+                try:
+                    chunk = await asyncio.to_thread(
+                        self._cache.log_page, page, self._page_size
+                    )
+                except _GIT_ERRORS as e:
+                    logger.error(f"Git log query failed: {e}")
+                    self._error = f"log: {e}"
+                    break
+                commits.extend(chunk)
+                if len(chunk) < self._page_size:
+                    exhausted = True
+                    break
+        finally:
+            # Also runs when a newer load cancelled this one; leave its token alone
+            if self._log_loading is token:
+                self._log_loading = None
+        if gen != self._generation:
+            return
+        if start == 0:
+            self._commits = commits
+        else:
+            self._commits.extend(commits)
+        self._pages_loaded = start + count
+        self._log_exhausted = exhausted
+        self._render_panel()
+
+    def _render_panel(self) -> None:
+        lines = ["[bold yellow]Git Panel[/]"]
+        if self._cache is None:
+            lines.append(
+                f"[red]{escape(self._error)}[/]"
+                if self._error
+                else "[dim]Opening...[/]"
+            )
+            self.update("\n".join(lines))
+            return
+        lines.append(f"[dim]{escape(self._cache.working_dir)}[/]")
+        if self._branch is None:
+            lines.append("Branch: [dim]loading...[/]")
+        else:
+            active, heads = self._branch
+            lines.append(
+                f"Branch: [bold]{escape(active)}[/] [dim]({len(heads)} local)[/]"
+            )
+        if self._diff is None:
+            lines.append("Diff: [dim]loading...[/]")
+        else:
+            lines.append(f"Unstaged: {escape(self._diff.unstaged) or '[dim]none[/]'}")
+            lines.append(f"Staged:   {escape(self._diff.staged) or '[dim]none[/]'}")
+        lines.append("")
+        if self._status is None:
+            lines.append("[b]Status[/] [dim]loading...[/]")
+        else:
+            changes = [s for s in self._status if not s.startswith("##")]
+            lines.append(f"[b]Status[/] ({len(changes)} changed)")
+            lines.extend(f"  {escape(s)}" for s in changes[:50])
+            if len(changes) > 50:
+                lines.append(f"  [dim]... {len(changes) - 50} more[/]")
+        lines.append("")
+        lines.append(f"[b]Log[/] ({len(self._commits)} loaded)")
+        for c in self._commits:
+            lines.append(
+                f"  [yellow]{c.hexsha[:8]}[/] {escape(c.summary)} [dim]- {escape(c.author)}[/]"
+            )
+        if not self._log_exhausted and self._commits:
+            lines.append("  [dim]M: load more[/]")
+        if self._error:
+            lines.append(f"[red]{escape(self._error)}[/]")
+        self.update("\n".join(lines))
@@ -5,6 +5,7 @@ Corrected syntax and basic linting issues (unused imports, exceptions).
 """
 
 import logging
+import os
 import sys
 import time
 from pathlib import Path
@@ -22,12 +23,18 @@ except ImportError:
 try:
     import asyncio
 
+    from rich.markup import escape
     from rich.text import Text
     from textual.app import App, ComposeResult
-    from textual.binding import Binding
+    from textual.binding import Binding, BindingType
     from textual.containers import Container, VerticalScroll
     from textual.reactive import reactive
-    from textual.widgets import Footer, Header, Label, LoadingIndicator, Log, Static
+    from textual.widgets import Footer, Header, Label, LoadingIndicator, RichLog, Static
+
+    from ekko.core.logging_setup import configure_logging
+    from ekko.tui.git_panel import GitPanel
+    from ekko.tui.remote import RemoteFeed, RemoteState, combined_metrics
+    from ekko.tui.scribe_panel import ScribePanel
 except ImportError as e:
     logging.basicConfig(level=logging.CRITICAL)
     logging.critical(f"Textual import failed: {e}")
@@ -35,24 +42,19 @@ except ImportError as e:
     print("ERROR: Textual library not found.", file=sys.stderr)
     sys.exit(f"Dependency Error: {e}")
 
-# Logging Setup
-try:
-    LOG_FILE = Path(__file__).parent.parent.parent / "debug.log"
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    logging.basicConfig(
-        level=logging.DEBUG,
-        filename=LOG_FILE,
-        filemode="a",
-        format="%(asctime)s-%(level)s-%(name)s-%(module)s:%(lineno)d - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-except Exception as log_e:
-    logging.basicConfig(level=logging.WARNING, format="%(level)s: %(message)s")
-    logging.error(f"Failed file logging: {log_e}. Using basic console log.")
-
+# Logging is configured by main(), not on import, so importing the TUI (tests,
+# benchmarks) starts no writer thread and creates no files
 logger = logging.getLogger("TUI")
 
 
+def default_log_file() -> Path:
+    """$EKKO_TUI_LOG, else `tui.log` in the XDG state directory."""
+    if env := os.environ.get("EKKO_TUI_LOG"):
+        return Path(env).expanduser()
+    state_dir = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(state_dir) / "ekko" / "tui.log"
+
+
 class SystemMonitor(Static):
     """A widget to display updating system resource usage."""
 
@@ -70,20 +72,31 @@ class SystemMonitor(Static):
     last_net_update_time = reactive(cast(float | None, None), init=False)
     net_rate = reactive(cast(dict[str, float] | None, None), layout=True)
 
-    def __init__(self, update_interval: float = 2.0, disk_path: str = "/", **kwargs):
+    def __init__(
+        self,
+        update_interval: float = 2.0,
+        disk_path: str = "/",
+        remote: bool = False,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._update_interval = update_interval
+        self._remote = remote
         self.disk_path = disk_path
-        logger.info(f"SysMon init: Interval={update_interval}s, Disk={disk_path}")
+        logger.info(
+            f"SysMon init: Interval={update_interval}s, Disk={disk_path}, Remote={remote}"
+        )
 
     def on_mount(self) -> None:
         logger.info("SysMon mounted.")
+        if self._remote:
+            return  # Metrics are pushed by the remote feed via apply_metrics()
         try:
             self._net_counters_prev = psutil.net_io_counters(pernic=False)._asdict()
             self.last_net_update_time = time.monotonic()
         except psutil.Error as e:
             logger.warning(f"Could not get initial net counters: {e}")
-        except Exception as e:
+        except (OSError, RuntimeError) as e:
             logger.warning(f"Unexpected error getting initial net counters: {e}")
         self.update_stats()
         self.set_interval(self._update_interval, self.update_stats)
@@ -103,7 +116,7 @@ class SystemMonitor(Static):
             except FileNotFoundError:
                 logger.error(f"Disk path not found: {self.disk_path}")
                 self.disk_percent = -1.0
-            except Exception as disk_e:
+            except OSError as disk_e:
                 logger.error(f"Disk {self.disk_path} error: {disk_e}")
                 self.disk_percent = -1.0
             net_now_dict = psutil.net_io_counters(pernic=False)._asdict()
@@ -129,12 +142,28 @@ class SystemMonitor(Static):
                 self.net_rate = {"sent_kbps": 0.0, "recv_kbps": 0.0}
             self.net_counters_prev = net_now
             self.last_net_update_time = current_time
-            logger.debug(f"Stats: CPU={self.cpu_usage:.1f} Mem={self.mem_percent:.1f}")
+            # Lazy %-formatting: skipped entirely when DEBUG is off
+            logger.debug("Stats: CPU=%.1f Mem=%.1f", self.cpu_usage, self.mem_percent)
         except psutil.Error as e:
             logger.error(f"psutil error: {e}")
         except Exception as e:
             logger.error(f"Stat update error: {e}", exc_info=True)
 
+    def apply_metrics(self, metrics: dict[str, float | str]) -> None:
+        """Applies a host-metrics delta pushed by a remote Ekko API."""
+        self.cpu_usage = float(metrics.get("cpu_percent", 0.0))
+        self.mem_total_gb = float(metrics.get("mem_total_gb", 0.0))
+        self.mem_available_gb = float(metrics.get("mem_available_gb", 0.0))
+        self.mem_percent = float(metrics.get("mem_percent", 0.0))
+        self.disk_path = str(metrics.get("disk_path", self.disk_path))
+        self.disk_total_gb = float(metrics.get("disk_total_gb", 0.0))
+        self.disk_used_gb = float(metrics.get("disk_used_gb", 0.0))
+        self.disk_percent = float(metrics.get("disk_percent", -1.0))
+        self.net_rate = {
+            "sent_kbps": float(metrics.get("sent_kbps", 0.0)),
+            "recv_kbps": float(metrics.get("recv_kbps", 0.0)),
+        }
+
     def _get_style(self, p: float) -> str:
         return (
             "bold red"
@@ -164,7 +193,7 @@ class SystemMonitor(Static):
             (" | MEM:", mem_style),
             (f"{self.mem_percent:>5.1f}%", "default"),
             (" | DISK:", disk_style),
-            (f"{self.disk_str}", "default"),
+            (disk_str, "default"),
         )
         line2 = Text.assemble((net_str, "default"))
         return line1 + "\n" + line2
@@ -183,24 +212,18 @@ class EkkoTUI(App[None]):
         grid-rows: auto 1fr auto;
     }
     Header {
-        grid-column: 1 / 3;
-        grid-row: 1;
+        column-span: 2;
     }
     Footer {
-        grid-column: 1 / 3;
-        grid-row: 3;
+        column-span: 2;
     }
     #sidebar {
-        grid-column: 1;
-        grid-row: 2;
         width: 30;
         border-right: thick $accent;
         padding: 1;
         overflow-y: auto;
     }
     #main-area {
-        grid-column: 2;
-        grid-row: 2;
         padding: 0 1;
         layout: vertical;
     }
@@ -239,7 +262,7 @@ class EkkoTUI(App[None]):
         display: block;
     }
     """
-    BINDINGS = [
+    BINDINGS: ClassVar[list[BindingType]] = [
         Binding("d", "toggle_dark", "Dark Mode"),
         Binding("q", "request_quit", "Quit"),
         Binding("ctrl+l", "clear_log", "Clear Log"),
@@ -248,9 +271,25 @@ class EkkoTUI(App[None]):
         Binding("2", "show_view('git-view')", "Git"),
         Binding("3", "show_view('scribe-view')", "Scribe"),
         Binding("4", "show_view('ansible-view')", "Ansible"),
+        Binding("m", "git_log_more", "More Log", show=False),
+        Binding("g", "scribe_generate", "Generate Docs", show=False),
     ]
     show_log_pane = reactive(True)
 
+    def __init__(
+        self,
+        remote_urls: list[str] | None = None,
+        log_file: Path | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._log_file = log_file
+        self._remote_feeds = [
+            RemoteFeed(u, self._on_remote_frame) for u in remote_urls or []
+        ]
+        if self._remote_feeds:
+            self.sub_title = f"Remote: {len(self._remote_feeds)} server(s)"
+
     def compose(self) -> ComposeResult:
         logger.info("Composing Ekko TUI...")
         yield Header()
@@ -263,33 +302,77 @@ class EkkoTUI(App[None]):
             yield Static("---")
             yield Static("[i]Keys:[/i] L:Log D:Dark Q:Quit")
         with Container(id="main-area"):
-            yield SystemMonitor(id="system-monitor")
+            yield SystemMonitor(id="system-monitor", remote=bool(self._remote_feeds))
             with VerticalScroll(id="main-content-scroll"):
                 yield Static(
                     "Welcome! System monitoring active.",
                     id="status-view",
                     classes="view visible",
                 )
-                yield Static("[bold yellow]Git Panel[/]", id="git-view", classes="view")
-                yield Static(
-                    "[bold cyan]Scribe Panel[/]", id="scribe-view", classes="view"
-                )
+                yield GitPanel(id="git-view", classes="view")
+                yield ScribePanel(id="scribe-view", classes="view")
                 yield Static(
                     "[bold magenta]Ansible Panel[/]", id="ansible-view", classes="view"
                 )
             yield LoadingIndicator(id="loading")
-            yield Log(id="log-pane", auto_scroll=True, max_lines=1000, markup=True)
+            yield RichLog(id="log-pane", auto_scroll=True, max_lines=1000, markup=True)
         yield Footer()
 
     def on_mount(self) -> None:
-        log = self.query_one(Log)
-        log.write_line("[b green]Ekko TUI Init.[/]")
-        log.write_line(f"[dim]Log: {LOG_FILE}[/]")
+        log = self.query_one(RichLog)
+        log.write("[b green]Ekko TUI Init.[/]")
+        if self._log_file is not None:
+            log.write(f"[dim]Log: {self._log_file}[/]")
+        for feed in self._remote_feeds:
+            log.write(f"[dim]Remote: {feed.state.url}[/]")
+            self.run_worker(feed.run(), group="remote")
         logger.info("Ekko TUI Mounted.")
 
+    def _on_remote_frame(self, state: RemoteState, frame: dict) -> None:
+        """Applies one pushed frame; runs on the app's event loop."""
+        log = self.query_one(RichLog)
+        if frame.get("type") == "disconnected":
+            log.write(f"[red]Remote {state.url} disconnected.[/]")
+        for rec in frame.get("logs", []):
+            log.write(
+                f"[dim]{escape(state.host)}[/] {escape(str(rec.get('level', 'info')))}: "
+                f"{escape(str(rec.get('message', '')))}"
+            )
+        if frame.get("dropped_logs"):
+            log.write(
+                f"[yellow]{escape(state.host)}: {frame['dropped_logs']} log lines dropped[/]"
+            )
+        if frame.get("updates") or frame.get("type") == "disconnected":
+            metrics = combined_metrics([feed.state for feed in self._remote_feeds])
+            if metrics:
+                self.query_one(SystemMonitor).apply_metrics(metrics)
+        self._render_remote_status()
+
+    def _render_remote_status(self) -> None:
+        lines = ["[b]Remote servers[/b]"]
+        for feed in self._remote_feeds:
+            st = feed.state
+            mark = "[green]●[/]" if st.connected else "[red]●[/]"
+            m = st.channels.get("metrics", {}).get("host")
+            usage = (
+                f"CPU {m['cpu_percent']:5.1f}% MEM {m['mem_percent']:5.1f}% DISK {m['disk_percent']:5.1f}%"
+                if m
+                else "[dim]no metrics[/]"
+            )
+            lines.append(
+                f"{mark} [b]{escape(st.host)}[/] {usage} [dim]{escape(st.url)}[/]"
+            )
+            for channel in ("jobs", "deploy"):
+                for key, data in st.channels.get(channel, {}).items():
+                    status = data.get("state", data.get("status", "?"))
+                    if "ok" in data:
+                        status = f"{status} ({'ok' if data['ok'] else 'failed'})"
+                    lines.append(f"    {channel}/{escape(key)}: {escape(str(status))}")
+        self.query_one("#status-view", Static).update("\n".join(lines))
+
     def watch_show_log_pane(self, show: bool) -> None:
         self.set_class(show, "show-log")
-        self.query_one(Log).display = show
+        self.query_one(RichLog).display = show
         logger.debug(f"Log display: {show}")
 
     def action_toggle_dark(self) -> None:
@@ -301,9 +384,9 @@ class EkkoTUI(App[None]):
         self.exit("User quit.")
 
     def action_clear_log(self) -> None:
-        self.query_one(Log).clear()
+        self.query_one(RichLog).clear()
         logger.info("Log cleared.")
-        self.query_one(Log).write_line("[dim]Log Cleared.[/]")
+        self.query_one(RichLog).write("[dim]Log Cleared.[/]")
 
     def action_toggle_log(self) -> None:
         self.show_log_pane = not self.show_log_pane
@@ -313,18 +396,36 @@ class EkkoTUI(App[None]):
         logger.info(f"Switching view: {view_id}")
         for v in self.query(".view"):
             v.display = v.id == view_id
-        self.query_one(Log).write_line(f"View: [bold]{view_id}[/]")
+        self.query_one(RichLog).write(f"View: [bold]{view_id}[/]")
+        if view_id == "git-view":
+            # Cached queries make this cheap; slow ones finish in worker threads
+            self.query_one(GitPanel).reload()
+            return
+        if view_id == "scribe-view":
+            self.query_one(ScribePanel).reload()
+            return
         self.run_worker(self._simulate_action(f"Loading {view_id}..."), exclusive=True)
 
+    def action_git_log_more(self) -> None:
+        git_panel = self.query_one(GitPanel)
+        if git_panel.display:
+            git_panel.load_more_log()
+
+    def action_scribe_generate(self) -> None:
+        scribe_panel = self.query_one(ScribePanel)
+        if scribe_panel.display:
+            self.query_one(RichLog).write("[yellow]Scribe: generating docs...[/]")
+            scribe_panel.generate()
+
     async def _simulate_action(self, msg: str):
         loader = self.query_one(LoadingIndicator)
-        log = self.query_one(Log)
+        log = self.query_one(RichLog)
         loader.display = True
-        log.write_line(f"[yellow]{msg}[/]")
+        log.write(f"[yellow]{msg}[/]")
         logger.info(f"Simulate: {msg}")
         try:
             await asyncio.sleep(0.5)
-            log.write_line(f"[green]OK: {msg}[/]")
+            log.write(f"[green]OK: {msg}[/]")
             logger.info("Simulate done.")
         except asyncio.CancelledError:
             # Handle asyncio-specific cancellation
@@ -337,14 +438,40 @@ class EkkoTUI(App[None]):
             logging.error(f"Key error occurred: {e}")
             # Handle specific KeyError exceptions
         except Exception as e:
-            logger.error(f"Error during simulate action '{msg}': {e}")
-            log.write_line(f"[bold red]Error simulating action: {e}[/]")
+            logger.error(f"Error during simulate action '{msg}': {e}", exc_info=True)
+            log.write(f"[bold red]Error simulating action: {e}[/]")
         finally:
             loader.display = False
 
 
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> int:
+    """TUI entry point: parses arguments, configures logging, runs the app."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ekko TUI")
+    parser.add_argument(
+        "--remote",
+        action="append",
+        default=[],
+        metavar="URL",
+        help="Attach to an Ekko API (host:port or ws://host:port); repeatable.",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=Path,
+        default=None,
+        help="JSON log file (default: $EKKO_TUI_LOG or ~/.local/state/ekko/tui.log).",
+    )
+    cli_args = parser.parse_args(argv)
+    # JSON lines written by a background thread, never on the UI loop
+    log_file = cli_args.log_file or default_log_file()
+    configure_logging(os.environ.get("EKKO_LOG_LEVEL", "INFO"), log_file=log_file)
     logger.info("--- Starting Ekko TUI Application ---")
-    app = EkkoTUI()
+    app = EkkoTUI(remote_urls=cli_args.remote, log_file=log_file)
     app.run()
     logger.info("--- Ekko TUI Application Exited ---")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Ekko TUI - Remote Feed
+Client side of the API event stream (`/ws/events`), one websocket per server.
+
+The feed keeps a mirror of each server's keyed state (jobs, deploy, metrics)
+and hands every received frame to a callback; it never polls.
+`combined_metrics()` folds the host metrics of several servers into one view.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("TUI.remote")
+
+RECONNECT_MIN_SEC = 1.0
+RECONNECT_MAX_SEC = 30.0
+
+
+def normalize_remote_url(url: str) -> str:
+    """Accepts `host:port`, `http(s)://...` or `ws(s)://...` and returns a ws URL."""
+    if url.startswith(("ws://", "wss://")):
+        base = url
+    elif url.startswith("http://"):
+        base = "ws://" + url[len("http://") :]
+    elif url.startswith("https://"):
+        base = "wss://" + url[len("https://") :]
+    else:
+        base = "ws://" + url
+    base = base.rstrip("/")
+    return base if base.endswith("/ws/events") else base + "/ws/events"
+
+
+@dataclass
+class RemoteState:
+    """Mirror of one server's keyed stream state."""
+
+    url: str
+    host: str = "?"
+    connected: bool = False
+    last_seq: int = 0
+    dropped_logs: int = 0
+    channels: dict[str, dict[str, dict[str, Any]]] = field(default_factory=dict)
+
+    def apply_updates(self, updates: list[dict[str, Any]]) -> None:
+        for u in updates:
+            entries = self.channels.setdefault(u["channel"], {})
+            if u["data"] is None:
+                entries.pop(u["key"], None)
+            else:
+                entries[u["key"]] = u["data"]
+
+
+def combined_metrics(states: list[RemoteState]) -> dict[str, float | str] | None:
+    """
+    Host metrics summed across connected servers: CPU is averaged, memory,
+    disk and network are totalled, and percentages are recomputed from the
+    totals. None when no connected server has reported metrics yet.
+    """
+    hosts = [
+        m
+        for st in states
+        if st.connected and (m := st.channels.get("metrics", {}).get("host"))
+    ]
+    if not hosts:
+        return None
+    if len(hosts) == 1:
+        return hosts[0]
+
+    def total(key: str) -> float:
+        return sum(float(m.get(key, 0.0)) for m in hosts)
+
+    mem_total, mem_available = total("mem_total_gb"), total("mem_available_gb")
+    disk_total, disk_used = total("disk_total_gb"), total("disk_used_gb")
+    return {
+        "cpu_percent": total("cpu_percent") / len(hosts),
+        "mem_total_gb": mem_total,
+        "mem_available_gb": mem_available,
+        "mem_percent": 100.0 * (1 - mem_available / mem_total) if mem_total else 0.0,
+        "disk_path": f"{len(hosts)} hosts",
+        "disk_total_gb": disk_total,
+        "disk_used_gb": disk_used,
+        "disk_percent": 100.0 * disk_used / disk_total if disk_total else -1.0,
+        "sent_kbps": total("sent_kbps"),
+        "recv_kbps": total("recv_kbps"),
+    }
+
+
+class RemoteFeed:
+    """Maintains a reconnecting websocket to one Ekko API instance."""
+
+    def __init__(
+        self,
+        url: str,
+        on_frame: Callable[["RemoteState", dict[str, Any]], None],
+    ):
+        self.state = RemoteState(url=normalize_remote_url(url))
+        self._on_frame = on_frame
+
+    async def run(self) -> None:
+        """Connects and consumes frames forever, backing off between attempts."""
+        try:
+            import websockets
+        except ImportError:
+            logger.error("websockets library not found; remote mode unavailable.")
+            raise
+        delay = RECONNECT_MIN_SEC
+        while True:
+            try:
+                async with websockets.connect(self.state.url, max_queue=16) as ws:
+                    self.state.connected = True
+                    delay = RECONNECT_MIN_SEC
+                    logger.info(f"Remote feed connected: {self.state.url}")
+                    async for raw in ws:
+                        self._handle(json.loads(raw))
+            except (OSError, ValueError, websockets.exceptions.WebSocketException) as e:
+                logger.warning(f"Remote feed {self.state.url} error: {e}")
+            self.state.connected = False
+            self._notify({"type": "disconnected"})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SEC)
+
+    def _handle(self, frame: dict[str, Any]) -> None:
+        if frame.get("type") == "snapshot":
+            self.state.host = frame.get("host", self.state.host)
+            self.state.channels.clear()
+        else:
+            self.state.last_seq = frame.get("seq", self.state.last_seq)
+            self.state.dropped_logs += frame.get("dropped_logs", 0)
+        self.state.apply_updates(frame.get("updates", []))
+        self._notify(frame)
+
+    def _notify(self, frame: dict[str, Any]) -> None:
+        try:
+            self._on_frame(self.state, frame)
+        except Exception:  # A bad frame must not end the feed (or the TUI worker)
+            logger.exception(f"Remote feed {self.state.url}: frame handler failed")
@@ -0,0 +1,112 @@
+"""
+Ekko TUI - Scribe Panel
+Shows which modules the incremental docs pipeline would regenerate and runs it.
+
+Planning (a `stat` per module when the manifest is warm) and generation both
+run in worker threads; the panel only renders their results.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+
+from rich.markup import escape
+from textual.widgets import Static
+
+from ekko.core import scribe
+
+logger = logging.getLogger("TUI.scribe")
+
+MAX_LISTED_MODULES = 30
+# Generator failures are reported per module by scribe.run; these are the rest
+_SCRIBE_ERRORS = (OSError, ValueError, RuntimeError)
+
+
+class ScribePanel(Static):
+    """TUI view over `ekko.core.scribe` for one project root."""
+
+    def __init__(self, project_root: Path | str = ".", workers: int = 8, **kwargs):
+        super().__init__("[bold cyan]Scribe Panel[/]", **kwargs)
+        self._root = Path(project_root)
+        self._workers = workers
+        self._plan: scribe.ScribePlan | None = None
+        self._result: scribe.ScribeResult | None = None
+        self._error: str | None = None
+        self._generating = False
+
+    def reload(self) -> None:
+        """Recomputes the plan in a worker thread."""
+        if not self._generating:
+            self.run_worker(self._load_plan(), group="scribe", exclusive=True)
+
+    def generate(self) -> None:
+        """Runs the pipeline for everything in the current plan."""
+        if self._generating:
+            return
+        self._generating = True
+        self._render_panel()
+        self.run_worker(self._generate(), group="scribe", exclusive=True)
+
+    async def _load_plan(self) -> None:
+        try:
+            self._plan = await asyncio.to_thread(scribe.plan, self._root)
+            self._error = None
+        except _SCRIBE_ERRORS as e:
+            logger.error(f"Scribe plan failed: {e}")
+            self._error = str(e)
+        self._render_panel()
+
+    async def _generate(self) -> None:
+        try:
+            from ekko.config import get_ekko_settings
+
+            settings = get_ekko_settings()
+            if settings is None:  # Load errors are logged by get_ekko_settings
+                self._error = "Ekko settings failed to load; see the log for details."
+                return
+            generator = scribe.select_generator(settings.scribe_agent_path)
+            self._result = await asyncio.to_thread(
+                scribe.run, self._root, generator, workers=self._workers
+            )
+            self._plan = await asyncio.to_thread(scribe.plan, self._root)
+            self._error = None
+        except _SCRIBE_ERRORS as e:
+            logger.error(f"Scribe run failed: {e}")
+            self._error = str(e)
+        finally:
+            self._generating = False
+            self._render_panel()
+
+    def _render_panel(self) -> None:
+        lines = [
+            f"[bold cyan]Scribe Panel[/] [dim]{escape(str(self._root.resolve()))}[/]"
+        ]
+        if self._error:
+            lines.append(f"[red]{escape(self._error)}[/]")
+        if self._generating:
+            lines.append("[yellow]Generating docs...[/]")
+        p = self._plan
+        if p is None:
+            lines.append("[dim]Planning...[/]")
+        else:
+            lines.append(
+                f"Modules: {len(p.modules)}  changed: [yellow]{len(p.changed)}[/]  "
+                f"dependents: [yellow]{len(p.dependents)}[/]  removed: {len(p.removed)}"
+            )
+            todo = sorted(p.to_generate)
+            if not todo:
+                lines.append("[green]Docs are up to date.[/]")
+            for name in todo[:MAX_LISTED_MODULES]:
+                tag = "" if name in p.changed else " [dim](dependency API changed)[/]"
+                lines.append(f"  {escape(name)}{tag}")
+            if len(todo) > MAX_LISTED_MODULES:
+                lines.append(f"  [dim]... {len(todo) - MAX_LISTED_MODULES} more[/]")
+        r = self._result
+        if r is not None:
+            lines.append(
+                f"Last run: generated {len(r.generated)}, unchanged {len(r.unchanged_output)}, "
+                f"failed [red]{len(r.failed)}[/]"
+            )
+        if not self._generating:
+            lines.append("[dim]Press g to generate.[/]")
+        self.update("\n".join(lines))
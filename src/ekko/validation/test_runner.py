@@ -0,0 +1,406 @@
+"""
+Project Ekko - Sharded Parallel Test Runner
+Runs a project's pytest suite as N concurrent pytest processes.
+
+Test files are assigned to shards by longest-processing-time-first using
+durations recorded by earlier runs (`.ekko/test_durations.json`), so shards
+finish at about the same time. Files holding tests that failed last time run
+first in their shard. Each shard writes its own JUnit XML and coverage data
+file; the runner merges both and checks the coverage floor from the quality
+profile (`test_coverage` in `.ekko/core_team/stark.yaml`).
+
+The JUnit reports are parsed with the stdlib XML parser: they are written by
+the runner's own pytest shards under `.ekko/`, not taken from outside input.
+"""
+
+import configparser
+import heapq
+import importlib.util
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from xml.etree import ElementTree
+
+import yaml
+
+from ekko.core.timing import span
+from ekko.validation.scanner import QUALITY_PROFILE, walk_project
+
+logger = logging.getLogger(__name__)
+
+DURATIONS_FILE = Path(".ekko") / "test_durations.json"
+RESULTS_DIR = Path(".ekko") / "test-results"
+COVERAGE_DIR = Path(".ekko") / "coverage"
+DEFAULT_TEST_DIR = "tests"
+DEFAULT_FILE_SECONDS = 1.0  # Weight of a test file with no recorded history
+PYTEST_NO_TESTS = 5
+
+
+@dataclass
+class TestHistory:
+    """Per-test durations and the tests that failed in the last run."""
+
+    durations: dict[str, float] = field(default_factory=dict)
+    failed: set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, root: Path) -> "TestHistory":
+        try:
+            data = json.loads((root / DURATIONS_FILE).read_text())
+        except (OSError, ValueError):
+            return cls()
+        return cls(
+            durations=dict(data.get("durations", {})),
+            failed=set(data.get("failed", [])),
+        )
+
+    def save(self, root: Path) -> None:
+        path = root / DURATIONS_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "durations": dict(sorted(self.durations.items())),
+                    "failed": sorted(self.failed),
+                },
+                indent=1,
+            )
+        )
+        tmp.replace(path)
+
+    def file_weights(self) -> dict[str, float]:
+        weights: dict[str, float] = {}
+        for test_id, seconds in self.durations.items():
+            path = test_id.split("::", 1)[0]
+            weights[path] = weights.get(path, 0.0) + seconds
+        return weights
+
+    def failed_files(self) -> set[str]:
+        return {test_id.split("::", 1)[0] for test_id in self.failed}
+
+
+@dataclass
+class Shard:
+    index: int
+    files: list[str] = field(default_factory=list)
+    expected_seconds: float = 0.0
+
+
+@dataclass
+class ShardResult:
+    shard: Shard
+    returncode: int
+    elapsed: float
+    tests: int = 0
+    failures: int = 0
+    errors: int = 0
+    skipped: int = 0
+    log_path: Path | None = None
+
+
+@dataclass
+class TestRunResult:
+    shards: list[ShardResult]
+    elapsed: float
+    coverage_percent: float | None = None
+    coverage_floor: float | None = None
+    coverage_error: str | None = None
+
+    @property
+    def tests(self) -> int:
+        return sum(s.tests for s in self.shards)
+
+    @property
+    def failures(self) -> int:
+        return sum(s.failures + s.errors for s in self.shards)
+
+    @property
+    def ok(self) -> bool:
+        if any(s.returncode not in (0, PYTEST_NO_TESTS) for s in self.shards):
+            return False
+        if self.coverage_error is not None:
+            return False
+        if self.coverage_floor is not None and self.coverage_percent is not None:
+            return self.coverage_percent >= self.coverage_floor
+        return True
+
+
+def discover_test_files(root: Path, test_dir: str = DEFAULT_TEST_DIR) -> list[str]:
+    """Test files (`test_*.py` / `*_test.py`) under `root/test_dir`, relative to `root`."""
+    base = root / test_dir
+    if not base.is_dir():
+        return []
+    return sorted(
+        p.relative_to(root).as_posix()
+        for p in walk_project(base, suffixes=frozenset({".py"}))
+        if p.name.startswith("test_") or p.name.endswith("_test.py")
+    )
+
+
+def plan_shards(
+    files: list[str], history: TestHistory, shard_count: int
+) -> list[Shard]:
+    """
+    Longest-processing-time-first assignment of files to shards.
+
+    Unknown files weigh the median of known ones (or DEFAULT_FILE_SECONDS).
+    Within a shard, files with previous failures run first, then heaviest first.
+    """
+    weights = history.file_weights()
+    wanted = set(files)
+    known = sorted(w for f, w in weights.items() if f in wanted)
+    default = known[len(known) // 2] if known else DEFAULT_FILE_SECONDS
+    cost = {f: weights.get(f, default) for f in files}
+    shards = [Shard(i) for i in range(max(1, min(shard_count, len(files))))]
+    heap = [(0.0, s.index) for s in shards]
+    for f in sorted(files, key=lambda f: (-cost[f], f)):
+        load, idx = heapq.heappop(heap)
+        shards[idx].files.append(f)
+        shards[idx].expected_seconds = load + cost[f]
+        heapq.heappush(heap, (shards[idx].expected_seconds, idx))
+    failed = history.failed_files()
+    for s in shards:
+        s.files.sort(key=lambda f: (f not in failed, -cost[f], f))
+    return [s for s in shards if s.files]
+
+
+def coverage_floor(root: Path) -> float | None:
+    """
+    `code_quality.test_coverage` from the quality profile, e.g. '95%+' -> 95.0.
+
+    Falls back to `[report] fail_under` in `.coveragerc`; the merged report
+    runs with `--fail-under=0`, so that setting is enforced here instead.
+    """
+    try:
+        data = (
+            yaml.safe_load((root / QUALITY_PROFILE).read_text(encoding="utf-8")) or {}
+        )
+    except (OSError, yaml.YAMLError):
+        data = {}
+    raw = (data.get("code_quality") or {}).get("test_coverage")
+    m = re.search(r"\d+(?:\.\d+)?", str(raw)) if raw is not None else None
+    if m:
+        return float(m.group())
+    rc = configparser.ConfigParser()
+    try:
+        rc.read(root / ".coveragerc", encoding="utf-8")
+        return rc.getfloat("report", "fail_under", fallback=None)
+    except (configparser.Error, ValueError):
+        return None
+
+
+def junit_test_id(case: ElementTree.Element) -> str:
+    """
+    pytest node id of an xunit1 `<testcase>`, e.g. `tests/test_a.py::TestX::test_y`.
+
+    xunit1 records the file and the dotted `module[.Class...]` classname;
+    whatever the classname adds beyond the file's module path is the class.
+    """
+    classname = case.get("classname", "")
+    file = case.get("file") or classname.replace(".", "/") + ".py"
+    module = file.removesuffix(".py").replace("/", ".")
+    classes = classname[len(module) + 1 :] if classname.startswith(module + ".") else ""
+    return "::".join([file, *filter(None, classes.split(".")), case.get("name", "")])
+
+
+def _parse_junit(
+    path: Path, history: TestHistory, failed: set[str]
+) -> tuple[int, int, int, int]:
+    """
+    Records durations from one shard's xunit1 report in `history` and adds
+    the ids of failed or errored tests to `failed`.
+
+    Returns (tests, failures, errors, skipped).
+    """
+    try:
+        tree = ElementTree.parse(path)  # noqa: S314 - written by our own pytest shard
+    except (OSError, ElementTree.ParseError) as e:
+        logger.warning(f"Cannot read JUnit report {path}: {e}")
+        return 0, 0, 0, 0
+    tests = failures = errors = skipped = 0
+    for case in tree.iter("testcase"):
+        tests += 1
+        test_id = junit_test_id(case)
+        history.durations[test_id] = float(case.get("time") or 0.0)
+        if case.find("failure") is not None:
+            failures += 1
+            failed.add(test_id)
+        elif case.find("error") is not None:
+            errors += 1
+            failed.add(test_id)
+        elif case.find("skipped") is not None:
+            skipped += 1
+    return tests, failures, errors, skipped
+
+
+def _merge_junit(reports: list[Path], out: Path) -> None:
+    merged = ElementTree.Element("testsuites")
+    for report in reports:
+        try:
+            root = ElementTree.parse(report).getroot()  # noqa: S314 - our own shard reports
+        except (OSError, ElementTree.ParseError):
+            continue
+        suites = [root] if root.tag == "testsuite" else list(root.iter("testsuite"))
+        merged.extend(suites)
+    ElementTree.ElementTree(merged).write(out, encoding="utf-8", xml_declaration=True)
+
+
+def has_coverage(python: str) -> bool:
+    if python == sys.executable:
+        return importlib.util.find_spec("coverage") is not None
+    cmd = [python, "-c", "import coverage"]
+    probe = subprocess.run(cmd, capture_output=True, check=False)  # noqa: S603 - caller's python
+    return probe.returncode == 0
+
+
+def run_tests(
+    root: Path,
+    shards: int | None = None,
+    test_dir: str = DEFAULT_TEST_DIR,
+    pytest_args: list[str] | None = None,
+    coverage: bool = True,
+    cov_source: str | None = None,
+    python: str = sys.executable,
+    fail_under: float | None = None,
+) -> TestRunResult:
+    """Runs the suite sharded across processes and records the new history."""
+    root = Path(root).resolve()
+    history = TestHistory.load(root)
+    files = discover_test_files(root, test_dir)
+    plan = plan_shards(files, history, shards or os.cpu_count() or 1)
+    results_dir = root / RESULTS_DIR
+    cov_dir = root / COVERAGE_DIR
+    results_dir.mkdir(parents=True, exist_ok=True)
+    for stale in [*results_dir.glob("shard-*"), *cov_dir.glob(".coverage.shard-*")]:
+        stale.unlink()
+    if coverage and not has_coverage(python):
+        logger.warning(
+            "coverage is not installed for the test interpreter; running without it"
+        )
+        coverage = False
+    if coverage:
+        cov_dir.mkdir(parents=True, exist_ok=True)
+        cov_source = cov_source or ("src" if (root / "src").is_dir() else ".")
+    logger.info(f"Test run: {len(files)} file(s) in {len(plan)} shard(s)")
+
+    def run_shard(shard: Shard) -> ShardResult:
+        junit = results_dir / f"shard-{shard.index}.xml"
+        log_path = results_dir / f"shard-{shard.index}.log"
+        cmd = [python, "-m"]
+        if coverage:
+            cmd += ["coverage", "run", f"--source={cov_source}", "-m"]
+        cmd += [
+            "pytest",
+            *shard.files,
+            f"--junitxml={junit}",
+            "-o",
+            "junit_family=xunit1",
+            "-p",
+            "no:cacheprovider",  # Shards must not race on .pytest_cache
+            "-q",
+            *(pytest_args or []),
+        ]
+        env = {
+            **os.environ,
+            "COVERAGE_FILE": str(cov_dir / f".coverage.shard-{shard.index}"),
+            "EKKO_TEST_SHARD": str(shard.index),
+        }
+        start = time.perf_counter()
+        with log_path.open("w", encoding="utf-8") as log:
+            proc = subprocess.run(
+                cmd,  # noqa: S603 - fixed argv, no shell
+                cwd=root,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                check=False,
+            )
+        return ShardResult(
+            shard, proc.returncode, time.perf_counter() - start, log_path=log_path
+        )
+
+    start = time.perf_counter()
+    with span("test shards"), ThreadPoolExecutor(max_workers=max(1, len(plan))) as pool:
+        shard_results = list(pool.map(run_shard, plan))
+    failed: set[str] = set()
+    for r in shard_results:
+        r.tests, r.failures, r.errors, r.skipped = _parse_junit(
+            results_dir / f"shard-{r.shard.index}.xml", history, failed
+        )
+    # Only this run's failures go first next time; deselected or deleted tests
+    # must not keep their files at the front forever
+    history.failed = failed
+    # Forget tests whose files are gone so their weight does not linger
+    present = set(files)
+    history.durations = {
+        t: d for t, d in history.durations.items() if t.split("::", 1)[0] in present
+    }
+    history.save(root)
+    _merge_junit(
+        [results_dir / f"shard-{r.shard.index}.xml" for r in shard_results],
+        results_dir / "junit.xml",
+    )
+
+    run = TestRunResult(shard_results, time.perf_counter() - start)
+    if coverage and shard_results:
+        try:
+            with span("coverage combine"):
+                run.coverage_percent = _combine_coverage(root, python, cov_dir)
+        except RuntimeError as e:
+            logger.error(str(e))
+            run.coverage_error = str(e)
+        run.coverage_floor = (
+            fail_under if fail_under is not None else coverage_floor(root)
+        )
+    return run
+
+
+def _coverage(root: Path, python: str, *args: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "COVERAGE_FILE": str(root / ".coverage")}
+    cmd = [python, "-m", "coverage", *args]
+    return subprocess.run(
+        cmd,  # noqa: S603 - fixed argv, no shell
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def _combine_coverage(root: Path, python: str, cov_dir: Path) -> float | None:
+    """
+    Merges shard data into `<root>/.coverage` and returns the total percentage.
+
+    Raises RuntimeError if the merge or the report fails; a stale `.coverage`
+    must not stand in for this run's numbers.
+    """
+    data_files = [str(p) for p in sorted(cov_dir.glob(".coverage.shard-*"))]
+    if not data_files:
+        return None
+    combine = _coverage(root, python, "combine", *data_files)
+    if combine.returncode != 0:
+        raise RuntimeError(
+            f"coverage combine exited {combine.returncode}: "
+            f"{(combine.stderr or combine.stdout).strip()[:300]}"
+        )
+    # A fail_under in the project's coverage config would make a successful
+    # report exit 2; the floor is applied by TestRunResult.ok instead
+    report = _coverage(root, python, "report", "--format=total", "--fail-under=0")
+    try:
+        total = float(report.stdout.strip()) if report.returncode == 0 else None
+    except ValueError:
+        total = None
+    if total is None:
+        raise RuntimeError(
+            f"coverage report exited {report.returncode}: {report.stderr.strip()[:300]}"
+        )
+    return total
@@ -1,15 +1,46 @@
 #!/usr/bin/env python3
-# File: tests/chaos/injector.py
+# File: test/chaos/injector.py
 """
-Project Ekko - Chaos Injection Tool (Placeholder v1.2)
-Placeholder for future chaos engineering tests. Corrected syntax.
+Project Ekko - Chaos Experiment Runner v1.3
+Runs declarative chaos experiments from `.ekko/chaos_profiles/<name>.yaml`.
+
+Run from the repository root as a module, so both `test` and `tests` import:
+
+    python -m test.chaos.injector --profile=extreme --duration=90s
+
+Each experiment puts a fault-injecting proxy (tests/chaos/injector.py) in
+front of a target, measures a steady-state probe before and during the fault,
+and records latency/error impact in a local SQLite results store. Experiments
+in a profile run concurrently; seeded RNGs make game days repeatable.
+
+All baselines are measured first, before any proxy injects faults, so one
+experiment's fault phase cannot skew another's steady state. An experiment
+that fails (bad parameters, proxy bind error, ...) is reported and the rest
+of the profile keeps running.
 """
 
 import argparse
+import asyncio
 import logging
-import secrets  # Use `secrets` for cryptographic purposes instead of `random`
+import random
+import sqlite3
 import sys
 import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import yaml
+
+from ekko.core.bench import LatencyHistogram
+from tests.chaos.injector import (
+    ChaosProxy,
+    FaultProfile,
+    parse_host_port,
+    simulate_network_latency,
+    simulate_pod_failure,
+)
 
 # Basic logger setup
 logging.basicConfig(
@@ -17,87 +48,455 @@ logging.basicConfig(
     format="%(asctime)s - ChaosInjector - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)  # One line per probe is noise
 
+PROFILES_DIR = Path(".ekko") / "chaos_profiles"
+RESULTS_DB = Path(".ekko") / "chaos_results.db"
 
-def simulate_network_latency(target: str, duration_sec: int, max_latency_ms: int):
-    """Simulates adding network latency."""
-    logger.info(
-        f"Simulating network latency up to {max_latency_ms}ms for {target} for {duration_sec}s... [Placeholder]"
-    )
-    # TODO: Implement actual latency injection using tools like 'tc' or library wrappers
-    time.sleep(duration_sec)
-    logger.info("Simulated latency finished.")
+# Failures that end one experiment without aborting the profile
+EXPERIMENT_ERRORS = (OSError, ValueError, TypeError, httpx.HTTPError)
 
+__all__ = [
+    "ChaosGod",
+    "ExperimentSpec",
+    "ProfileOutcome",
+    "ResultsStore",
+    "simulate_network_latency",
+    "simulate_pod_failure",
+]
 
-def simulate_pod_failure(namespace: str, pod_selector: str):
-    """Simulates killing a Kubernetes pod."""
-    logger.info(
-        f"Simulating pod failure for selector '{pod_selector}' in namespace '{namespace}'... [Placeholder]"
-    )
-    # TODO: Implement actual pod deletion using Kubernetes client library or kubectl subprocess
-    logger.info("Simulated pod failure complete.")
+
+@dataclass
+class ProbeSpec:
+    """Steady-state HTTP probe sent through the fault proxy."""
+
+    path: str = "/health"
+    interval_sec: float = 0.2
+    timeout_sec: float = 2.0
+    expect_status: int = 200
+
+
+@dataclass
+class ExperimentSpec:
+    """One fault against one target, as declared in a profile."""
+
+    name: str
+    fault: str
+    target: str
+    duration_sec: float = 30.0
+    baseline_sec: float = 5.0
+    listen: str = "127.0.0.1:0"
+    params: dict[str, Any] = field(default_factory=dict)
+    probe: ProbeSpec = field(default_factory=ProbeSpec)
+
+
+@dataclass
+class PhaseResult:
+    """Probe outcome for one phase (baseline or fault) of an experiment."""
+
+    phase: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+@dataclass
+class ProfileOutcome:
+    """Per-experiment phase results, plus the experiments that failed to run."""
+
+    results: dict[str, list[PhaseResult]] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+class ResultsStore:
+    """Compact SQLite store of experiment runs and per-phase probe results."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        profile TEXT NOT NULL,
+        seed INTEGER,
+        started_at REAL NOT NULL,
+        finished_at REAL
+    );
+    CREATE TABLE IF NOT EXISTS results (
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        experiment TEXT NOT NULL,
+        fault TEXT NOT NULL,
+        phase TEXT NOT NULL,
+        requests INTEGER NOT NULL,
+        errors INTEGER NOT NULL,
+        p50_ms REAL, p95_ms REAL, p99_ms REAL, max_ms REAL
+    );
+    CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+    """
+
+    def __init__(self, path: Path = RESULTS_DB):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(self.SCHEMA)
+
+    def start_run(self, profile: str, seed: int | None) -> int:
+        cur = self._db.execute(
+            "INSERT INTO runs (profile, seed, started_at) VALUES (?, ?, ?)",
+            (profile, seed, time.time()),
+        )
+        self._db.commit()
+        return int(cur.lastrowid)
+
+    def record(
+        self, run_id: int, spec: ExperimentSpec, results: list[PhaseResult]
+    ) -> None:
+        self._db.executemany(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    spec.name,
+                    spec.fault,
+                    r.phase,
+                    r.requests,
+                    r.errors,
+                    r.p50_ms,
+                    r.p95_ms,
+                    r.p99_ms,
+                    r.max_ms,
+                )
+                for r in results
+            ],
+        )
+        self._db.commit()
+
+    def finish_run(self, run_id: int) -> None:
+        self._db.execute(
+            "UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id)
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
 
 
 class ChaosGod:
-    def __init__(self, level=7):  # Replace $CHAOS_LEVEL with a default value
+    """Schedules a profile's experiments, at most `level` running at once."""
+
+    def __init__(
+        self, level=7, seed: int | None = None, store: ResultsStore | None = None
+    ):
         self.level = level
-        self.destructor = lambda: secrets.choice(
-            [
-                self._corrupt_memory,
-                self._entangle_qubits,
-                self._overwrite_production,
-            ]
+        self.seed = seed
+        self._rng = random.Random(seed)  # noqa: S311 - reproducible chaos, not crypto
+        self.store = store
+        self.destructors = {
+            "latency": self._inject_latency,
+            "reset": self._reset_connections,
+            "bandwidth": self._throttle_bandwidth,
+            "partial_write": self._truncate_writes,
+        }
+        self.destructor = lambda: self._rng.choice(list(self.destructors.values()))
+
+    @staticmethod
+    def _inject_latency(params: dict[str, Any]) -> FaultProfile:
+        return FaultProfile(
+            latency_dist=params.get("latency_dist", "normal"),
+            latency_ms=params.get("latency_ms", 100.0),
+            jitter_ms=params.get("jitter_ms", 25.0),
+            pareto_alpha=params.get("pareto_alpha", 2.0),
+        )
+
+    @staticmethod
+    def _reset_connections(params: dict[str, Any]) -> FaultProfile:
+        return FaultProfile(
+            reset_rate=params.get("reset_rate", 0.2),
+            reset_after_max_bytes=params.get("reset_after_max_bytes", 4096),
+        )
+
+    @staticmethod
+    def _throttle_bandwidth(params: dict[str, Any]) -> FaultProfile:
+        return FaultProfile(bandwidth_kbps=params.get("bandwidth_kbps", 64.0))
+
+    @staticmethod
+    def _truncate_writes(params: dict[str, Any]) -> FaultProfile:
+        return FaultProfile(partial_write_rate=params.get("partial_write_rate", 0.1))
+
+    def attack(self, target: str = "127.0.0.1:8888", duration_sec: float = 30.0):
+        """Draws `level` random experiments against `target` (for ad-hoc runs)."""
+        names = {fn: name for name, fn in self.destructors.items()}
+        return [
+            ExperimentSpec(
+                name=f"random-{i}",
+                fault=names[self.destructor()],
+                target=target,
+                duration_sec=duration_sec,
+            )
+            for i in range(self.level)
+        ]
+
+    async def run_profile(
+        self, profile_name: str, experiments: list[ExperimentSpec]
+    ) -> ProfileOutcome:
+        """
+        Runs every baseline, then every fault phase, concurrently within each
+        stage, and stores the results. Failed experiments are collected in
+        `ProfileOutcome.failed` instead of aborting the run.
+        """
+        run_id = self.store.start_run(profile_name, self.seed) if self.store else None
+        limit = asyncio.Semaphore(max(1, self.level))
+        # Draw per-experiment seeds in declaration order, independent of scheduling
+        seeds = [self._rng.randrange(2**32) for _ in experiments]
+        outcome = ProfileOutcome()
+
+        async def _stage(coros: dict[str, Any]) -> dict[str, Any]:
+            async def _limited(coro):
+                async with limit:
+                    return await coro
+
+            names = list(coros)
+            done = await asyncio.gather(
+                *(_limited(coros[n]) for n in names), return_exceptions=True
+            )
+            ok = {}
+            for name, result in zip(names, done, strict=True):
+                if isinstance(result, EXPERIMENT_ERRORS):
+                    logger.error(
+                        f"Experiment {name} failed: {type(result).__name__}: {result}"
+                    )
+                    outcome.failed[name] = f"{type(result).__name__}: {result}"
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    ok[name] = result
+            return ok
+
+        try:
+            baselines = await _stage(
+                {s.name: self.measure_baseline(s) for s in experiments}
+            )
+            faulted = await _stage(
+                {
+                    s.name: self.run_fault(s, seed)
+                    for s, seed in zip(experiments, seeds, strict=True)
+                    if s.name in baselines
+                }
+            )
+            for spec in experiments:
+                if spec.name not in faulted:
+                    continue
+                outcome.results[spec.name] = [baselines[spec.name], faulted[spec.name]]
+                if self.store and run_id is not None:
+                    self.store.record(run_id, spec, outcome.results[spec.name])
+        finally:
+            if self.store and run_id is not None:
+                self.store.finish_run(run_id)
+        return outcome
+
+    async def run_experiment(
+        self, spec: ExperimentSpec, seed: int | None = None
+    ) -> list[PhaseResult]:
+        """Baseline then fault phase for a single experiment run on its own."""
+        baseline = await self.measure_baseline(spec)
+        return [baseline, await self.run_fault(spec, seed)]
+
+    async def measure_baseline(self, spec: ExperimentSpec) -> PhaseResult:
+        """Probes the target directly, with no fault proxy in between."""
+        self._fault_profile(spec)  # Reject bad specs before spending the baseline
+        target_host, target_port = parse_host_port(spec.target)
+        logger.info(f"Experiment {spec.name}: baseline {spec.baseline_sec}s")
+        return await _probe(
+            "baseline",
+            f"http://{target_host}:{target_port}",
+            spec.probe,
+            spec.baseline_sec,
         )
 
-    def attack(self):
-        return [self.destructor()() for _ in range(self.level)]
+    def _fault_profile(self, spec: ExperimentSpec) -> FaultProfile:
+        if spec.fault not in self.destructors:
+            raise ValueError(f"Unknown fault '{spec.fault}' in experiment {spec.name}")
+        return self.destructors[spec.fault](spec.params)
+
+    async def run_fault(
+        self, spec: ExperimentSpec, seed: int | None = None
+    ) -> PhaseResult:
+        """Probes the target through a fault-injecting proxy."""
+        profile = self._fault_profile(spec)
+        target_host, target_port = parse_host_port(spec.target)
+        listen_host, listen_port = parse_host_port(spec.listen)
+        async with ChaosProxy(
+            target_host,
+            target_port,
+            profile,
+            listen_host=listen_host,
+            listen_port=listen_port,
+            seed=seed,
+        ) as proxy:
+            logger.info(
+                f"Experiment {spec.name}: {spec.fault} for {spec.duration_sec}s "
+                f"via {proxy.listen_host}:{proxy.listen_port}"
+            )
+            faulted = await _probe(
+                "fault",
+                f"http://{proxy.listen_host}:{proxy.listen_port}",
+                spec.probe,
+                spec.duration_sec,
+            )
+        return faulted
+
+
+async def _probe(
+    phase: str, base_url: str, probe: ProbeSpec, duration_sec: float
+) -> PhaseResult:
+    """Sends the probe on a fixed interval and summarises latency and errors."""
+    hist = LatencyHistogram()
+    requests = errors = 0
+    deadline = time.monotonic() + duration_sec
+    # Fresh connection per probe so connection-level faults are observed
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=probe.timeout_sec,
+        limits=httpx.Limits(max_keepalive_connections=0),
+    ) as client:
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                resp = await client.get(probe.path)
+                ok = resp.status_code == probe.expect_status
+            except httpx.HTTPError:
+                ok = False
+            hist.record((time.perf_counter() - started) * 1_000_000)
+            requests += 1
+            errors += not ok
+            await asyncio.sleep(
+                max(0.0, probe.interval_sec - (time.perf_counter() - started))
+            )
+    return PhaseResult(
+        phase=phase,
+        requests=requests,
+        errors=errors,
+        p50_ms=hist.percentile(50) / 1000,
+        p95_ms=hist.percentile(95) / 1000,
+        p99_ms=hist.percentile(99) / 1000,
+        max_ms=hist.max_us / 1000,
+    )
+
+
+def load_profile(name_or_path: str) -> dict[str, Any]:
+    """Loads a profile by name from `.ekko/chaos_profiles` or by explicit path."""
+    path = Path(name_or_path)
+    if not path.is_file():
+        path = PROFILES_DIR / f"{name_or_path}.yaml"
+    if not path.is_file():
+        raise FileNotFoundError(f"Chaos profile not found: {name_or_path}")
+    data = yaml.safe_load(path.read_text()) or {}
+    data.setdefault("name", path.stem)
+    return data
+
+
+def parse_experiments(profile: dict[str, Any]) -> list[ExperimentSpec]:
+    defaults = profile.get("defaults", {})
+    specs = []
+    for raw in profile.get("experiments", []):
+        merged = {**defaults, **raw}
+        probe = ProbeSpec(**{**defaults.get("probe", {}), **raw.get("probe", {})})
+        merged["probe"] = probe
+        if "target" not in merged and "target" in profile:
+            merged["target"] = profile["target"]
+        specs.append(ExperimentSpec(**merged))
+    return specs
+
+
+def _parse_duration(value: str) -> float:
+    """Parses '90', '30s', '15m' or '12h' into seconds."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def _parse_rate(value: str) -> float:
+    """argparse type for --failure-rate: '35%' or '0.35', within [0, 1]."""
+    try:
+        rate = float(value[:-1]) / 100 if value.endswith("%") else float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected e.g. 35% or 0.35, got {value!r}"
+        ) from None
+    if not 0.0 <= rate <= 1.0:
+        raise argparse.ArgumentTypeError(f"must be between 0% and 100%, got {value!r}")
+    return rate
 
 
 def main():
     """Main function to parse arguments and run chaos experiments."""
-    parser = argparse.ArgumentParser(description="Ekko Chaos Injector (Placeholder)")
+    parser = argparse.ArgumentParser(description="Ekko Chaos Experiment Runner")
     parser.add_argument(
-        "--mode",
-        choices=["latency", "pod_failure"],
+        "--profile",
         required=True,
-        help="Type of chaos to inject.",
-    )
-    parser.add_argument(
-        "--target", help="Target for latency (e.g., IP, hostname) or pod selector."
+        help="Profile name in .ekko/chaos_profiles or a path.",
     )
     parser.add_argument(
         "--duration",
-        type=int,
-        default=30,
-        help="Duration for latency injection (seconds).",
-    )
-    parser.add_argument(
-        "--latency-ms", type=int, default=100, help="Max latency to add (ms)."
+        type=_parse_duration,
+        help="Override each experiment's fault duration (e.g. 90s, 4h).",
     )
     parser.add_argument(
-        "--namespace", default="default", help="Kubernetes namespace for pod failure."
+        "--failure-rate",
+        type=_parse_rate,
+        help="Override reset/partial-write rates (e.g. 35%% or 0.35).",
     )
+    parser.add_argument("--seed", type=int, help="Override the profile's RNG seed.")
+    parser.add_argument("--level", type=int, help="Max concurrent experiments.")
+    parser.add_argument("--db", default=str(RESULTS_DB), help="Results store path.")
 
     args = parser.parse_args()
-    logger.info(f"Starting chaos injection: Mode={args.mode}, Target={args.target}")
-
-    if args.mode == "latency":
-        if not args.target:
-            logger.error("Target required for latency mode.")
-            return 1
-        simulate_network_latency(args.target, args.duration, args.latency_ms)
-    elif args.mode == "pod_failure":
-        if not args.target:
-            logger.error("Pod selector target required for pod_failure mode.")
-            return 1
-        simulate_pod_failure(args.namespace, args.target)
-    else:
-        # Should not happen due to choices constraint
-        logger.error(f"Unknown chaos mode: {args.mode}")
+    try:
+        profile = load_profile(args.profile)
+        experiments = parse_experiments(profile)
+    except (OSError, ValueError, TypeError, yaml.YAMLError) as e:
+        logger.error(f"Invalid chaos profile: {e}")
         return 1
+    if not experiments:
+        logger.error(f"Profile '{profile['name']}' declares no experiments.")
+        return 1
+    for spec in experiments:
+        if args.duration is not None:
+            spec.duration_sec = args.duration
+        if args.failure_rate is not None and spec.fault in ("reset", "partial_write"):
+            spec.params[f"{spec.fault}_rate"] = args.failure_rate
 
-    logger.info("Chaos injection simulation finished.")
-    return 0
+    seed = args.seed if args.seed is not None else profile.get("seed")
+    store = ResultsStore(Path(args.db))
+    god = ChaosGod(level=args.level or profile.get("level", 7), seed=seed, store=store)
+    logger.info(
+        f"Running profile '{profile['name']}': {len(experiments)} experiments, "
+        f"level={god.level}, seed={seed}"
+    )
+    try:
+        outcomes = asyncio.run(god.run_profile(profile["name"], experiments))
+    except KeyboardInterrupt:
+        logger.warning("Chaos run interrupted.")
+        return 130
+    except ValueError as e:
+        logger.error(f"Chaos run failed: {e}")
+        return 1
+    finally:
+        store.close()
+
+    for name, (baseline, faulted) in outcomes.results.items():
+        logger.info(
+            f"{name}: p99 {baseline.p99_ms:.1f}ms -> {faulted.p99_ms:.1f}ms, "
+            f"errors {baseline.error_rate:.1%} -> {faulted.error_rate:.1%}"
+        )
+    for name, error in outcomes.failed.items():
+        logger.error(f"{name}: FAILED ({error})")
+    logger.info(f"Results stored in {args.db}")
+    return 1 if outcomes.failed else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+# File: tests/benchmarks/conftest.py
+"""
+Project Ekko - Benchmark Harness
+Times benchmarked callables and compares them to JSON baselines.
+
+    pytest -m benchmark tests/benchmarks                       # compare against baselines
+    pytest -m benchmark tests/benchmarks --bench-update        # (re)record baselines
+    pytest -m benchmark tests/benchmarks --bench-tolerance 15  # fail if >15% slower
+    pytest -m benchmark tests/benchmarks --bench-require-baseline  # CI guard
+
+The suite is timing-sensitive, so the default `pytest` run deselects it
+(`-m "not benchmark"` in pyproject.toml); select it explicitly as above.
+
+Baselines are machine-specific: record them on the box that runs the guard
+(CI records them from the base commit on the same runner, in the same job).
+Regressions are only enforced against baselines recorded on a machine with the
+same platform, Python and CPU count; others are reported, not failed. Without
+--bench-require-baseline, benchmarks lacking a recorded baseline are measured
+and reported, not failed.
+
+Noisy benchmarks compare their fastest round (`stat="min"`) with the recorded
+median, run more rounds, and pass a wider per-test `tolerance`; the widths
+are sized from repeated recording passes on a 1-CPU runner.
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+DEFAULT_BASELINES = Path(__file__).parent / "baselines.json"
+DEFAULT_TOLERANCE_PCT = 25.0
+
+_results: dict[str, dict[str, float | int | str]] = {}
+
+
+def _machine() -> dict[str, str | int | None]:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("ekko-bench")
+    group.addoption(
+        "--bench-update",
+        action="store_true",
+        help="Write measured medians as the new baselines.",
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=float(os.environ.get("EKKO_BENCH_TOLERANCE", DEFAULT_TOLERANCE_PCT)),
+        help="Allowed regression over baseline, in percent (env EKKO_BENCH_TOLERANCE).",
+    )
+    group.addoption(
+        "--bench-require-baseline",
+        action="store_true",
+        default=os.environ.get("EKKO_BENCH_REQUIRE_BASELINE", "") not in ("", "0"),
+        help="Fail benchmarks with no recorded baseline (env EKKO_BENCH_REQUIRE_BASELINE).",
+    )
+    group.addoption(
+        "--bench-baselines",
+        default=os.environ.get("EKKO_BENCH_BASELINES", str(DEFAULT_BASELINES)),
+        help="Baselines JSON file (env EKKO_BENCH_BASELINES).",
+    )
+
+
+def _load_file(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _load_baselines(path: Path) -> dict:
+    return _load_file(path).get("benchmarks", {})
+
+
+@pytest.fixture(scope="session")
+def bench_baselines(request) -> dict:
+    return _load_baselines(Path(request.config.getoption("--bench-baselines")))
+
+
+@pytest.fixture(scope="session")
+def bench_same_machine(request) -> bool:
+    """True when the baselines were recorded on a machine like this one."""
+    recorded = _load_file(Path(request.config.getoption("--bench-baselines"))).get(
+        "machine"
+    )
+    return recorded == _machine()
+
+
+@pytest.fixture
+def bench(request, bench_baselines, bench_same_machine) -> Callable[..., float]:
+    """
+    Returns `run(fn, rounds=5, warmup=1, name=None, stat="median",
+    tolerance=None) -> median seconds`.
+
+    The `stat` ("median" or "min") of `rounds` timed calls is compared with
+    the recorded median for `name` (default: the test's node name): with
+    "min", the fastest round must be no slower than the typical recorded one.
+    `tolerance` overrides --bench-tolerance for this benchmark.
+    """
+    update = request.config.getoption("--bench-update")
+    default_tolerance = request.config.getoption("--bench-tolerance")
+    require = request.config.getoption("--bench-require-baseline")
+
+    def run(
+        fn: Callable[[], object],
+        rounds: int = 5,
+        warmup: int = 1,
+        name: str | None = None,
+        stat: str = "median",
+        tolerance: float | None = None,
+    ) -> float:
+        if stat not in ("median", "min"):
+            raise ValueError(f"Unknown benchmark statistic: {stat}")
+        key = name or request.node.name
+        for _ in range(warmup):
+            fn()
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        median = statistics.median(samples)
+        _results[key] = {
+            "median_s": median,
+            "min_s": min(samples),
+            "rounds": rounds,
+            "stat": stat,
+        }
+        baseline = bench_baselines.get(key)
+        if update:
+            return median
+        if not baseline:
+            if require:
+                pytest.fail(
+                    f"{key} has no recorded baseline (record one with --bench-update)"
+                )
+            return median
+        if not bench_same_machine:
+            return median  # Other hardware: reported in the summary, not enforced
+        if tolerance is None:
+            tolerance = default_tolerance
+        measured, recorded = _results[key][f"{stat}_s"], baseline["median_s"]
+        if measured > recorded * (1 + tolerance / 100.0):
+            pytest.fail(
+                f"{key} regressed: {stat} {measured * 1000:.2f}ms > "
+                f"baseline {recorded * 1000:.2f}ms +{tolerance:.0f}%"
+            )
+        return median
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _results:
+        return
+    recorded = _load_file(Path(config.getoption("--bench-baselines")))
+    baselines = recorded.get("benchmarks", {})
+    terminalreporter.section("ekko benchmarks")
+    if baselines and recorded.get("machine") != _machine():
+        terminalreporter.write_line(
+            "baselines were recorded on a different machine; regressions not enforced"
+        )
+    for key, r in sorted(_results.items()):
+        stat = r["stat"]
+        base = baselines.get(key)
+        delta = (
+            f"{(r[f'{stat}_s'] / base['median_s'] - 1) * 100:+.1f}% vs baseline"
+            if base
+            else "no baseline"
+        )
+        terminalreporter.write_line(
+            f"{key:<40} {r[f'{stat}_s'] * 1000:10.3f} ms {stat:<6} {delta}"
+        )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results or not session.config.getoption("--bench-update"):
+        return
+    path = Path(session.config.getoption("--bench-baselines"))
+    merged = _load_baselines(path)
+    merged.update(_results)
+    path.write_text(
+        json.dumps(
+            {
+                "machine": _machine(),
+                "benchmarks": dict(sorted(merged.items())),
+            },
+            indent=2,
+        )
+        + "\n"
+    )
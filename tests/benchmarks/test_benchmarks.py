@@ -0,0 +1,147 @@
+# File: tests/benchmarks/test_benchmarks.py
+"""
+Project Ekko - Performance Benchmarks
+Covers settings load, CLI import/startup, directory walking, pattern scanning,
+in-process API throughput and TUI snapshot rendering. Runs fully offline.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ekko import config
+
+pytestmark = pytest.mark.benchmark
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+@pytest.fixture(scope="module")
+def synthetic_project(tmp_path_factory) -> Path:
+    """~2k-file tree with a handful of banned patterns and an ignored vendor dir."""
+    root = tmp_path_factory.mktemp("project")
+    body = "".join(f"def f{i}(x):\n    return x + {i}\n" for i in range(100))
+    for pkg in range(40):
+        pkg_dir = root / "src" / f"pkg{pkg}"
+        pkg_dir.mkdir(parents=True)
+        for mod in range(40):
+            text = body
+            if mod == 0:
+                text += "result = eval(user_input)\n"
+            (pkg_dir / f"mod{mod}.py").write_text(text)
+    vendor = root / "vendor"
+    vendor.mkdir()
+    for i in range(200):
+        (vendor / f"lib{i}.py").write_text("eval(x)\n")
+    (root / ".ekkoignore").write_text("vendor/\n")
+    profile = root / ".ekko" / "core_team"
+    profile.mkdir(parents=True)
+    (profile / "stark.yaml").write_text(
+        'code_quality:\n  banned_patterns:\n    - "eval("\n    - "unsafe_exec"\n'
+    )
+    return root
+
+
+def _subprocess_env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])
+    )
+    env["EKKO_LOG_LEVEL"] = "WARNING"
+    return env
+
+
+def test_settings_load(bench, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # Keep a developer's config/.env out of the numbers
+    monkeypatch.setattr(config, "_cached_settings", None)  # Restored after the test
+
+    def load():
+        config._cached_settings = None
+        return config.get_ekko_settings()
+
+    # A few milliseconds of file and env access: doubles under a busy host
+    bench(load, rounds=20, stat="min", tolerance=100)
+    assert config.get_ekko_settings().project_base_dir
+
+
+def test_cli_import(bench):
+    env = _subprocess_env()
+    cmd = [sys.executable, "-c", "import ekko.cli.main"]
+    # Process startup is noisy: best of many rounds, with extra slack
+    bench(
+        lambda: subprocess.run(cmd, env=env, check=True),  # noqa: S603
+        rounds=15,
+        stat="min",
+        tolerance=50,
+    )
+
+
+def test_cli_startup_help(bench):
+    env = _subprocess_env()
+    cmd = [sys.executable, "-m", "ekko.cli.main", "--help"]
+    bench(
+        lambda: subprocess.run(cmd, env=env, check=True, capture_output=True),  # noqa: S603
+        rounds=15,
+        stat="min",
+        tolerance=50,
+    )
+
+
+def test_walk_project(bench, synthetic_project):
+    from ekko.validation.scanner import walk_project
+
+    files = bench(
+        lambda: sum(1 for _ in walk_project(synthetic_project)),
+        rounds=20,
+        stat="min",
+        tolerance=50,
+    )
+    assert files
+    walked = list(walk_project(synthetic_project))
+    assert len([p for p in walked if p.suffix == ".py"]) == 1600  # vendor/ ignored
+
+
+def test_pattern_scan(bench, synthetic_project):
+    from ekko.validation.scanner import scan_project
+
+    bench(lambda: scan_project(synthetic_project), rounds=10, stat="min", tolerance=40)
+    scanned, findings = scan_project(synthetic_project)
+    assert scanned == 1600
+    assert len(findings) == 40
+
+
+def test_api_throughput(bench):
+    import httpx
+
+    from ekko.api.main import app
+
+    requests_per_round = 500
+
+    async def drive():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://ekko.local"
+        ) as client:
+            for _ in range(requests_per_round):
+                resp = await client.get("/health")
+                assert resp.status_code == 200
+
+    median = bench(lambda: asyncio.run(drive()), rounds=5, stat="min", tolerance=60)
+    assert requests_per_round / median > 0
+
+
+def test_tui_snapshot_render(bench):
+    from ekko.tui.main import EkkoTUI
+
+    async def snapshot() -> str:
+        app = EkkoTUI()
+        async with app.run_test(size=(120, 40)) as pilot:
+            await pilot.pause()
+            return app.export_screenshot()
+
+    bench(lambda: asyncio.run(snapshot()), rounds=5, stat="min", tolerance=40)
+    assert "Ekko" in asyncio.run(snapshot())
@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
 # File: tests/chaos/injector.py
 """
-Project Ekko - Chaos Injection Tool (Placeholder v1.2)
-Placeholder for future chaos engineering tests. Corrected syntax.
+Project Ekko - Chaos Injection Tool v1.3
+Latency and fault injection through a local asyncio TCP proxy (no root or `tc`).
+
+Put the proxy in front of a target (the Ekko API, an Ollama endpoint, ...) and
+point the client at the proxy's listen address. Per connection it can add
+latency drawn from a distribution, cap bandwidth, reset the connection (RST)
+and truncate writes mid-chunk.
 """
 
 import argparse
+import asyncio
+import contextlib
 import logging
+import random
+import socket
+import struct
 import sys  # Added missing import
 import time
+from dataclasses import dataclass, field
 
 # Basic logger setup
 logging.basicConfig(
@@ -17,15 +28,350 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+LATENCY_DISTRIBUTIONS = ("none", "fixed", "uniform", "normal", "exponential", "pareto")
+CHUNK_SIZE = 64 * 1024
+MAX_QUEUED_CHUNKS = 8  # Per direction; beyond this the proxy stops reading
+MIN_PACED_CHUNK = 1024
+
+
+@dataclass
+class FaultProfile:
+    """Faults applied to every proxied connection.
+
+    `latency_ms` is the fixed value, the uniform upper bound, the normal or
+    exponential mean, or the pareto scale; `jitter_ms` is the normal standard
+    deviation or the uniform lower bound. Rates are probabilities in [0, 1].
+    """
+
+    latency_dist: str = "none"
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    pareto_alpha: float = 2.0
+    bandwidth_kbps: float = 0.0  # Per direction, per connection; 0 = unlimited
+    reset_rate: float = 0.0  # Chance a connection is reset after a random byte count
+    reset_after_max_bytes: int = 64 * 1024
+    partial_write_rate: float = 0.0  # Chance per chunk of a truncated write + close
+
+    def __post_init__(self):
+        if self.latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.latency_dist}")
+        for name in ("reset_rate", "partial_write_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Returns one latency sample in seconds."""
+        dist, ms = self.latency_dist, self.latency_ms
+        if dist == "none" or ms <= 0:
+            value = 0.0
+        elif dist == "fixed":
+            value = ms
+        elif dist == "uniform":
+            value = rng.uniform(min(self.jitter_ms, ms), ms)
+        elif dist == "normal":
+            value = rng.gauss(ms, self.jitter_ms)
+        elif dist == "exponential":
+            value = rng.expovariate(1.0 / ms)
+        else:  # pareto: heavy tail, scale = latency_ms
+            value = ms * rng.paretovariate(self.pareto_alpha)
+        return max(value, 0.0) / 1000.0
+
+
+@dataclass
+class ProxyStats:
+    """Counters aggregated over all proxied connections."""
+
+    connections: int = 0
+    active: int = 0
+    upstream_failures: int = 0
+    bytes_up: int = 0
+    bytes_down: int = 0
+    resets: int = 0
+    partial_writes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def summary(self) -> str:
+        return (
+            f"connections={self.connections} upstream_failures={self.upstream_failures} "
+            f"up={self.bytes_up}B down={self.bytes_down}B resets={self.resets} "
+            f"partial_writes={self.partial_writes}"
+        )
+
+
+class _Connection:
+    """Per-connection fault state shared by both directions."""
+
+    __slots__ = ("fault", "reset_budget", "rng")
+
+    def __init__(self, rng: random.Random, reset_budget: int | None):
+        self.rng = rng
+        self.reset_budget = reset_budget  # Bytes left before a forced reset
+        self.fault = asyncio.Event()
+
+
+class ChaosProxy:
+    """Asyncio TCP proxy that injects faults from a `FaultProfile`.
+
+    Usable as an async context manager; `listen_port=0` picks a free port,
+    available as `.listen_port` once started.
+    """
+
+    def __init__(
+        self,
+        target_host: str,
+        target_port: int,
+        profile: FaultProfile | None = None,
+        listen_host: str = "127.0.0.1",
+        listen_port: int = 0,
+        seed: int | None = None,
+    ):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.profile = profile or FaultProfile()
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.stats = ProxyStats()
+        self._seed = seed
+        self._server: asyncio.Server | None = None
+        self._handlers: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle, self.listen_host, self.listen_port
+        )
+        self.listen_port = self._server.sockets[0].getsockname()[1]
+        logger.info(
+            f"Chaos proxy {self.listen_host}:{self.listen_port} -> "
+            f"{self.target_host}:{self.target_port} ({self.profile})"
+        )
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        logger.info(f"Chaos proxy stopped: {self.stats.summary()}")
+
+    async def __aenter__(self) -> "ChaosProxy":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
 
-def simulate_network_latency(target: str, duration_sec: int, max_latency_ms: int):
-    """Simulates adding network latency."""
+    async def serve_for(self, duration_sec: float) -> ProxyStats:
+        """Runs the proxy for `duration_sec` seconds (forever if <= 0)."""
+        async with self:
+            if duration_sec > 0:
+                await asyncio.sleep(duration_sec)
+            else:
+                await asyncio.Event().wait()
+        return self.stats
+
+    async def _handle(
+        self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.connections += 1
+        self.stats.active += 1
+        conn_id = self.stats.connections
+        upstream_writer: asyncio.StreamWriter | None = None
+        handler = asyncio.current_task()
+        if handler is not None:
+            self._handlers.add(handler)
+        try:
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection(
+                    self.target_host, self.target_port
+                )
+            except OSError as e:
+                self.stats.upstream_failures += 1
+                logger.warning(f"Upstream connect failed: {e}")
+                _reset(client_writer)
+                return
+            # One RNG per connection: its faults depend on the seed and its
+            # number only, not on how traffic interleaves with other connections
+            conn_seed = None if self._seed is None else self._seed + conn_id
+            rng = random.Random(conn_seed)  # noqa: S311 - reproducible chaos, not crypto
+            reset_budget = None
+            if rng.random() < self.profile.reset_rate:
+                reset_budget = rng.randint(0, self.profile.reset_after_max_bytes)
+            conn = _Connection(rng, reset_budget)
+            pipes = asyncio.gather(
+                self._pipe(client_reader, upstream_writer, "up", conn),
+                self._pipe(upstream_reader, client_writer, "down", conn),
+                return_exceptions=True,
+            )
+            fault = asyncio.create_task(conn.fault.wait())
+            await asyncio.wait([pipes, fault], return_when=asyncio.FIRST_COMPLETED)
+            if conn.fault.is_set():
+                pipes.cancel()
+                _reset(client_writer)
+                _reset(upstream_writer)
+            fault.cancel()
+            await asyncio.gather(pipes, fault, return_exceptions=True)
+        except asyncio.CancelledError:
+            _reset(client_writer)  # Proxy shutting down mid-connection
+        finally:
+            self._handlers.discard(handler)
+            self.stats.active -= 1
+            for w in (client_writer, upstream_writer):
+                if w is not None and not w.is_closing():
+                    w.close()
+
+    async def _pipe(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        direction: str,
+        conn: _Connection,
+    ) -> None:
+        """
+        Copies one direction, delaying chunks without serialising their latency.
+
+        At most MAX_QUEUED_CHUNKS chunks wait for delivery. When the queue is
+        full the proxy stops reading, so TCP flow control pushes back on the
+        sender the way a real slow link would. Under a bandwidth cap, chunks
+        shrink to about 100 ms of transfer so the buffer stays small too.
+        """
+        queue: asyncio.Queue[tuple[float, bytes]] = asyncio.Queue(MAX_QUEUED_CHUNKS)
+        sender = asyncio.create_task(self._deliver(queue, writer, direction, conn))
+        chunk_size = CHUNK_SIZE
+        if self.profile.bandwidth_kbps > 0:
+            paced = int(self.profile.bandwidth_kbps * 1024 / 10)
+            chunk_size = min(CHUNK_SIZE, max(MIN_PACED_CHUNK, paced))
+        try:
+            while not sender.done():
+                data = await reader.read(chunk_size)
+                if not data:
+                    break
+                deliver_at = time.monotonic() + self.profile.sample_latency(conn.rng)
+                if not await _put_unless_done(queue, (deliver_at, data), sender):
+                    break
+            if await _put_unless_done(queue, (0.0, b""), sender):
+                await sender
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            sender.cancel()
+
+    async def _deliver(
+        self,
+        queue: "asyncio.Queue[tuple[float, bytes]]",
+        writer: asyncio.StreamWriter,
+        direction: str,
+        conn: _Connection,
+    ) -> None:
+        profile = self.profile
+        bytes_per_sec = (
+            profile.bandwidth_kbps * 1024 if profile.bandwidth_kbps > 0 else 0
+        )
+        deliver_floor = 0.0
+        while True:
+            deliver_at, data = await queue.get()
+            if not data:
+                with contextlib.suppress(OSError, RuntimeError):
+                    if writer.can_write_eof():
+                        writer.write_eof()
+                return
+            # Keep ordering: a chunk is never delivered before the one ahead of it
+            deliver_floor = max(deliver_floor, deliver_at)
+            delay = deliver_floor - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if conn.reset_budget is not None:
+                if len(data) >= conn.reset_budget:
+                    self.stats.resets += 1
+                    conn.fault.set()
+                    return
+                conn.reset_budget -= len(data)
+            if (
+                profile.partial_write_rate
+                and conn.rng.random() < profile.partial_write_rate
+            ):
+                cut = conn.rng.randint(0, max(len(data) - 1, 0))
+                writer.write(data[:cut])
+                with contextlib.suppress(ConnectionError, OSError):
+                    await writer.drain()
+                self.stats.partial_writes += 1
+                conn.fault.set()
+                return
+            writer.write(data)
+            try:
+                await writer.drain()
+            except (ConnectionError, OSError):
+                return
+            if direction == "up":
+                self.stats.bytes_up += len(data)
+            else:
+                self.stats.bytes_down += len(data)
+            if bytes_per_sec:
+                await asyncio.sleep(len(data) / bytes_per_sec)
+
+
+async def _put_unless_done(
+    queue: "asyncio.Queue[tuple[float, bytes]]",
+    item: tuple[float, bytes],
+    consumer: asyncio.Task,
+) -> bool:
+    """Waits for queue space; False if `consumer` finished first (nobody will drain)."""
+    if not queue.full():
+        queue.put_nowait(item)
+        return True
+    put = asyncio.ensure_future(queue.put(item))
+    try:
+        await asyncio.wait([put, consumer], return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        put.cancel()
+        raise
+    if put.done():
+        return True
+    put.cancel()
+    return False
+
+
+def _reset(writer: asyncio.StreamWriter) -> None:
+    """Closes with SO_LINGER=0 so the peer sees a TCP RST instead of a FIN."""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        with contextlib.suppress(OSError):
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+            )
+    writer.transport.abort()
+
+
+def parse_host_port(value: str, default_host: str = "127.0.0.1") -> tuple[str, int]:
+    """Parses `host:port`, `:port` or `port`."""
+    host, _, port = value.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"Expected host:port, got {value!r}")
+    return (host.strip("[]") or default_host), int(port)
+
+
+def simulate_network_latency(
+    target: str,
+    duration_sec: int,
+    max_latency_ms: int,
+    listen: str = "127.0.0.1:0",
+):
+    """Proxies `target` (host:port) with uniform 0..max latency for `duration_sec`."""
+    target_host, target_port = parse_host_port(target)
+    listen_host, listen_port = parse_host_port(listen)
     logger.info(
-        f"Simulating network latency up to {max_latency_ms}ms for {target} for {duration_sec}s... [Placeholder]"
+        f"Injecting network latency up to {max_latency_ms}ms for {target} for {duration_sec}s..."
+    )
+    proxy = ChaosProxy(
+        target_host,
+        target_port,
+        FaultProfile(latency_dist="uniform", latency_ms=max_latency_ms),
+        listen_host=listen_host,
+        listen_port=listen_port,
     )
-    # TODO: Implement actual latency injection
-    time.sleep(duration_sec)
-    logger.info("Simulated latency finished.")
+    stats = asyncio.run(proxy.serve_for(duration_sec))
+    logger.info(f"Latency injection finished: {stats.summary()}")
 
 
 def simulate_pod_failure(namespace: str, pod_selector: str):
@@ -33,27 +379,56 @@ def simulate_pod_failure(namespace: str, pod_selector: str):
     logger.info(
         f"Simulating pod failure for selector '{pod_selector}' in namespace '{namespace}'... [Placeholder]"
     )
-    # TODO: Implement actual pod deletion
+    # TODO: Implement actual pod deletion; use --mode proxy --reset-rate for connection faults
     logger.info("Simulated pod failure complete.")
 
 
 def main():
     """Main function to parse arguments and run chaos experiments."""
-    parser = argparse.ArgumentParser(description="Ekko Chaos Injector (Placeholder)")
+    parser = argparse.ArgumentParser(description="Ekko Chaos Injector")
     parser.add_argument(
         "--mode",
-        choices=["latency", "pod_failure"],
+        choices=["latency", "proxy", "pod_failure"],
         required=True,
         help="Type of chaos to inject.",
     )
     parser.add_argument(
-        "--target", help="Target for latency (e.g., IP) or pod selector."
+        "--target", help="Target host:port for latency/proxy, or pod selector."
     )
     parser.add_argument(
-        "--duration", type=int, default=30, help="Duration for latency (seconds)."
+        "--duration",
+        type=int,
+        default=30,
+        help="Duration in seconds (0 = until Ctrl+C).",
     )
     parser.add_argument("--latency-ms", type=int, default=100, help="Max latency (ms).")
     parser.add_argument("--namespace", default="default", help="Kubernetes namespace.")
+    proxy_group = parser.add_argument_group("proxy mode")
+    proxy_group.add_argument(
+        "--listen",
+        default="127.0.0.1:0",
+        help="Proxy listen host:port (0 = any free port).",
+    )
+    proxy_group.add_argument(
+        "--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="none"
+    )
+    proxy_group.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Normal stddev / uniform minimum."
+    )
+    proxy_group.add_argument("--pareto-alpha", type=float, default=2.0)
+    proxy_group.add_argument(
+        "--bandwidth-kbps", type=float, default=0.0, help="Per-direction cap (0 = off)."
+    )
+    proxy_group.add_argument(
+        "--reset-rate", type=float, default=0.0, help="Fraction of connections reset."
+    )
+    proxy_group.add_argument(
+        "--partial-write-rate",
+        type=float,
+        default=0.0,
+        help="Per-chunk chance of a truncated write followed by a reset.",
+    )
+    proxy_group.add_argument("--seed", type=int, default=None, help="RNG seed.")
 
     args = parser.parse_args()
     logger.info(f"Starting chaos injection: Mode={args.mode}, Target={args.target}")
@@ -62,7 +437,33 @@ def main():
         if not args.target:
             logger.error("Target required for latency mode.")
             return 1
-        simulate_network_latency(args.target, args.duration, args.latency_ms)
+        simulate_network_latency(
+            args.target, args.duration, args.latency_ms, args.listen
+        )
+    elif args.mode == "proxy":
+        if not args.target:
+            logger.error("Target host:port required for proxy mode.")
+            return 1
+        try:
+            target_host, target_port = parse_host_port(args.target)
+            listen_host, listen_port = parse_host_port(args.listen)
+            profile = FaultProfile(
+                latency_dist=args.latency_dist,
+                latency_ms=args.latency_ms if args.latency_dist != "none" else 0,
+                jitter_ms=args.jitter_ms,
+                pareto_alpha=args.pareto_alpha,
+                bandwidth_kbps=args.bandwidth_kbps,
+                reset_rate=args.reset_rate,
+                partial_write_rate=args.partial_write_rate,
+            )
+        except ValueError as e:
+            logger.error(f"Invalid proxy settings: {e}")
+            return 1
+        proxy = ChaosProxy(
+            target_host, target_port, profile, listen_host, listen_port, seed=args.seed
+        )
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(proxy.serve_for(args.duration))
     elif args.mode == "pod_failure":
         if not args.target:
             logger.error("Pod selector target required for pod_failure mode.")
@@ -72,7 +473,7 @@ def main():
         logger.error(f"Unknown chaos mode: {args.mode}")
         return 1  # Should not happen due to choices
 
-    logger.info("Chaos injection simulation finished.")
+    logger.info("Chaos injection finished.")
     return 0
 
 
@@ -0,0 +1,143 @@
+"""Unit tests for resource-aware admission control, driven by a fake sampler."""
+
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from ekko.cli.main import _admission
+from ekko.orchestration.admission import AdmissionController, HostSample
+from ekko.orchestration.batch import FairScheduler, Job
+
+
+class FakeHost:
+    """Returns whatever the test last set; `clock` drives cooldowns."""
+
+    def __init__(self, **overrides):
+        self.clock = 1000.0
+        self.sample = HostSample(
+            timestamp=self.clock,
+            cpu_percent=70.0,
+            load_per_cpu=0.5,
+            mem_available_mb=16_000,
+            swap_mb_per_sec=0.0,
+            disk_free_mb=100_000,
+        )
+        self.set(**overrides)
+
+    def set(self, **fields) -> None:
+        self.sample = replace(self.sample, **fields)
+
+    def advance(self, seconds: float) -> None:
+        self.clock += seconds
+
+    def __call__(self) -> HostSample:
+        return replace(self.sample, timestamp=self.clock)
+
+
+def _controller(host: FakeHost, **kwargs) -> AdmissionController:
+    kwargs.setdefault("max_workers", 8)
+    kwargs.setdefault("initial_workers", 4)
+    return AdmissionController(
+        sampler=host, sample_interval=0, cooldown_sec=5, **kwargs
+    )
+
+
+def test_defers_when_memory_reserve_would_be_breached():
+    host = FakeHost(mem_available_mb=1024 + 128 + 100)
+    ctl = _controller(host)
+    assert ctl.try_acquire("validation")
+    assert not ctl.try_acquire(
+        "validation"
+    )  # A second 128MB reservation cuts into the reserve
+    assert ctl.deferred == 1
+    ctl.release("validation")
+    assert ctl.try_acquire("validation")
+
+
+def test_validation_ignores_disk_but_deploy_does_not():
+    host = FakeHost(disk_free_mb=100)  # Far below the 2GB disk reserve
+    ctl = _controller(host)
+    assert ctl.try_acquire("validation")
+    assert ctl.try_acquire("validation")
+    assert not ctl.try_acquire("deploy")
+    assert ctl.forced == 0
+
+
+def test_forces_progress_when_nothing_is_running():
+    host = FakeHost(mem_available_mb=200, disk_free_mb=10)
+    ctl = _controller(host)
+    assert ctl.try_acquire("deploy")
+    assert ctl.forced == 1
+    assert not ctl.try_acquire("deploy")
+    ctl.release("deploy")
+    assert ctl.try_acquire("deploy")
+    assert (ctl.running, ctl.forced) == (1, 2)
+
+
+def test_pool_target_caps_running_tasks():
+    ctl = _controller(FakeHost(), initial_workers=2)
+    assert ctl.try_acquire("validation")
+    assert ctl.try_acquire("validation")
+    assert not ctl.try_acquire("validation")
+    assert ctl.deferred == 0  # At target size, not short of headroom
+
+
+def test_hysteresis_shrinks_fast_grows_slowly_and_holds_in_band():
+    host = FakeHost()
+    ctl = _controller(host)
+    assert ctl.limit() == 4  # 70% CPU: between the bands, hold
+    host.set(cpu_percent=95.0)
+    host.advance(10)
+    assert ctl.limit() == 2
+    host.advance(1)
+    assert ctl.limit() == 2  # Cooldown: no second halving yet
+    host.advance(10)
+    assert ctl.limit() == 1
+    host.set(cpu_percent=20.0)
+    host.advance(10)
+    assert ctl.limit() == 1  # Idle pool: no reason to grow
+    assert ctl.try_acquire("validation")
+    host.advance(10)
+    assert ctl.limit() == 2  # Busy and cool: grow by one
+    host.set(cpu_percent=70.0)
+    host.advance(10)
+    assert ctl.limit() == 2
+
+
+def test_swapping_counts_as_pressure():
+    host = FakeHost(swap_mb_per_sec=50.0, cpu_percent=10.0)
+    ctl = _controller(host)
+    host.advance(10)
+    assert ctl.limit() == 2
+
+
+def test_rejects_inverted_cpu_band():
+    with pytest.raises(ValueError, match="cpu_low"):
+        AdmissionController(cpu_low=90, cpu_high=80, sampler=FakeHost())
+
+
+def test_scheduler_finishes_on_a_starved_host():
+    """No headroom at all: the batch runs one task at a time instead of hanging."""
+    host = FakeHost(mem_available_mb=0, disk_free_mb=0)
+    ctl = _controller(host)
+    jobs = [Job(str(i), [lambda i=i: i] * 3) for i in range(3)]
+    started = time.monotonic()
+    FairScheduler(admission=ctl, kind="deploy").run(jobs)
+    assert time.monotonic() - started < 10
+    assert all(len(j.results) == 3 and j.ok for j in jobs)
+    assert ctl.running == 0
+
+
+def test_disk_is_sampled_where_the_projects_live(tmp_path: Path, monkeypatch):
+    seen = []
+
+    def fake_sample_host(disk_path, swap_state=None):
+        seen.append(Path(disk_path))
+        return FakeHost()()
+
+    monkeypatch.setattr("ekko.orchestration.admission.sample_host", fake_sample_host)
+    AdmissionController(disk_path=tmp_path, sample_interval=0).sample()
+    _admission(0, [tmp_path / "a", tmp_path / "team" / "b"]).sample()
+    assert seen == [tmp_path, tmp_path]
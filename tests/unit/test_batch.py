@@ -0,0 +1,147 @@
+"""Unit tests for multi-project batch orchestration."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from ekko.orchestration.batch import (
+    FairScheduler,
+    Job,
+    deploy_projects,
+    discover_projects,
+    validate_projects,
+)
+
+
+def _tasks(values, log=None):
+    for v in values:
+        if log is not None:
+            log.append(threading.current_thread().name)
+        yield lambda v=v: v
+
+
+def test_jobs_collect_results_and_errors():
+    def boom():
+        raise RuntimeError("task failed")
+
+    jobs = [
+        Job("a", list(_tasks([1, 2, 3]))),
+        Job("b", [boom, lambda: 4]),
+        Job("empty", []),
+    ]
+    finished: list[str] = []
+    FairScheduler(2, on_job_done=lambda j: finished.append(j.name)).run(jobs)
+    assert sorted(jobs[0].results) == [1, 2, 3]
+    assert jobs[0].ok
+    assert jobs[1].results == [4]
+    assert jobs[1].errors == ["RuntimeError: task failed"]
+    assert sorted(finished) == ["a", "b", "empty"]
+
+
+def test_small_job_is_not_queued_behind_large_one():
+    finished: list[str] = []
+    jobs = [Job("large", _tasks(range(200))), Job("small", _tasks(range(2)))]
+    FairScheduler(1, on_job_done=lambda j: finished.append(j.name)).run(jobs)
+    assert finished == ["small", "large"]
+    assert len(jobs[0].results) == 200
+
+
+def test_tasks_are_generated_on_workers_in_parallel():
+    """Each generator blocks until the other one runs, so serial generation would fail."""
+    barrier = threading.Barrier(2, timeout=5)
+    threads: list[str] = []
+
+    def gen(name: str):
+        threads.append(threading.current_thread().name)
+        barrier.wait()
+        yield lambda: name
+
+    jobs = [Job("a", gen("a")), Job("b", gen("b"))]
+    FairScheduler(2).run(jobs)
+    assert [j.results for j in jobs] == [["a"], ["b"]]
+    assert all(name.startswith("ekko-batch") for name in threads)
+
+
+def test_generator_failure_ends_only_that_job():
+    def broken():
+        yield lambda: 1
+        raise OSError("walk failed")
+
+    jobs = [Job("broken", broken()), Job("fine", _tasks(range(5)))]
+    FairScheduler(3).run(jobs)
+    assert jobs[0].results == [1]
+    assert jobs[0].errors == ["OSError: walk failed"]
+    assert sorted(jobs[1].results) == list(range(5))
+
+
+def test_pool_limit_is_respected():
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def task():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        threading.Event().wait(0.005)
+        with lock:
+            running -= 1
+
+    jobs = [Job(str(i), [task] * 10) for i in range(4)]
+    FairScheduler(3).run(jobs)
+    assert 1 <= peak <= 3
+
+
+def _project(base: Path, name: str, files: dict[str, str]) -> Path:
+    root = base / name
+    for rel, text in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text)
+    return root
+
+
+def test_validate_projects_reports_per_project(tmp_path: Path):
+    profile = 'code_quality:\n  banned_patterns:\n    - "eval("\n'
+    clean = _project(tmp_path, "clean", {"a.py": "x = 1\n"})
+    dirty = _project(
+        tmp_path,
+        "dirty",
+        {
+            ".ekko/core_team/stark.yaml": profile,
+            **{f"m{i}.py": "eval(x)\n" for i in range(100)},
+        },
+    )
+    _project(tmp_path, ".hidden", {"a.py": ""})
+    assert discover_projects(tmp_path) == [clean, dirty]
+    reports = validate_projects(discover_projects(tmp_path), max_workers=2)
+    by_name = {r.project.name: r for r in reports}
+    assert by_name["clean"].ok
+    assert by_name["dirty"].scanned == 100
+    assert len(by_name["dirty"].findings) == 100
+    assert by_name["dirty"].skipped == []
+
+
+def test_validate_projects_reports_oversized_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr("ekko.validation.scanner.MAX_SCAN_BYTES", 100)
+    project = _project(tmp_path, "p", {"big.py": "x = 1\n" * 50, "a.py": "x = 1\n"})
+    [report] = validate_projects([project])
+    assert report.scanned == 1
+    assert report.skipped == [project / "big.py"]
+
+
+def test_deploy_projects_records_failures(tmp_path: Path):
+    def deploy(project: Path, env: str) -> str:
+        if project.name == "bad":
+            raise RuntimeError("unreachable host")
+        return f"{project.name}@{env}"
+
+    jobs = deploy_projects([tmp_path / "good", tmp_path / "bad"], "prod", deploy)
+    assert jobs[0].results == ["good@prod"]
+    assert jobs[1].errors == ["RuntimeError: unreachable host"]
+
+
+def test_discover_projects_requires_base_dir(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        discover_projects(tmp_path / "missing")
@@ -0,0 +1,91 @@
+"""Unit tests for the HTTP load generator and its chaos proxy hook."""
+
+import asyncio
+import textwrap
+from pathlib import Path
+
+import httpx
+import pytest
+
+from ekko.core.bench import BenchConfig, LatencyHistogram, chaos_proxy, run_bench
+
+
+def test_histogram_percentiles_within_bucket_error():
+    h = LatencyHistogram()
+    for v in range(1, 10_001):
+        h.record(v)
+    assert h.count == 10_000
+    assert h.min_us == 1
+    assert h.max_us == 10_000
+    for q in (50, 95, 99):
+        assert abs(h.percentile(q) - q * 100) <= q * 100 * 0.02
+
+
+def test_histogram_merge():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    a.record(100)
+    b.record(5_000)
+    a.merge(b)
+    assert (a.count, a.min_us, a.max_us) == (2, 100, 5_000)
+    with pytest.raises(ValueError, match="layouts"):
+        a.merge(LatencyHistogram(bits=5))
+
+
+def test_run_bench_closed_loop_counts_errors():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200 if request.url.path == "/ok" else 503)
+
+    cfg = BenchConfig(
+        base_url="http://bench.local",
+        endpoints=["/ok", "/down"],
+        concurrency=2,
+        duration_sec=5,
+        max_requests=40,
+        warmup_sec=0,
+    )
+    result = asyncio.run(run_bench(cfg, transport=httpx.MockTransport(handler)))
+    assert result.requests == 40
+    assert result.ok == 20
+    assert result.errors == {"HTTP 503": 20}
+
+
+def test_chaos_proxy_rejects_https(tmp_path: Path):
+    injector = tmp_path / "injector.py"
+    injector.write_text("")
+    with (
+        pytest.raises(ValueError, match="http://"),
+        chaos_proxy("https://api.example.com", "", injector),
+    ):
+        pass
+
+
+def test_chaos_proxy_reports_early_exit(tmp_path: Path):
+    injector = tmp_path / "injector.py"
+    injector.write_text(
+        "import sys\nsys.stderr.write('bad flag --nope')\nsys.exit(2)\n"
+    )
+    with (
+        pytest.raises(RuntimeError, match="bad flag --nope"),
+        chaos_proxy("http://127.0.0.1:9", "--nope", injector),
+    ):
+        pass
+
+
+def test_chaos_proxy_survives_noisy_stderr(tmp_path: Path):
+    """A proxy that logs more than a pipe buffer holds must not block on stderr."""
+    injector = tmp_path / "injector.py"
+    injector.write_text(
+        textwrap.dedent(
+            """
+            import socket, sys, time
+            port = int(sys.argv[sys.argv.index("--listen") + 1].rsplit(":", 1)[1])
+            sys.stderr.write("upstream failure\\n" * 20000)
+            sys.stderr.flush()
+            server = socket.create_server(("127.0.0.1", port))
+            while True:
+                server.accept()[0].close()
+            """
+        )
+    )
+    with chaos_proxy("http://127.0.0.1:9", "", injector) as url:
+        assert url.startswith("http://127.0.0.1:")
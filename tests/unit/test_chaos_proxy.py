@@ -0,0 +1,190 @@
+"""Unit tests for the chaos injector's TCP proxy mode."""
+
+import asyncio
+import contextlib
+import random
+import time
+
+import pytest
+
+from tests.chaos.injector import ChaosProxy, FaultProfile, parse_host_port
+
+
+async def _start_echo() -> asyncio.Server:
+    async def echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with contextlib.suppress(ConnectionError):  # Reset by the proxy's faults
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(echo, "127.0.0.1", 0)
+
+
+async def _start_stalled() -> tuple[asyncio.Server, asyncio.Event]:
+    """A target that accepts connections and never reads from them."""
+    release = asyncio.Event()
+
+    async def stall(
+        _reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await release.wait()
+        writer.close()
+
+    return await asyncio.start_server(stall, "127.0.0.1", 0), release
+
+
+def _port(server: asyncio.Server) -> int:
+    return server.sockets[0].getsockname()[1]
+
+
+def test_fault_profile_validation():
+    with pytest.raises(ValueError, match="distribution"):
+        FaultProfile(latency_dist="gamma")
+    with pytest.raises(ValueError, match="reset_rate"):
+        FaultProfile(reset_rate=1.5)
+
+
+def test_sample_latency_distributions():
+    rng = random.Random(1)  # noqa: S311
+    assert FaultProfile().sample_latency(rng) == 0.0
+    assert FaultProfile(latency_dist="fixed", latency_ms=20).sample_latency(rng) == 0.02
+    uniform = FaultProfile(latency_dist="uniform", latency_ms=30, jitter_ms=10)
+    assert all(0.01 <= uniform.sample_latency(rng) <= 0.03 for _ in range(100))
+    normal = FaultProfile(latency_dist="normal", latency_ms=5, jitter_ms=50)
+    assert all(normal.sample_latency(rng) >= 0.0 for _ in range(100))
+
+
+def test_parse_host_port():
+    assert parse_host_port("example.com:80") == ("example.com", 80)
+    assert parse_host_port(":8080") == ("127.0.0.1", 8080)
+    assert parse_host_port("9000") == ("127.0.0.1", 9000)
+
+
+@pytest.mark.asyncio
+async def test_proxy_forwards_with_latency():
+    echo = await _start_echo()
+    profile = FaultProfile(latency_dist="fixed", latency_ms=50)
+    async with echo, ChaosProxy("127.0.0.1", _port(echo), profile, seed=1) as proxy:
+        reader, writer = await asyncio.open_connection("127.0.0.1", proxy.listen_port)
+        started = time.monotonic()
+        writer.write(b"ping")
+        await writer.drain()
+        assert await asyncio.wait_for(reader.readexactly(4), 5) == b"ping"
+        assert time.monotonic() - started >= 0.09  # 50 ms each way
+        writer.close()
+    assert proxy.stats.connections == 1
+    assert proxy.stats.bytes_up == proxy.stats.bytes_down == 4
+
+
+@pytest.mark.asyncio
+async def test_slow_target_pushes_back_on_sender():
+    """The proxy must not buffer a whole stream while the target is not reading."""
+    target, release = await _start_stalled()
+    async with target, ChaosProxy("127.0.0.1", _port(target)) as proxy:
+        _, writer = await asyncio.open_connection("127.0.0.1", proxy.listen_port)
+        writer.write(b"x" * (64 * 1024 * 1024))
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(writer.drain(), 2)
+        # Kernel socket buffers hold some of it, but the proxy queue stays bounded
+        assert proxy.stats.bytes_up < 32 * 1024 * 1024
+        release.set()
+        writer.transport.abort()
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_cap_paces_delivery():
+    echo = await _start_echo()
+    profile = FaultProfile(bandwidth_kbps=256)
+    async with echo, ChaosProxy("127.0.0.1", _port(echo), profile) as proxy:
+        reader, writer = await asyncio.open_connection("127.0.0.1", proxy.listen_port)
+        started = time.monotonic()
+        writer.write(b"y" * (64 * 1024))
+        await writer.drain()
+        await asyncio.wait_for(reader.readexactly(64 * 1024), 10)
+        assert time.monotonic() - started >= 0.2  # 64 KiB at 256 KiB/s, per direction
+        writer.close()
+
+
+async def _start_greeter(payload: bytes) -> asyncio.Server:
+    """A target that sends `payload` as soon as a client connects."""
+
+    async def greet(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(payload)
+        await writer.drain()
+        await reader.read()
+        writer.close()
+
+    return await asyncio.start_server(greet, "127.0.0.1", 0)
+
+
+async def _read_until_cut(reader: asyncio.StreamReader) -> tuple[bytes, bool]:
+    """Reads to EOF; returns the bytes received and whether the peer reset."""
+    received = b""
+    try:
+        while data := await asyncio.wait_for(reader.read(65536), 5):
+            received += data
+    except ConnectionResetError:
+        return received, True
+    return received, False
+
+
+@pytest.mark.asyncio
+async def test_reset_fault_aborts_the_connection():
+    echo = await _start_echo()
+    profile = FaultProfile(reset_rate=1.0, reset_after_max_bytes=0)
+    async with echo, ChaosProxy("127.0.0.1", _port(echo), profile, seed=1) as proxy:
+        reader, writer = await asyncio.open_connection("127.0.0.1", proxy.listen_port)
+        writer.write(b"ping")
+        await writer.drain()
+        received, was_reset = await _read_until_cut(reader)
+        writer.close()
+    assert (received, was_reset) == (b"", True)
+    assert proxy.stats.resets == 1
+    assert proxy.stats.bytes_up == proxy.stats.bytes_down == 0
+
+
+@pytest.mark.asyncio
+async def test_partial_write_fault_cuts_the_stream():
+    payload = b"z" * 4096
+    greeter = await _start_greeter(payload)
+    profile = FaultProfile(partial_write_rate=1.0)
+    async with (
+        greeter,
+        ChaosProxy("127.0.0.1", _port(greeter), profile, seed=1) as proxy,
+    ):
+        reader, writer = await asyncio.open_connection("127.0.0.1", proxy.listen_port)
+        received, _ = await _read_until_cut(reader)
+        writer.close()
+    assert len(received) < len(payload)
+    assert payload.startswith(received)
+    assert proxy.stats.partial_writes == 1
+
+
+@pytest.mark.asyncio
+async def test_seeded_faults_are_decided_per_connection():
+    """A connection's fate depends on the seed and its number, not on other traffic."""
+    echo = await _start_echo()
+    profile = FaultProfile(
+        latency_dist="uniform", latency_ms=2, reset_rate=0.5, reset_after_max_bytes=0
+    )
+
+    async def fates(first_conn_chunks: int) -> list[bool]:
+        async with ChaosProxy("127.0.0.1", _port(echo), profile, seed=0) as proxy:
+            outcome = []
+            for n in (first_conn_chunks, 1, 1, 1, 1, 1):
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", proxy.listen_port
+                )
+                with contextlib.suppress(ConnectionError):
+                    for _ in range(n):  # Each chunk draws a latency sample
+                        writer.write(b"ping")
+                        await writer.drain()
+                        await asyncio.sleep(0.005)
+                    writer.write_eof()
+                outcome.append((await _read_until_cut(reader))[1])
+                writer.close()
+            return outcome
+
+    async with echo:
+        assert await fates(1) == await fates(5)
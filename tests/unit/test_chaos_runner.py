@@ -0,0 +1,151 @@
+"""Unit tests for the chaos experiment runner (test/chaos/injector.py)."""
+
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+RUNNER_PATH = Path(__file__).resolve().parents[2] / "test" / "chaos" / "injector.py"
+
+
+@pytest.fixture(scope="module")
+def runner():
+    spec = importlib.util.spec_from_file_location("ekko_chaos_runner", RUNNER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations via sys.modules
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+@pytest.fixture
+def fake_probe(runner, monkeypatch):
+    """Replaces the HTTP probe; records (phase, event, url) in call order."""
+    log: list[tuple[str, str, str]] = []
+
+    async def probe(phase, base_url, probe_spec, duration_sec):
+        log.append((phase, "start", base_url))
+        await asyncio.sleep(duration_sec)
+        log.append((phase, "end", base_url))
+        return runner.PhaseResult(phase, 10, 0, 1.0, 2.0, 3.0, 4.0)
+
+    monkeypatch.setattr(runner, "_probe", probe)
+    return log
+
+
+def _spec(runner, name: str, **kwargs):
+    kwargs.setdefault("fault", "latency")
+    return runner.ExperimentSpec(
+        name=name,
+        target="127.0.0.1:9",
+        baseline_sec=0.02,
+        duration_sec=0.02,
+        **kwargs,
+    )
+
+
+def test_all_baselines_finish_before_any_fault(runner, fake_probe):
+    god = runner.ChaosGod(level=2, seed=1)
+    specs = [_spec(runner, f"exp-{i}") for i in range(4)]
+    outcome = asyncio.run(god.run_profile("unit", specs))
+    assert sorted(outcome.results) == [s.name for s in specs]
+    assert not outcome.failed
+    last_baseline = max(i for i, e in enumerate(fake_probe) if e[0] == "baseline")
+    first_fault = min(i for i, e in enumerate(fake_probe) if e[0] == "fault")
+    assert last_baseline < first_fault
+    assert all(
+        url == "http://127.0.0.1:9" for p, _, url in fake_probe if p == "baseline"
+    )
+    assert all(url != "http://127.0.0.1:9" for p, _, url in fake_probe if p == "fault")
+
+
+def test_failed_experiments_do_not_abort_profile(runner, fake_probe, tmp_path):
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+        specs = [
+            _spec(runner, "ok"),
+            _spec(runner, "bad-fault", fault="meteor"),
+            _spec(runner, "port-taken", listen=f"127.0.0.1:{port}"),
+        ]
+        store = runner.ResultsStore(tmp_path / "results.db")
+        god = runner.ChaosGod(level=3, seed=1, store=store)
+        outcome = asyncio.run(god.run_profile("unit", specs))
+    assert list(outcome.results) == ["ok"]
+    assert set(outcome.failed) == {"bad-fault", "port-taken"}
+    assert outcome.failed["bad-fault"].startswith("ValueError")
+    assert outcome.failed["port-taken"].startswith("OSError")
+    # The bad spec is rejected before its baseline is spent
+    assert sum(1 for p, e, _ in fake_probe if p == "baseline" and e == "start") == 2
+    rows = store._db.execute("SELECT experiment, phase FROM results").fetchall()
+    store.close()
+    assert sorted(rows) == [("ok", "baseline"), ("ok", "fault")]
+
+
+def test_parse_experiments_merges_defaults(runner):
+    specs = runner.parse_experiments(
+        {
+            "target": "127.0.0.1:8888",
+            "defaults": {
+                "duration_sec": 60,
+                "probe": {"path": "/health", "interval_sec": 1},
+            },
+            "experiments": [
+                {"name": "a", "fault": "reset", "probe": {"interval_sec": 0.5}},
+                {"name": "b", "fault": "latency", "duration_sec": 5, "target": "h:1"},
+            ],
+        }
+    )
+    assert [(s.name, s.target, s.duration_sec) for s in specs] == [
+        ("a", "127.0.0.1:8888", 60),
+        ("b", "h:1", 5),
+    ]
+    assert (specs[0].probe.path, specs[0].probe.interval_sec) == ("/health", 0.5)
+
+
+@pytest.mark.parametrize(
+    ("text", "seconds"), [("90", 90.0), ("30s", 30.0), ("15m", 900.0), ("2h", 7200.0)]
+)
+def test_parse_duration(runner, text, seconds):
+    assert runner._parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize(
+    ("text", "rate"), [("35%", 0.35), ("0.35", 0.35), ("100%", 1.0)]
+)
+def test_parse_rate(runner, text, rate):
+    assert runner._parse_rate(text) == pytest.approx(rate)
+
+
+@pytest.mark.parametrize("text", ["lots", "%", "150%", "-0.1"])
+def test_bad_failure_rate_is_a_usage_error(runner, monkeypatch, capsys, text):
+    monkeypatch.setattr(
+        sys, "argv", ["injector", "--profile=x", f"--failure-rate={text}"]
+    )
+    with pytest.raises(SystemExit) as exc:
+        runner.main()
+    assert exc.value.code == 2
+    assert "--failure-rate" in capsys.readouterr().err
+
+
+def test_runner_starts_as_a_module_from_the_repo_root():
+    root = RUNNER_PATH.parents[2]
+    code = "import test.chaos.injector as r; print(r.ChaosProxy.__module__)"
+    env = {**os.environ, "PYTHONPATH": str(root / "src")}
+    cmd = [sys.executable, "-c", code]
+    proc = subprocess.run(
+        cmd,  # noqa: S603 - fixed argv, no shell
+        check=False,
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "tests.chaos.injector"
@@ -0,0 +1,150 @@
+"""Unit tests for the in-process event bus."""
+
+import asyncio
+import threading
+
+import pytest
+
+from ekko.api.stream import StreamHub, bridge_events
+from ekko.orchestration.events import EventBus, Policy, SubscriptionClosedError, Topic
+
+
+async def _settle(bus: EventBus) -> None:
+    # Lets the ingress task drain whatever worker threads handed off
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_the_newest_events():
+    bus = EventBus()
+    sub = bus.subscribe([Topic.JOB], maxsize=3, policy=Policy.DROP_OLDEST)
+    for i in range(5):
+        await bus.publish(Topic.JOB, "tick", i)
+    await bus.publish(Topic.LOG, "ignored")
+    assert [e.payload for e in await sub.get_batch()] == [2, 3, 4]
+    assert sub.dropped == 2
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_new_keeps_the_oldest_events():
+    bus = EventBus()
+    sub = bus.subscribe(maxsize=3, policy=Policy.DROP_NEW)
+    for i in range(5):
+        bus.publish_nowait(Topic.JOB, "tick", i)
+    assert [e.payload for e in await sub.get_batch()] == [0, 1, 2]
+    assert sub.dropped == 2
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_block_waits_for_space_then_times_out():
+    bus = EventBus()
+    sub = bus.subscribe(maxsize=1, policy=Policy.BLOCK, block_timeout=0.05)
+    await bus.publish(Topic.JOB, "a")
+    waiting = asyncio.create_task(bus.publish(Topic.JOB, "b"))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    assert (await sub.get()).kind == "a"
+    await waiting
+    assert (await sub.get()).kind == "b"
+    await bus.publish(Topic.JOB, "c")
+    await bus.publish(Topic.JOB, "d")  # Nobody drains: dropped after block_timeout
+    assert [e.kind for e in await sub.get_batch()] == ["c"]
+    assert sub.dropped == 1
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_subscribers_are_served_before_blocked_ones():
+    bus = EventBus()
+    blocked = bus.subscribe(maxsize=1, policy=Policy.BLOCK, block_timeout=1.0)
+    fast = bus.subscribe(maxsize=10, policy=Policy.DROP_OLDEST)
+    await bus.publish(Topic.JOB, "a")
+    waiting = asyncio.create_task(bus.publish(Topic.JOB, "b"))
+    await asyncio.sleep(0.01)
+    # The BLOCK subscriber is full, yet the drop-policy one already has "b"
+    assert [e.kind for e in await fast.get_batch()] == ["a", "b"]
+    assert not waiting.done()
+    await blocked.get()
+    await waiting
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_thread_publishers_keep_their_order():
+    bus = EventBus()
+    sub = bus.subscribe(maxsize=10_000)
+
+    def produce(name: str) -> None:
+        for i in range(500):
+            bus.publish_threadsafe(Topic.JOB, name, i)
+
+    threads = [threading.Thread(target=produce, args=(n,)) for n in ("a", "b")]
+    for t in threads:
+        t.start()
+    await asyncio.to_thread(lambda: [t.join() for t in threads])
+    await _settle(bus)
+    events = await sub.get_batch(max_items=10_000)
+    for name in ("a", "b"):
+        assert [e.payload for e in events if e.kind == name] == list(range(500))
+    assert [e.seq for e in events] == sorted(e.seq for e in events)
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_ingress_is_bounded_for_thread_publishers():
+    bus = EventBus(ingress_size=10)
+    sub = bus.subscribe(maxsize=100)
+    # The loop is blocked in `join()`, so nothing drains while the thread floods
+    thread = threading.Thread(
+        target=lambda: [bus.publish_threadsafe(Topic.JOB, "tick", i) for i in range(50)]
+    )
+    thread.start()
+    thread.join()
+    assert bus.ingress_dropped == 40
+    await _settle(bus)
+    assert [e.payload for e in await sub.get_batch()] == list(range(10))
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_publish_returns_once_delivered():
+    bus = EventBus()
+    sub = bus.subscribe(maxsize=1, policy=Policy.BLOCK)
+    await asyncio.to_thread(bus.publish_threadsafe, Topic.JOB, "a", wait=True)
+    assert len(sub) == 1
+    sub.close()
+    assert (await sub.get()).kind == "a"  # Still drainable after close
+    with pytest.raises(SubscriptionClosedError):
+        await sub.get()
+    assert bus.subscriber_count == 0
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_bridge_forwards_job_deploy_and_log_events():
+    bus = EventBus()
+    hub = StreamHub()
+    hub.bind_loop(asyncio.get_running_loop())
+    bridge = asyncio.create_task(bridge_events(bus, hub))
+    await asyncio.sleep(0)
+    await bus.publish(Topic.JOB, "started", {"job": "api", "kind": "validation"})
+    await bus.publish(
+        Topic.JOB, "finished", {"job": "api", "kind": "validation", "ok": True}
+    )
+    await bus.publish(Topic.DEPLOY, "finished", {"job": "web", "ok": False})
+    await bus.publish(Topic.METRICS, "host", {"cpu": 1})
+    client = hub.register()
+    await bus.publish(Topic.LOG, "line", {"message": "hello"}, source="batch")
+    await asyncio.sleep(0)
+    state = {(u["channel"], u["key"]): u["data"] for u in hub.snapshot()["updates"]}
+    assert set(state) == {("jobs", "api"), ("deploy", "web")}
+    assert state["jobs", "api"]["state"] == "finished"
+    assert state["jobs", "api"]["ok"] is True
+    assert [r["message"] for r in client.take_frame()["logs"]] == ["hello"]
+    bridge.cancel()
+    await asyncio.gather(bridge, return_exceptions=True)
+    assert bus.subscriber_count == 0
+    bus.close()
@@ -0,0 +1,81 @@
+"""Unit tests for the TUI Git panel's repository cache."""
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ekko.tui.git_panel import GitRepoCache
+
+
+def _git(repo: Path, *args: str) -> None:
+    cmd = ["git", *args]
+    subprocess.run(cmd, cwd=repo, check=True, capture_output=True)  # noqa: S603 - temp repo
+
+
+def _commit(repo: Path, n: int) -> None:
+    (repo / "file.txt").write_text(f"{n}\n")
+    _git(repo, "add", "file.txt")
+    _git(repo, "commit", "-q", "-m", f"commit {n}")
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.name", "Test")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    for n in range(7):
+        _commit(tmp_path, n)
+    return tmp_path
+
+
+def test_log_pages_cover_history_in_order(repo: Path):
+    cache = GitRepoCache(repo)
+    pages = [cache.log_page(p, page_size=3) for p in range(4)]
+    assert [len(p) for p in pages] == [3, 3, 1, 0]
+    summaries = [c.summary for page in pages for c in page]
+    assert summaries == [f"commit {n}" for n in range(6, -1, -1)]
+
+
+def test_log_pages_resume_one_walk(repo: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = GitRepoCache(repo)
+    walks = []
+    original = cache._repo.iter_commits
+
+    def counting_iter_commits(*args, **kwargs):
+        walks.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(cache._repo, "iter_commits", counting_iter_commits)
+    for page in range(3):
+        cache.log_page(page, page_size=2)
+    cache.log_page(0, page_size=2)  # Already walked
+    assert len(walks) == 1
+
+
+def test_log_restarts_after_new_commit(repo: Path):
+    cache = GitRepoCache(repo)
+    assert cache.log_page(0, page_size=2)[0].summary == "commit 6"
+    _commit(repo, 7)
+    assert cache.check_invalidate()
+    assert cache.log_page(0, page_size=2)[0].summary == "commit 7"
+    assert not cache.check_invalidate()
+
+
+def test_concurrent_log_pages_are_consistent(repo: Path):
+    cache = GitRepoCache(repo)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pages = list(pool.map(lambda p: cache.log_page(p, page_size=1), range(7)))
+    assert [p[0].summary for p in pages] == [f"commit {n}" for n in range(6, -1, -1)]
+
+
+def test_status_is_cached_until_index_changes(repo: Path):
+    cache = GitRepoCache(repo)
+    assert cache.status()[0].startswith("## main")
+    (repo / "new.txt").write_text("x")
+    assert "?? new.txt" not in cache.status()  # Cached; index unchanged
+    _git(repo, "add", "new.txt")
+    assert cache.check_invalidate()
+    assert "A  new.txt" in cache.status()
+    assert cache.branches() == ("main", ["main"])
@@ -0,0 +1,79 @@
+"""Unit tests for license issuing and verification."""
+
+import pytest
+
+from ekko.core import licensing
+from ekko.core.licensing import (
+    LicenseError,
+    LicenseRequest,
+    LicenseVerifier,
+    generate_keypair,
+    issue_batch,
+)
+
+
+@pytest.fixture(scope="module")
+def keypair() -> tuple[bytes, bytes]:
+    return generate_keypair()
+
+
+def test_inline_batch_signs_in_order_without_keeping_the_key(keypair):
+    private_pem, public_pem = keypair
+    requests = [LicenseRequest(f"user-{i}", ("pro",)) for i in range(5)]
+    issued = issue_batch(private_pem, requests)
+    assert [lic.licensee for lic, _ in issued] == [f"user-{i}" for i in range(5)]
+    verifier = LicenseVerifier.from_pem(public_pem)
+    assert all(verifier.verify(token) == lic for lic, token in issued)
+    assert licensing._worker.key is None
+
+
+def test_pool_batch_matches_inline_format(keypair, monkeypatch):
+    private_pem, public_pem = keypair
+    monkeypatch.setattr(licensing, "IN_PROCESS_THRESHOLD", 2)
+    issued = issue_batch(
+        private_pem,
+        [LicenseRequest(f"u{i}") for i in range(7)],
+        workers=2,
+        chunk_size=3,
+    )
+    verifier = LicenseVerifier.from_pem(public_pem)
+    assert [verifier.verify(t).licensee for _, t in issued] == [
+        f"u{i}" for i in range(7)
+    ]
+    assert licensing._worker.key is None
+
+
+def test_verifier_caches_only_valid_tokens(keypair):
+    private_pem, public_pem = keypair
+    [(lic, token)] = issue_batch(private_pem, [LicenseRequest("acme")])
+    verifier = LicenseVerifier.from_pem(public_pem, cache_size=1)
+    assert verifier.verify(token) == lic
+    assert verifier.verify(f"  {token}\n") == lic
+    assert (verifier.stats.hits, verifier.stats.misses) == (1, 1)
+    payload, _ = token.split(".")
+    with pytest.raises(LicenseError, match="signature"):
+        verifier.verify(f"{payload}.{'A' * 86}")
+    with pytest.raises(LicenseError, match="Malformed"):
+        verifier.verify("not-a-token")
+    assert verifier.stats.evictions == 0
+
+
+def test_expired_license_is_rejected_even_when_cached(keypair):
+    private_pem, public_pem = keypair
+    [(lic, token)] = issue_batch(private_pem, [LicenseRequest("acme", days=1)])
+    now = [float(lic.issued_at)]
+    verifier = LicenseVerifier.from_pem(public_pem, clock=lambda: now[0])
+    verifier.verify(token)
+    now[0] += 2 * 86_400
+    with pytest.raises(LicenseError, match="expired"):
+        verifier.verify(token)
+    with pytest.raises(LicenseError, match="expired"):
+        verifier.verify(token)  # Evicted on the first hit; now fails uncached
+
+
+def test_other_products_and_key_types_are_rejected(keypair):
+    private_pem, public_pem = keypair
+    key = licensing.load_private_key(private_pem)
+    other = licensing.License("id", "acme", product="other")
+    with pytest.raises(LicenseError, match="product"):
+        LicenseVerifier.from_pem(public_pem).verify(licensing.sign_license(key, other))
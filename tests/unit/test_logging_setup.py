@@ -0,0 +1,148 @@
+"""Unit tests for the queue-based logging pipeline."""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from ekko.core.logging_setup import (
+    LogWriter,
+    _DebugSampler,
+    configure_logging,
+    get_logger,
+    shutdown_logging,
+)
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_configure_logging_writes_json_lines(tmp_path: Path, restore_root_logger):
+    log_file = tmp_path / "ekko.log"
+    configure_logging("INFO", log_file=log_file)
+    logging.getLogger("ekko.unit").info("stdlib %s", "hello")
+    logging.getLogger("ekko.unit").debug("filtered out")
+    get_logger("ekko.struct").info("structured", project="demo")
+    shutdown_logging()
+    events = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [e["event"] for e in events] == ["stdlib hello", "structured"]
+    assert events[0]["logger"] == "ekko.unit"
+    assert events[1]["project"] == "demo"
+    assert all("timestamp" in e for e in events)
+
+
+def test_rotation_counts_bytes_not_characters(tmp_path: Path):
+    log_file = tmp_path / "rot.log"
+    writer = LogWriter(log_file, max_bytes=4096, backup_count=2)
+    line = "é" * 300  # 600 bytes of UTF-8 but only 300 characters
+    for _ in range(8):  # ~4.8 KB written, ~2.4 K characters
+        writer._write(line + "\n")
+    writer._file.close()
+    rotated = log_file.with_name("rot.log.1")
+    assert rotated.exists()
+    assert rotated.stat().st_size >= 4096
+    assert rotated.stat().st_size < 4096 + 602  # Rolled right after crossing the limit
+
+
+class _FullWriter:
+    def load(self) -> float:
+        return 1.0
+
+
+def test_debug_sampler_is_exact_under_threads():
+    sampler = _DebugSampler(_FullWriter(), every=10)
+    kept = []
+
+    def hammer() -> None:
+        kept.append(sum(sampler.keep() for _ in range(20_000)))
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(kept) == 8 * 20_000 // 10
+
+
+def test_writer_drops_instead_of_blocking():
+    writer = LogWriter(queue_size=2)  # Not started: nothing drains the queue
+    for i in range(5):
+        writer.submit({"event": i})
+    assert writer.dropped == 3
+
+
+def test_importing_entry_points_configures_nothing(tmp_path: Path):
+    """Logging is set up by main()/the CLI callback, never as an import side effect."""
+    code = (
+        "import threading, ekko.main, ekko.tui.main, ekko.cli.main\n"
+        "from ekko.core import logging_setup\n"
+        "assert logging_setup._pipeline.writer is None\n"
+        "assert 'ekko-log-writer' not in [t.name for t in threading.enumerate()]\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    cmd = [sys.executable, "-c", code]
+    proc = subprocess.run(
+        cmd,  # noqa: S603 - fixed argv, no shell
+        check=False,
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert not list(tmp_path.iterdir())
+
+
+class _Capture(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def test_queue_handler_leaves_the_record_for_later_handlers(
+    tmp_path: Path, restore_root_logger
+):
+    configure_logging("INFO", log_file=tmp_path / "ekko.log")
+    capture = _Capture()
+    logging.getLogger().addHandler(capture)
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("ekko.unit").exception("failed %s", "job")
+    finally:
+        logging.getLogger().removeHandler(capture)
+    (record,) = capture.records
+    assert (record.msg, record.args) == ("failed %s", ("job",))
+    assert record.exc_info is not None
+    assert record.exc_info[0] is ValueError
+
+
+def test_structlog_uses_stdlib_logging_until_configured(
+    tmp_path: Path, caplog, restore_root_logger
+):
+    configure_logging("INFO", log_file=tmp_path / "ekko.log")
+    shutdown_logging()  # Back to the stdlib fallback
+    with caplog.at_level(logging.DEBUG, logger="ekko.orchestration.batch"):
+        get_logger("ekko.orchestration.batch").debug(
+            "batch job done", job="api", errors=0
+        )
+    assert "event='batch job done'" in caplog.text
+    assert "job='api'" in caplog.text
@@ -0,0 +1,111 @@
+"""Unit tests for the project walker and banned-pattern scanner."""
+
+from pathlib import Path
+
+from ekko.validation import scanner as scanner_module
+from ekko.validation.scanner import (
+    QUALITY_PROFILE,
+    PatternScanner,
+    load_banned_patterns,
+    scan_project,
+    walk_project,
+)
+
+
+def _touch(root: Path, rel: str, text: str = "") -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _rel(root: Path, paths) -> set[str]:
+    return {p.relative_to(root).as_posix() for p in paths}
+
+
+def test_walk_honours_ekkoignore(tmp_path: Path):
+    for rel in (
+        "a.py",
+        "pkg/b.py",
+        "pkg/build/c.py",
+        "build/d.py",
+        "vendor/e.py",
+        "x.log",
+    ):
+        _touch(tmp_path, rel)
+    _touch(tmp_path, ".git/config")
+    _touch(tmp_path, ".ekkoignore", "# comment\n\n/build/\nvendor/\n*.log\n")
+    assert _rel(tmp_path, walk_project(tmp_path)) == {
+        ".ekkoignore",
+        "a.py",
+        "pkg/b.py",
+        "pkg/build/c.py",  # "/build/" is anchored to the project root
+    }
+
+
+def test_walk_filters_suffixes_and_explicit_patterns(tmp_path: Path):
+    for rel in ("a.py", "b.txt", "skip/c.py"):
+        _touch(tmp_path, rel)
+    _touch(tmp_path, ".ekkoignore", "a.py\n")
+    found = walk_project(
+        tmp_path, ignore_patterns=["skip"], suffixes=frozenset({".py"})
+    )
+    assert _rel(tmp_path, found) == {"a.py"}
+
+
+def test_scanner_reports_line_and_text(tmp_path: Path):
+    scanner = PatternScanner(["eval(", "eval(input"])
+    data = b"ok = 1\nx = eval(input())\n"
+    [finding] = scanner.scan_bytes(tmp_path / "m.py", data)
+    assert (finding.line, finding.pattern, finding.text) == (
+        2,
+        "eval(input",
+        "x = eval(input())",
+    )
+    assert PatternScanner([]).scan_bytes(tmp_path / "m.py", data) == []
+
+
+def test_scan_project_uses_profile_and_skips_it(tmp_path: Path):
+    _touch(
+        tmp_path,
+        QUALITY_PROFILE.as_posix(),
+        'code_quality:\n  banned_patterns:\n    - "eval("\n',
+    )
+    _touch(tmp_path, "src/bad.py", "eval(x)\n")
+    _touch(tmp_path, "src/good.py", "print(x)\n")
+    _touch(tmp_path, "notes.md", "eval(x)\n")  # Not a scanned suffix
+    assert load_banned_patterns(tmp_path) == ["eval("]
+    scanned, findings = scan_project(tmp_path)
+    assert scanned == 2
+    assert [(f.path.name, f.line) for f in findings] == [("bad.py", 1)]
+
+
+def test_scan_project_without_profile_finds_nothing(tmp_path: Path):
+    _touch(tmp_path, "src/bad.py", "eval(x)\n")
+    assert scan_project(tmp_path) == (1, [])
+
+
+def test_patterns_match_on_identifier_boundaries(tmp_path: Path):
+    scanner = PatternScanner(["eval(", "unsafe_exec"])
+    data = (
+        b"a = ast.literal_eval(x)\n"
+        b"b = obj.eval(y)\n"
+        b"c = my_eval(z)\n"
+        b"d = unsafe_executor()\n"
+        b"e = eval(w)\n"
+        b"f = (unsafe_exec)\n"
+    )
+    found = [(f.line, f.pattern) for f in scanner.scan_bytes(tmp_path / "m.py", data)]
+    assert found == [(5, "eval("), (6, "unsafe_exec")]
+
+
+def test_oversized_files_are_reported_as_skipped(tmp_path: Path, monkeypatch, caplog):
+    monkeypatch.setattr(scanner_module, "MAX_SCAN_BYTES", 100)
+    _touch(tmp_path, "big.py", "eval(x)\n" * 50)
+    _touch(tmp_path, "small.py", "eval(x)\n")
+    skipped: list[Path] = []
+    scanned, findings = scan_project(tmp_path, patterns=["eval("], skipped=skipped)
+    assert scanned == 1
+    assert [f.path.name for f in findings] == ["small.py"]
+    assert [p.name for p in skipped] == ["big.py"]
+    assert "Not scanning" in caplog.text
@@ -0,0 +1,136 @@
+"""Unit tests for the incremental Scribe docs pipeline."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from ekko.core import scribe
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    pkg = tmp_path / "src" / "pkg"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text('"""Package."""\n')
+    (pkg / "a.py").write_text("def f(x):\n    return x\n")
+    (pkg / "b.py").write_text("from pkg.a import f\n\n\ndef g():\n    return f(1)\n")
+    (pkg / "c.py").write_text("def h():\n    return 3\n")
+    return tmp_path
+
+
+def _edit(path: Path, text: str) -> None:
+    before = path.stat().st_mtime_ns
+    path.write_text(text)
+    # Same-size edits within one mtime tick would slip past the stat fast path
+    os.utime(path, ns=(before + 10**9, before + 10**9))
+
+
+def test_second_run_is_a_no_op(project: Path):
+    first = scribe.run(project)
+    assert sorted(first.generated) == ["pkg", "pkg.a", "pkg.b", "pkg.c"]
+    assert (project / "docs" / "api" / "pkg.a.md").exists()
+    assert scribe.plan(project).to_generate == set()
+    assert scribe.run(project).generated == []
+
+
+def test_api_change_regenerates_dependents(project: Path):
+    scribe.run(project)
+    _edit(project / "src" / "pkg" / "a.py", "def f(x, y=0):\n    return x + y\n")
+    p = scribe.plan(project)
+    assert p.changed == {"pkg.a"}
+    assert p.dependents == {"pkg.b"}
+
+
+def test_only_leaves_other_modules_pending(project: Path):
+    scribe.run(project)
+    _edit(project / "src" / "pkg" / "a.py", "def f(x, y=0):\n    return x + y\n")
+    _edit(project / "src" / "pkg" / "c.py", "def h():\n    return 4\n")
+    assert scribe.run(project, only=["pkg.a"]).generated == ["pkg.a"]
+    # c's edit and b's dependency on a's new API are both still outstanding
+    assert scribe.plan(project).to_generate == {"pkg.b", "pkg.c"}
+    assert sorted(scribe.run(project).generated) == ["pkg.b", "pkg.c"]
+    assert scribe.plan(project).to_generate == set()
+
+
+def test_failed_modules_are_retried(project: Path):
+    def flaky(module, deps):
+        if module.name == "pkg.b":
+            raise RuntimeError("provider timeout")
+        return scribe.builtin_generator(module, deps)
+
+    result = scribe.run(project, flaky)
+    assert result.failed == {"pkg.b": "provider timeout"}
+    assert scribe.plan(project).to_generate == {"pkg.b"}
+    assert scribe.run(project).generated == ["pkg.b"]
+
+
+def test_manifest_is_saved_as_modules_complete(project: Path, monkeypatch):
+    monkeypatch.setattr(scribe, "MANIFEST_SAVE_INTERVAL_SEC", 0.0)
+
+    def done_on_disk() -> set[str]:
+        return {n for n, m in scribe.load_manifest(project).items() if m.output_hash}
+
+    def last_waits(module, deps):
+        if module.name == "pkg.c":  # Generated last with one worker
+            deadline = time.monotonic() + 5
+            while (
+                done_on_disk() != {"pkg", "pkg.a", "pkg.b"}
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.01)
+            raise RuntimeError(f"saw {sorted(done_on_disk())}")
+        return scribe.builtin_generator(module, deps)
+
+    result = scribe.run(project, last_waits, workers=1)
+    assert result.failed == {"pkg.c": "saw ['pkg', 'pkg.a', 'pkg.b']"}
+
+
+def test_project_ekkoignore_applies_to_src(project: Path):
+    generated = project / "src" / "pkg" / "generated"
+    generated.mkdir()
+    (generated / "proto.py").write_text("X = 1\n")
+    (project / ".ekkoignore").write_text("generated/\n")
+    assert "pkg.generated.proto" not in scribe.plan(project).modules
+    (project / ".ekkoignore").write_text("/src/pkg/c.py\n")
+    assert set(scribe.plan(project).modules) == {
+        "pkg",
+        "pkg.a",
+        "pkg.b",
+        "pkg.generated.proto",
+    }
+
+
+def test_docs_command_reports_unloadable_settings(project: Path, monkeypatch):
+    from typer.testing import CliRunner
+
+    from ekko import config
+    from ekko.cli import main as cli
+
+    monkeypatch.setattr(cli, "configure_logging", lambda level: None)
+    monkeypatch.setattr(config, "get_ekko_settings", lambda: None)
+    result = CliRunner().invoke(cli.app, ["docs", str(project)])
+    assert result.exit_code == 1
+    assert "settings failed to load" in result.output
+
+
+@pytest.mark.asyncio
+async def test_scribe_panel_reports_unloadable_settings(project: Path, monkeypatch):
+    from textual.app import App
+
+    from ekko import config
+    from ekko.tui.scribe_panel import ScribePanel
+
+    monkeypatch.setattr(config, "get_ekko_settings", lambda: None)
+    panel = ScribePanel(project)
+
+    class _Host(App):
+        def compose(self):
+            yield panel
+
+    async with _Host().run_test():
+        await panel._generate()
+    assert panel._error is not None
+    assert "settings failed to load" in panel._error
+    assert not panel._generating
@@ -0,0 +1,182 @@
+"""Unit tests for the API event stream and the TUI's remote feed."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ekko.api import main as api
+from ekko.api.stream import StreamHub, pump_client
+from ekko.orchestration.batch import deploy_projects
+from ekko.orchestration.events import EventBus, Topic
+from ekko.tui.remote import (
+    RemoteFeed,
+    RemoteState,
+    combined_metrics,
+    normalize_remote_url,
+)
+
+
+@pytest.mark.asyncio
+async def test_updates_coalesce_per_key():
+    hub = StreamHub()
+    hub.bind_loop(asyncio.get_running_loop())
+    client = hub.register()
+    for state in ("queued", "running", "done"):
+        hub.publish("jobs", "api", {"state": state})
+    hub.publish("jobs", "web", {"state": "queued"})
+    hub.publish("jobs", "web", None)
+    frame = client.take_frame()
+    assert frame["updates"] == [
+        {"channel": "jobs", "key": "api", "data": {"state": "done"}},
+        {"channel": "jobs", "key": "web", "data": None},
+    ]
+    assert hub.snapshot()["updates"] == [frame["updates"][0]]
+
+
+@pytest.mark.asyncio
+async def test_pump_stops_when_the_peer_goes_away():
+    hub = StreamHub(flush_interval=0)
+    hub.bind_loop(asyncio.get_running_loop())
+    client = hub.register()
+    sent: list[dict] = []
+    gone = asyncio.Event()
+
+    async def send(frame: dict) -> None:
+        sent.append(frame)
+
+    pump = asyncio.create_task(pump_client(hub, client, send, gone.wait))
+    await asyncio.sleep(0.01)
+    assert [f["type"] for f in sent] == ["snapshot"]
+    gone.set()  # No frame is due, yet the disconnect is noticed
+    await asyncio.wait_for(pump, 1)
+
+
+@pytest.mark.asyncio
+async def test_pump_reraises_send_failures():
+    hub = StreamHub(flush_interval=0)
+    hub.bind_loop(asyncio.get_running_loop())
+
+    async def send(frame: dict) -> None:
+        raise ConnectionResetError("peer reset")
+
+    with pytest.raises(ConnectionResetError):
+        await pump_client(hub, hub.register(), send, asyncio.Event().wait)
+
+
+@pytest.mark.asyncio
+async def test_deploy_jobs_publish_on_the_deploy_topic(tmp_path: Path):
+    bus = EventBus()
+    sub = bus.subscribe([Topic.DEPLOY])
+    await asyncio.to_thread(
+        deploy_projects, [tmp_path / "web"], "prod", lambda p, env: env, events=bus
+    )
+    await asyncio.sleep(0.01)
+    events = await sub.get_batch()
+    assert [(e.kind, e.payload["job"]) for e in events] == [
+        ("started", str(tmp_path / "web")),
+        ("finished", str(tmp_path / "web")),
+    ]
+    bus.close()
+
+
+def test_batch_validate_streams_job_deltas(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(api, "configure_logging", lambda level: None)
+    for name in ("api", "web"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "a.py").write_text("x = 1\n")
+    with TestClient(api.app) as http, http.websocket_connect("/ws/events") as ws:
+        assert ws.receive_json()["type"] == "snapshot"
+        resp = http.post(
+            "/batch/validate", json={"base_dir": str(tmp_path), "workers": 2}
+        )
+        assert resp.json()["ok"]
+        assert [p["scanned"] for p in resp.json()["projects"]] == [1, 1]
+        jobs: dict[str, dict] = {}
+        for _ in range(20):
+            frame = ws.receive_json()
+            jobs.update(
+                {
+                    u["key"]: u["data"]
+                    for u in frame["updates"]
+                    if u["channel"] == "jobs"
+                }
+            )
+            if len(jobs) == 2 and all(j["state"] == "finished" for j in jobs.values()):
+                break
+        assert set(jobs) == {str(tmp_path / "api"), str(tmp_path / "web")}
+        assert all(j["ok"] for j in jobs.values())
+        missing = http.post(
+            "/batch/validate", json={"base_dir": str(tmp_path / "nope")}
+        )
+        assert missing.status_code == 404
+
+
+def _remote(connected: bool = True, **metrics) -> RemoteState:
+    state = RemoteState(url="ws://x/ws/events", connected=connected)
+    state.channels["metrics"] = {"host": metrics}
+    return state
+
+
+def test_combined_metrics_cover_every_connected_remote():
+    a = _remote(cpu_percent=20.0, mem_total_gb=8.0, mem_available_gb=6.0, sent_kbps=1.0)
+    b = _remote(cpu_percent=60.0, mem_total_gb=8.0, mem_available_gb=2.0, sent_kbps=2.0)
+    down = _remote(connected=False, cpu_percent=100.0, mem_total_gb=64.0)
+    m = combined_metrics([a, b, down])
+    assert m["cpu_percent"] == 40.0
+    assert (m["mem_total_gb"], m["mem_percent"]) == (16.0, 50.0)
+    assert m["sent_kbps"] == 3.0
+    assert combined_metrics([b, down]) is b.channels["metrics"]["host"]
+    assert combined_metrics([down, RemoteState(url="u", connected=True)]) is None
+
+
+def test_normalize_remote_url():
+    assert normalize_remote_url("host:8888") == "ws://host:8888/ws/events"
+    assert (
+        normalize_remote_url("https://ekko.example/") == "wss://ekko.example/ws/events"
+    )
+
+
+@pytest.mark.asyncio
+async def test_finished_keys_are_evicted_oldest_first():
+    hub = StreamHub(max_finished=2)
+    hub.bind_loop(asyncio.get_running_loop())
+    client = hub.register()
+    hub.publish("jobs", "running", {"state": "started"})
+    for name in ("a", "b", "c"):
+        hub.publish("jobs", name, {"state": "finished"})
+    assert [u["key"] for u in hub.snapshot()["updates"]] == ["running", "b", "c"]
+    assert {"channel": "jobs", "key": "a", "data": None} in client.take_frame()[
+        "updates"
+    ]
+
+
+def test_feed_survives_a_failing_frame_handler(caplog):
+    seen: list[dict] = []
+
+    def on_frame(state: RemoteState, frame: dict) -> None:
+        seen.append(frame)
+        raise KeyError("level")
+
+    feed = RemoteFeed("host:1", on_frame)
+    feed._handle({"type": "delta", "seq": 1, "updates": [], "logs": [{"ts": 1.0}]})
+    feed._handle({"type": "delta", "seq": 2, "updates": []})
+    assert [f["seq"] for f in seen] == [1, 2]
+    assert feed.state.last_seq == 2
+    assert "frame handler failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_tui_renders_log_records_without_level_or_message():
+    from ekko.tui.main import EkkoTUI
+
+    app = EkkoTUI(remote_urls=["127.0.0.1:9"])
+    async with app.run_test():
+        state = app._remote_feeds[0].state
+        app._on_remote_frame(
+            state, {"type": "delta", "updates": [], "logs": [{"ts": 1.0}]}
+        )
+        app._on_remote_frame(
+            state, {"type": "delta", "updates": [], "logs": [{"level": "INFO"}]}
+        )
@@ -0,0 +1,85 @@
+"""Unit tests for the per-project symbol index."""
+
+from pathlib import Path
+
+import pytest
+
+from ekko.core import symbol_index
+from ekko.core.symbol_index import SymbolIndex, parse_python, split_identifier
+
+MODULE = '''"""Settings helpers."""
+
+import os
+
+
+class EkkoSettings:
+    """Holds settings."""
+
+    def load(self):
+        return os.environ
+
+
+def get_ekko_settings():
+    return EkkoSettings().load()
+'''
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "settings.py").write_text(MODULE)
+    (tmp_path / "README.md").write_text("# Demo\n\nExplains the settings loader.\n")
+    return tmp_path
+
+
+def test_split_identifier():
+    assert split_identifier("load_HTTPConfig") == ["load", "http", "config"]
+    assert split_identifier("EkkoSettings") == ["ekko", "settings"]
+
+
+def test_parse_python_chunks_do_not_overlap():
+    symbols, refs, chunks = parse_python(MODULE)
+    assert [(s[1], s[2]) for s in symbols] == [
+        ("EkkoSettings", "class"),
+        ("EkkoSettings.load", "method"),
+        ("get_ekko_settings", "function"),
+    ]
+    assert ("EkkoSettings", 14) in refs
+    lines = [ln for _, s, e in chunks for ln in range(s, e + 1)]
+    assert len(lines) == len(set(lines))
+
+
+def test_update_is_incremental(project: Path):
+    with SymbolIndex(project) as index:
+        first = index.update()
+        assert (first.scanned, first.updated) == (2, 2)
+        again = index.update()
+        assert (again.updated, again.unchanged) == (0, 2)
+        (project / "README.md").unlink()
+        assert index.update().removed == 1
+        assert [s.path for s in index.definitions("get_ekko_settings")] == [
+            "settings.py"
+        ]
+
+
+def test_query_prefers_named_definitions(project: Path):
+    with SymbolIndex(project) as index:
+        index.update()
+        chunks = index.query("why does get_ekko_settings fail?", token_budget=500)
+    assert chunks[0].symbol == "get_ekko_settings"
+    assert any(c.path == "README.md" for c in chunks)
+
+
+def test_file_growing_past_limit_is_dropped(
+    project: Path, monkeypatch: pytest.MonkeyPatch
+):
+    with SymbolIndex(project) as index:
+        index.update()
+        monkeypatch.setattr(symbol_index, "MAX_INDEX_BYTES", len(MODULE) + 10)
+        (project / "settings.py").write_text(MODULE + "\n# padding\n" * 10)
+        stats = index.update()
+        assert stats.removed == 1
+        assert index.definitions("EkkoSettings") == []
+        assert all(
+            c.path != "settings.py" for c in index.query("EkkoSettings settings")
+        )
+        assert index.update().removed == 0
@@ -0,0 +1,151 @@
+"""Unit tests for the sharded parallel test runner."""
+
+import stat
+import sys
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from ekko.validation import test_runner
+from ekko.validation.test_runner import (
+    Shard,
+    ShardResult,
+    _combine_coverage,
+    junit_test_id,
+    plan_shards,
+    run_tests,
+)
+
+# Aliased so pytest does not try to collect the Test* dataclasses
+History = test_runner.TestHistory
+RunResult = test_runner.TestRunResult
+
+PASSING = "def test_ok():\n    assert True\n"
+FAILING = "class TestThing:\n    def test_bad(self):\n        assert False\n"
+
+
+def _case(**attrs: str) -> ElementTree.Element:
+    return ElementTree.Element("testcase", attrs)
+
+
+@pytest.mark.parametrize(
+    ("attrs", "test_id"),
+    [
+        (
+            {"file": "tests/test_a.py", "classname": "tests.test_a", "name": "test_x"},
+            "tests/test_a.py::test_x",
+        ),
+        (
+            {
+                "file": "tests/test_a.py",
+                "classname": "tests.test_a.TestA",
+                "name": "test_x",
+            },
+            "tests/test_a.py::TestA::test_x",
+        ),
+        (
+            {
+                "file": "tests/test_a.py",
+                "classname": "tests.test_a.TestA.Inner",
+                "name": "t",
+            },
+            "tests/test_a.py::TestA::Inner::t",
+        ),
+        (
+            {
+                "file": "tests/test_a.py",
+                "classname": "tests.test_a",
+                "name": "test_p[a.b]",
+            },
+            "tests/test_a.py::test_p[a.b]",
+        ),
+        ({"classname": "tests.test_b", "name": "test_y"}, "tests/test_b.py::test_y"),
+    ],
+)
+def test_junit_test_id(attrs, test_id):
+    assert junit_test_id(_case(**attrs)) == test_id
+
+
+def test_plan_shards_balances_and_puts_failures_first():
+    history = History(
+        durations={"a.py::t": 8.0, "b.py::t": 5.0, "c.py::t": 4.0, "d.py::t": 1.0},
+        failed={"d.py::t"},
+    )
+    shards = plan_shards(["a.py", "b.py", "c.py", "d.py"], history, 2)
+    assert [s.files for s in shards] == [["d.py", "a.py"], ["b.py", "c.py"]]
+    assert [s.expected_seconds for s in shards] == [9.0, 9.0]
+    assert len(plan_shards(["a.py"], history, 8)) == 1
+
+
+def _project(tmp_path: Path, files: dict[str, str]) -> Path:
+    tests = tmp_path / "tests"
+    tests.mkdir(exist_ok=True)
+    for name, text in files.items():
+        (tests / name).write_text(text)
+    return tmp_path
+
+
+def test_run_tests_records_history(tmp_path: Path):
+    root = _project(tmp_path, {"test_ok.py": PASSING, "test_bad.py": FAILING})
+    run = run_tests(root, shards=2, coverage=False)
+    assert (run.tests, run.failures, run.ok) == (2, 1, False)
+    history = History.load(root)
+    assert history.failed == {"tests/test_bad.py::TestThing::test_bad"}
+    assert set(history.durations) == {
+        "tests/test_ok.py::test_ok",
+        "tests/test_bad.py::TestThing::test_bad",
+    }
+    assert (root / ".ekko" / "test-results" / "junit.xml").exists()
+
+
+def test_failures_outside_the_run_are_forgotten(tmp_path: Path):
+    root = _project(tmp_path, {"test_ok.py": PASSING, "test_bad.py": FAILING})
+    run_tests(root, shards=1, coverage=False)
+    # Deselected this time: the old failure must not keep test_bad.py at the front
+    run = run_tests(root, shards=1, coverage=False, pytest_args=["-k", "test_ok"])
+    assert run.ok
+    assert History.load(root).failed == set()
+    (root / "tests" / "test_bad.py").unlink()
+    run_tests(root, shards=1, coverage=False)
+    assert set(History.load(root).durations) == {"tests/test_ok.py::test_ok"}
+
+
+def test_failed_coverage_combine_is_an_error(tmp_path: Path):
+    fake_python = tmp_path / "python"
+    fake_python.write_text("#!/bin/sh\necho 'no usable data' >&2\nexit 1\n")
+    fake_python.chmod(fake_python.stat().st_mode | stat.S_IXUSR)
+    cov_dir = tmp_path / "cov"
+    cov_dir.mkdir()
+    (cov_dir / ".coverage.shard-0").write_text("")
+    with pytest.raises(RuntimeError, match="combine exited 1: no usable data"):
+        _combine_coverage(tmp_path, str(fake_python), cov_dir)
+    run = RunResult(
+        [ShardResult(Shard(0), 0, 1.0)], 1.0, coverage_error="combine failed"
+    )
+    assert not run.ok
+
+
+def test_run_tests_merges_coverage(tmp_path: Path):
+    pytest.importorskip("coverage")
+    root = _project(tmp_path, {"test_ok.py": PASSING, "test_two.py": PASSING})
+    run = run_tests(
+        root, shards=2, cov_source="tests", python=sys.executable, fail_under=50
+    )
+    assert run.coverage_error is None
+    assert run.coverage_percent == 100.0
+    assert run.ok
+
+
+def test_coveragerc_floor_is_applied_by_the_runner(tmp_path: Path):
+    pytest.importorskip("coverage")
+    root = _project(
+        tmp_path, {"test_ok.py": PASSING + "\n\ndef unused():\n    return 1\n"}
+    )
+    (root / ".coveragerc").write_text("[report]\nfail_under = 100\n")
+    run = run_tests(root, shards=1, cov_source="tests", python=sys.executable)
+    assert run.coverage_error is None  # The report itself succeeded
+    assert run.coverage_percent is not None
+    assert run.coverage_percent < 100
+    assert run.coverage_floor == 100.0
+    assert not run.ok
@@ -0,0 +1,108 @@
+"""Unit tests for stage-timing spans and the profiler hooks."""
+
+import pstats
+import stat
+from pathlib import Path
+
+import pytest
+
+from ekko import config
+from ekko.core import scribe, timing
+from ekko.core.scribe import ModuleInfo, scribe_agent_generator
+from ekko.core.timing import enable_timings, span, start_profiler, summarize, timed
+from ekko.orchestration.batch import deploy_projects
+
+
+@pytest.fixture
+def timings():
+    enable_timings()
+    yield
+    enable_timings(False)
+
+
+def test_disabled_span_is_shared_noop():
+    enable_timings(False)
+    assert span("a") is span("b")
+    with span("ignored"):
+        pass
+    assert summarize() == []
+
+
+def test_nested_spans_aggregate_by_path(timings):
+    @timed("leaf")
+    def leaf() -> int:
+        return 1
+
+    with span("outer"):
+        assert leaf() + leaf() == 2
+        with span("inner"):
+            leaf()
+    rows = {path: calls for path, calls, *_ in summarize()}
+    assert rows == {
+        "outer": 1,
+        "outer > leaf": 2,
+        "outer > inner": 1,
+        "outer > inner > leaf": 1,
+    }
+
+
+def test_deploy_steps_are_timed(timings, tmp_path: Path):
+    deployed = []
+    jobs = deploy_projects(
+        [tmp_path / "a", tmp_path / "b"],
+        "staging",
+        lambda p, env: deployed.append(p.name),
+    )
+    assert all(j.ok for j in jobs)
+    assert sorted(deployed) == ["a", "b"]
+    rows = {path: calls for path, calls, *_ in summarize()}
+    # Steps run on pool threads yet nest under the batch span
+    assert rows == {"batch deploy": 1, "batch deploy > deploy step": 2}
+
+
+def test_scribe_generation_spans_nest_under_the_run(timings, tmp_path: Path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "a.py").write_text("X = 1\n")
+    (tmp_path / "src" / "pkg" / "b.py").write_text("Y = 2\n")
+
+    def generator(module, deps):
+        with span("provider call"):
+            return scribe.builtin_generator(module, deps)
+
+    assert len(scribe.run(tmp_path, generator, workers=2).generated) == 2
+    calls = {path: n for path, n, *_ in summarize() if path.endswith("provider call")}
+    assert [(path.split(" > ")[-2:], n) for path, n in calls.items()] == [
+        (["scribe generate", "provider call"], 2)
+    ]
+
+
+def test_provider_call_is_timed(timings, tmp_path: Path):
+    agent = tmp_path / "agent.sh"
+    agent.write_text("#!/bin/sh\ncat >/dev/null\necho '# docs'\n")
+    agent.chmod(agent.stat().st_mode | stat.S_IXUSR)
+    module = ModuleInfo("pkg.mod", "pkg/mod.py", 0, 0, "", "", [], [])
+    assert scribe_agent_generator(agent)(module, {}).strip() == "# docs"
+    assert [path for path, *_ in summarize()] == ["provider call"]
+
+
+def test_settings_load_is_timed(timings, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config, "_cached_settings", None)
+    config.get_ekko_settings()
+    assert "settings load" in [path for path, *_ in summarize()]
+
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_profilers_write_output(tmp_path: Path, mode: str):
+    output = tmp_path / "profile.out"
+    finish = start_profiler(output, mode)
+    sum(i * i for i in range(200_000))
+    finish()
+    assert output.stat().st_size > 0
+    if mode == "cprofile":
+        assert pstats.Stats(str(output)).total_calls > 0
+
+
+def test_unknown_profiler_mode(tmp_path: Path):
+    with pytest.raises(ValueError, match="Unknown profiler mode"):
+        start_profiler(tmp_path / "x", "perf")
+    assert not timing.timings_enabled()